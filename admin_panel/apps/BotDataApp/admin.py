@@ -3,7 +3,7 @@ from django.utils.html import format_html
 from django.db import connection
 from django.template.response import TemplateResponse
 
-from .models import BotDashboardStat, AdminLog
+from .models import BotDashboardStat, AdminLog, Broadcast
 from django.db import models as django_models
 
 class Competition(django_models.Model):
@@ -403,100 +403,83 @@ class UserAdmin(admin.ModelAdmin):
 
     send_custom_message.short_description = '📤 Отправить сообщение'
 
+    PLACEHOLDERS = {
+        '{first_name}': "{{ first_name|default('', true) }}",
+        '{last_name}': "{{ last_name|default('', true) }}",
+        '{full_name}': "{{ first_name|default('', true) }} {{ last_name|default('', true) }}",
+    }
+
+    @classmethod
+    def _to_template(cls, text, escape_html=False):
+        import re
+        from html import escape
+
+        parts = re.split('(' + '|'.join(re.escape(p) for p in cls.PLACEHOLDERS) + ')', text)
+        template = []
+        for index, part in enumerate(parts):
+            if index % 2:
+                template.append(cls.PLACEHOLDERS[part])
+                continue
+            if escape_html:
+                part = escape(part, quote=False)
+            # Braces typed by the admin must not be read as Jinja syntax by the bot's renderer
+            template.append(part.replace('{', "{{ '{' }}"))
+        return ''.join(template)
+
     def _execute_broadcast(self, request, queryset, message_text, subject, send_telegram, send_email):
-        import os
         import json
-        import logging
-        import smtplib
-        import urllib.request
-        from email.mime.text import MIMEText
+        import uuid
+        from django.db import transaction
+        from django.urls import reverse
+        from django.utils import timezone
 
-        from dotenv import load_dotenv
-        load_dotenv()
+        user_ids = list(queryset.values_list('id', flat=True))
+        now = timezone.now()
+        name = f"Сообщение из админки {now:%d.%m.%Y %H:%M}"
 
-        logger = logging.getLogger(__name__)
+        # The bot's broadcast scheduler picks the row up and delivers it through the async pipeline
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO message_templates "
+                "(name, description, subject, body_telegram, body_email, available_variables, is_active, created_by) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id",
+                [
+                    f"{name} #{uuid.uuid4().hex[:8]}",
+                    f"Отправлено пользователем {request.user.get_username()}",
+                    self._to_template(subject or 'Уведомление от USN Competitions'),
+                    self._to_template(message_text, escape_html=True),
+                    self._to_template(message_text),
+                    json.dumps({}),
+                    True,
+                    request.user.id,
+                ]
+            )
+            template_id = cursor.fetchone()[0]
 
-        bot_token = os.getenv('BOT_TOKEN')
-        if not bot_token and send_telegram:
-            self.message_user(request, 'BOT_TOKEN не найден в .env', level='ERROR')
-            return
+            cursor.execute(
+                "INSERT INTO broadcasts "
+                "(name, template_id, filters, send_telegram, send_email, scheduled_at, status, total_recipients, attempts, created_by) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id",
+                [
+                    name,
+                    template_id,
+                    json.dumps({'user_ids': user_ids}),
+                    send_telegram,
+                    send_email,
+                    now,
+                    'scheduled',
+                    len(user_ids),
+                    0,
+                    request.user.id,
+                ]
+            )
+            broadcast_id = cursor.fetchone()[0]
 
-        smtp_host = os.getenv('SMTP_HOST', '')
-        smtp_port = int(os.getenv('SMTP_PORT', '587'))
-        smtp_username = os.getenv('SMTP_USERNAME', '')
-        smtp_password = os.getenv('SMTP_PASSWORD', '')
-        smtp_use_tls = os.getenv('SMTP_USE_TLS', 'True').lower() == 'true'
-        support_email = os.getenv('SUPPORT_EMAIL', '')
-        email_from_name = os.getenv('EMAIL_FROM_NAME', 'USN Competitions')
-        smtp_configured = all([smtp_host, smtp_username, smtp_password, support_email])
-
-        users = list(queryset.values_list('telegram_id', 'email', 'first_name', 'last_name'))
-        count = len(users)
-        sent_tg = 0
-        sent_email_count = 0
-        errors = []
-
-        telegram_api_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-
-        for telegram_id, email, first_name, last_name in users:
-            first_name = first_name or ''
-            last_name = last_name or ''
-            full_name = f"{first_name} {last_name}".strip()
-
-            rendered = message_text.replace('{first_name}', first_name)
-            rendered = rendered.replace('{last_name}', last_name)
-            rendered = rendered.replace('{full_name}', full_name)
-
-            if send_telegram:
-                try:
-                    payload = json.dumps({'chat_id': telegram_id, 'text': rendered}).encode('utf-8')
-                    req = urllib.request.Request(
-                        telegram_api_url,
-                        data=payload,
-                        headers={'Content-Type': 'application/json'},
-                    )
-                    with urllib.request.urlopen(req, timeout=10) as resp:
-                        result = json.loads(resp.read())
-                        if result.get('ok'):
-                            sent_tg += 1
-                        else:
-                            errors.append(f"TG {full_name}: {result.get('description', 'Unknown')}")
-                except Exception as e:
-                    logger.error(f"Telegram error for {full_name}: {e}")
-                    errors.append(f"TG {full_name}: {e}")
-
-            if send_email and email and smtp_configured:
-                try:
-                    rendered_subject = subject or 'Уведомление от USN Competitions'
-                    rendered_subject = rendered_subject.replace('{first_name}', first_name)
-                    rendered_subject = rendered_subject.replace('{last_name}', last_name)
-                    rendered_subject = rendered_subject.replace('{full_name}', full_name)
-
-                    msg = MIMEText(rendered, 'plain', 'utf-8')
-                    msg['Subject'] = rendered_subject
-                    msg['From'] = f"{email_from_name} <{support_email}>"
-                    msg['To'] = email
-
-                    server = smtplib.SMTP(smtp_host, smtp_port, timeout=15)
-                    if smtp_use_tls:
-                        server.starttls()
-                    server.login(smtp_username, smtp_password)
-                    server.send_message(msg)
-                    server.quit()
-                    sent_email_count += 1
-                except Exception as e:
-                    logger.error(f"Email error for {full_name}: {e}")
-                    errors.append(f"Email {full_name}: {e}")
-
-        parts = []
-        if send_telegram:
-            parts.append(f'Telegram: {sent_tg}/{count}')
-        if send_email:
-            parts.append(f'Email: {sent_email_count}/{count}')
-        result_msg = ' | '.join(parts)
-        if errors:
-            result_msg += f' | Ошибки: {len(errors)}'
-        self.message_user(request, result_msg)
+        self.message_user(request, format_html(
+            '📢 Рассылка поставлена в очередь ({} получателей). <a href="{}">Следить за прогрессом</a>',
+            len(user_ids),
+            reverse('admin:BotDataApp_broadcast_change', args=[broadcast_id]),
+        ))
 
     def get_full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}".strip() or f"User #{obj.telegram_id}"
@@ -723,6 +706,98 @@ class JuryPanelAdmin(admin.ModelAdmin):
         else:
             self.message_user(request, f'✅ Судейская коллегия создана: {obj.panel_name}')
 
+@admin.register(Broadcast)
+class BroadcastAdmin(admin.ModelAdmin):
+
+    list_display = ['id', 'name', 'get_status_badge', 'get_progress', 'get_send_rate', 'get_eta', 'started_at', 'completed_at']
+    list_filter = ['status', 'send_telegram', 'send_email', 'created_at']
+    search_fields = ['name']
+    readonly_fields = [
+        'id', 'status', 'total_recipients', 'sent_count', 'failed_count', 'get_progress',
+        'get_send_rate', 'rate_limit', 'get_eta', 'progress_updated_at', 'started_at', 'completed_at',
+        'attempts', 'last_error', 'created_at', 'updated_at',
+    ]
+    fieldsets = (
+        ('Основная информация', {
+            'fields': ('id', 'name', 'template_id', 'filters', 'send_telegram', 'send_email', 'scheduled_at', 'status')
+        }),
+        ('Прогресс', {
+            'fields': ('total_recipients', 'sent_count', 'failed_count', 'get_progress', 'get_send_rate', 'rate_limit', 'get_eta', 'progress_updated_at')
+        }),
+        ('Система', {
+            'fields': ('started_at', 'completed_at', 'attempts', 'last_error', 'created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+    editable_statuses = ('draft', 'scheduled')
+    locked_fields = ['name', 'template_id', 'filters', 'send_telegram', 'send_email', 'scheduled_at']
+
+    def get_readonly_fields(self, request, obj=None):
+        readonly = list(super().get_readonly_fields(request, obj))
+        if obj is not None and obj.status not in self.editable_statuses:
+            # A claimed broadcast is already sending: its audience and content are fixed
+            readonly += self.locked_fields
+        return readonly
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        if not form.changed_data:
+            return
+
+        from django.utils import timezone
+
+        # Only the edited fields, and only while no worker has claimed the broadcast
+        updated = Broadcast.objects.filter(pk=obj.pk, status__in=self.editable_statuses).update(
+            updated_at=timezone.now(),
+            **{name: getattr(obj, name) for name in form.changed_data},
+        )
+        if not updated:
+            self.message_user(request, f'⚠️ Рассылка «{obj.name}» уже запущена, изменения не сохранены.')
+
+    def get_status_badge(self, obj):
+        colors = {
+            'draft': '#6c757d',
+            'scheduled': '#17a2b8',
+            'in_progress': '#ffc107',
+            'completed': '#28a745',
+            'failed': '#dc3545',
+        }
+        color = colors.get(obj.status, '#6c757d')
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 5px 10px; '
+            'border-radius: 4px;">{}</span>',
+            color, obj.get_status_display()
+        )
+    get_status_badge.short_description = 'Статус'
+
+    def get_progress(self, obj):
+        percent = obj.get_progress_percent()
+        return format_html(
+            '<div style="width: 120px; background: #e9ecef; border-radius: 4px;">'
+            '<div style="width: {}%; background: #28a745; color: white; padding: 2px 4px; '
+            'border-radius: 4px; white-space: nowrap;">{}%</div></div>'
+            '<small>{} / {} (ошибок: {})</small>',
+            percent, percent,
+            (obj.sent_count or 0) + (obj.failed_count or 0), obj.total_recipients or 0, obj.failed_count or 0
+        )
+    get_progress.short_description = 'Прогресс'
+
+    def get_send_rate(self, obj):
+        if obj.status != 'in_progress' or not obj.send_rate:
+            return '—'
+        return f"{obj.send_rate:.1f}/с"
+    get_send_rate.short_description = 'Скорость'
+
+    def get_eta(self, obj):
+        eta = obj.get_eta_seconds()
+        if eta is None:
+            return '—'
+        minutes, seconds = divmod(eta, 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+    get_eta.short_description = 'Осталось'
+
 admin.site.site_header = "USN Telegram Bot - Администрирование"
 admin.site.site_title = "Админка бота"
 admin.site.index_title = "Добро пожаловать в панель администрирования"
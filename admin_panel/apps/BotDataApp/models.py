@@ -197,8 +197,13 @@ class Broadcast(models.Model):
     total_recipients = models.IntegerField(default=0, verbose_name='Всего получателей')
     sent_count = models.IntegerField(default=0, verbose_name='Отправлено')
     failed_count = models.IntegerField(default=0, verbose_name='Ошибок')
+    send_rate = models.FloatField(null=True, blank=True, verbose_name='Скорость (получателей/с)')
+    rate_limit = models.FloatField(null=True, blank=True, verbose_name='Лимит Telegram (сообщений/с)')
+    progress_updated_at = models.DateTimeField(null=True, blank=True, verbose_name='Прогресс обновлён')
     started_at = models.DateTimeField(null=True, blank=True, verbose_name='Начало')
     completed_at = models.DateTimeField(null=True, blank=True, verbose_name='Завершение')
+    attempts = models.IntegerField(default=0, verbose_name='Запусков')
+    last_error = models.TextField(null=True, blank=True, verbose_name='Последняя ошибка')
     created_by = models.IntegerField(verbose_name='Создан администратором')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Дата обновления')
@@ -214,9 +219,16 @@ class Broadcast(models.Model):
         return f"{self.name} ({self.get_status_display()})"
 
     def get_progress_percent(self):
-        if self.total_recipients == 0:
+        if not self.total_recipients:
             return 0
-        return int((self.sent_count / self.total_recipients) * 100)
+        processed = (self.sent_count or 0) + (self.failed_count or 0)
+        return min(100, int((processed / self.total_recipients) * 100))
+
+    def get_eta_seconds(self):
+        if self.status != 'in_progress' or not self.send_rate:
+            return None
+        remaining = (self.total_recipients or 0) - (self.sent_count or 0) - (self.failed_count or 0)
+        return max(0, int(remaining / self.send_rate))
 
 class BroadcastRecipient(models.Model):
 
@@ -18,6 +18,9 @@ class SMTPConfig:
     SUPPORT_EMAIL = settings.smtp.support_email
     EMAIL_FROM_NAME = settings.smtp.email_from_name
     SUPPORT_TELEGRAM_ID = settings.smtp.support_telegram_id
+    SMTP_POOL_SIZE = settings.smtp.smtp_pool_size
+    SMTP_IDLE_CHECK = settings.smtp.smtp_idle_check
+    SMTP_TRANSPORT = settings.smtp.smtp_transport
 
     @classmethod
     def get_from_address(cls) -> str:
@@ -5,7 +5,6 @@ from aiogram.fsm.context import FSMContext
 
 from utils.admin_check import admin_only
 from utils import db_manager
-from utils.notifications import notify_user_approved, notify_user_rejected, notify_user_revoked
 from utils.helpers import BotHelpers, parse_callback_id
 from keyboards.admin_keyboards import applications_list_keyboard, application_actions_keyboard, confirm_action_keyboard, admin_main_menu_keyboard
 from messages import BotMessages
@@ -88,16 +87,7 @@ async def approve_application_execute(callback: CallbackQuery, state: FSMContext
         return
     admin_id = callback.from_user.id
 
-    await db_manager.approve_registration(registration_id, admin_id)
-
-    reg_data = await db_manager.get_registration_with_user(registration_id)
-
-    if reg_data:
-        await notify_user_approved(
-            callback.bot,
-            reg_data["telegram_id"],
-            reg_data["competition_name"]
-        )
+    await db_manager.approve_registration(registration_id, admin_id, notify=True)
 
     await callback.message.edit_text(BotMessages.ADMIN_APPLICATION_APPROVED)
     await state.clear()
@@ -126,16 +116,7 @@ async def reject_application_execute(callback: CallbackQuery, state: FSMContext)
         await callback.answer("Ошибка данных", show_alert=True)
         return
 
-    await db_manager.reject_registration(registration_id)
-
-    reg_data = await db_manager.get_registration_with_user(registration_id)
-
-    if reg_data:
-        await notify_user_rejected(
-            callback.bot,
-            reg_data["telegram_id"],
-            reg_data["competition_name"]
-        )
+    await db_manager.reject_registration(registration_id, notify=True)
 
     await callback.message.edit_text(BotMessages.ADMIN_APPLICATION_REJECTED)
     await state.clear()
@@ -164,16 +145,7 @@ async def revoke_application_execute(callback: CallbackQuery, state: FSMContext)
         await callback.answer("Ошибка данных", show_alert=True)
         return
 
-    await db_manager.revoke_registration(registration_id)
-
-    reg_data = await db_manager.get_registration_with_user(registration_id)
-
-    if reg_data:
-        await notify_user_revoked(
-            callback.bot,
-            reg_data["telegram_id"],
-            reg_data["competition_name"]
-        )
+    await db_manager.revoke_registration(registration_id, notify=True)
 
     await callback.message.edit_text("⚠️ Регистрация отозвана")
     await state.clear()
@@ -8,7 +8,7 @@ from messages import BotMessages
 from keyboards import InlineKeyboards
 from states import ContactStates
 from config.email_settings import SMTPConfig
-from utils.notifications import send_email
+from utils.notifications import send_email, send_transactional_message
 
 logger = logging.getLogger(__name__)
 
@@ -56,9 +56,10 @@ async def contact_message_handler(message: Message, state: FSMContext, bot: Bot)
 
     if support_telegram_id and support_telegram_id > 0:
         try:
-            await bot.send_message(
-                chat_id=support_telegram_id,
-                text=telegram_message,
+            await send_transactional_message(
+                bot,
+                support_telegram_id,
+                telegram_message,
                 parse_mode="HTML"
             )
             logger.info(f"Support message sent to Telegram ID {support_telegram_id}")
@@ -7,7 +7,6 @@ from messages import BotMessages
 from keyboards import InlineKeyboards
 from states import RegistrationStates
 from utils import db_manager
-from utils.notifications import notify_admins_new_registration
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +68,7 @@ async def final_confirmation_yes(query: CallbackQuery, state: FSMContext) -> Non
                 competition_id=competition_id,
                 role=selected_role,
                 status='pending',
+                notify_admins=True,
             )
 
             if state_data.get('selected_time_slots'):
@@ -92,21 +92,6 @@ async def final_confirmation_yes(query: CallbackQuery, state: FSMContext) -> Non
         parse_mode="HTML",
     )
 
-    user = existing_user or await db_manager.get_user_by_telegram_id(user_telegram_id)
-
-    if user and registration and competition_id:
-        competition = await db_manager.get_competition_by_id(competition_id)
-        if competition:
-            try:
-                await notify_admins_new_registration(
-                    bot=query.bot,
-                    user_name=user.get_display_name(),
-                    competition_name=competition.name,
-                    role=selected_role
-                )
-            except Exception as e:
-                logger.error(f"Error notifying admins: {e}", exc_info=True)
-
     await state.clear()
     await query.answer()
 
@@ -1,3 +1,4 @@
+import logging
 from aiogram import Router, F
 from aiogram.types import Message
 from aiogram.filters import Command
@@ -5,6 +6,9 @@ from aiogram.fsm.context import FSMContext
 
 from messages import BotMessages
 from keyboards import InlineKeyboards
+from utils import db_manager
+
+logger = logging.getLogger(__name__)
 
 start_router = Router()
 
@@ -13,6 +17,12 @@ async def start_handler(message: Message, state: FSMContext) -> None:
 
     await state.clear()
 
+    # Writing /start means the user unblocked the bot, so broadcasts may reach them again
+    try:
+        await db_manager.unsuppress_recipient('telegram', message.from_user.id)
+    except Exception as e:
+        logger.warning(f"⚠️  Could not clear suppression for {message.from_user.id}: {e}")
+
     await message.answer(
         BotMessages.MAIN_MENU_START,
         reply_markup=InlineKeyboards.main_menu_keyboard(),
@@ -89,6 +89,9 @@ async def main() -> None:
         await db_manager.init_db()
         logger.info("База данных инициализирована")
 
+        suppressed = await db_manager.load_suppression_list()
+        logger.info(f"Загружено подавленных адресатов: {suppressed}")
+
         logger.info("BEFORE init_sample_data")
         await init_sample_data()
         logger.info("AFTER init_sample_data")
@@ -99,6 +102,21 @@ async def main() -> None:
     bot: USNBot = USNBot()
     logger.info("Бот инициализирован")
 
+    from services.broadcast.scheduler import BroadcastScheduler
+    from settings import settings
+
+    if settings.broadcast.shared_rate_budget:
+        from services.broadcast.rate_budget import use_shared_rate_budget
+
+        use_shared_rate_budget(db_manager.get_session)
+
+    scheduler = BroadcastScheduler(db_manager.get_session, bot=bot.get_bot())
+    scheduler.start()
+
+    from services.broadcast.outbox import start_outbox_dispatcher, stop_outbox_dispatcher
+
+    start_outbox_dispatcher(db_manager.get_session, bot.get_bot())
+
     try:
         logger.info("Запуск polling...")
         await bot.start_polling()
@@ -107,6 +125,14 @@ async def main() -> None:
     except Exception as e:
         logger.error(f"Ошибка при работе бота: {e}", exc_info=True)
     finally:
+        await scheduler.stop()
+        await stop_outbox_dispatcher()
+
+        from services.broadcast.smtp_pool import close_smtp_pool
+        from services.broadcast.render_pool import close_render_pool
+
+        await close_smtp_pool()
+        await close_render_pool()
         await db_manager.close_db()
         await bot.close()
         logger.info("Бот выключен")
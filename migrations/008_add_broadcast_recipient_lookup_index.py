@@ -0,0 +1,30 @@
+"""
+Migration 008: Add composite (broadcast_id, user_id) index on broadcast_recipients.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Create composite index used by batched delivery-status updates:
+    - idx_broadcast_recipients_broadcast_user: (broadcast_id, user_id)
+
+    Safe on fresh installs - the index is already created via models.
+    """
+    try:
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_broadcast_recipients_broadcast_user
+            ON broadcast_recipients(broadcast_id, user_id)
+        """))
+
+        await session.commit()
+        logger.info("✅ Migration 008 completed: broadcast_recipients lookup index created")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 008 failed: {e}")
+        await session.rollback()
+        raise
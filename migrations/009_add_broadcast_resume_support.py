@@ -0,0 +1,50 @@
+"""
+Migration 009: Support resuming interrupted broadcasts.
+Adds broadcast_recipients.registration_id and pending-scan indexes.
+"""
+from sqlalchemy import text, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Prepare broadcast_recipients for resumable delivery:
+    - registration_id: INTEGER NULL (restores the recipient context on resume)
+    - idx_broadcast_recipients_telegram_pending: (broadcast_id, telegram_status)
+    - idx_broadcast_recipients_email_pending: (broadcast_id, email_status)
+
+    Safe on fresh installs - the column and indexes are already created via models.
+    """
+    try:
+        columns = await session.run_sync(
+            lambda sync_session: {
+                column["name"]
+                for column in inspect(sync_session.connection()).get_columns("broadcast_recipients")
+            }
+        )
+
+        if "registration_id" not in columns:
+            await session.execute(text(
+                "ALTER TABLE broadcast_recipients ADD COLUMN registration_id INTEGER NULL"
+            ))
+
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_broadcast_recipients_telegram_pending
+            ON broadcast_recipients(broadcast_id, telegram_status)
+        """))
+
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_broadcast_recipients_email_pending
+            ON broadcast_recipients(broadcast_id, email_status)
+        """))
+
+        await session.commit()
+        logger.info("✅ Migration 009 completed: broadcast resume support added")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 009 failed: {e}")
+        await session.rollback()
+        raise
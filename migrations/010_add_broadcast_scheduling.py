@@ -0,0 +1,44 @@
+"""
+Migration 010: Support the scheduled broadcast dispatcher.
+Adds broadcasts.heartbeat_at and a (status, scheduled_at) index.
+"""
+from sqlalchemy import text, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Prepare broadcasts for claiming by the scheduler:
+    - heartbeat_at: TIMESTAMP NULL (lease renewed by the running bot instance)
+    - idx_broadcasts_status_scheduled_at: (status, scheduled_at)
+
+    Safe on fresh installs - the column and index are already created via models.
+    """
+    try:
+        columns = await session.run_sync(
+            lambda sync_session: {
+                column["name"]
+                for column in inspect(sync_session.connection()).get_columns("broadcasts")
+            }
+        )
+
+        if "heartbeat_at" not in columns:
+            await session.execute(text(
+                "ALTER TABLE broadcasts ADD COLUMN heartbeat_at TIMESTAMP NULL"
+            ))
+
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_broadcasts_status_scheduled_at
+            ON broadcasts(status, scheduled_at)
+        """))
+
+        await session.commit()
+        logger.info("✅ Migration 010 completed: broadcast scheduling support added")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 010 failed: {e}")
+        await session.rollback()
+        raise
@@ -0,0 +1,39 @@
+"""
+Migration 011: Track delivery attempts per channel on broadcast_recipients.
+"""
+from sqlalchemy import text, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Add columns to broadcast_recipients:
+    - telegram_attempts: INTEGER NOT NULL DEFAULT 0
+    - email_attempts: INTEGER NOT NULL DEFAULT 0
+
+    Safe on fresh installs - the columns are already created via models.
+    """
+    try:
+        columns = await session.run_sync(
+            lambda sync_session: {
+                column["name"]
+                for column in inspect(sync_session.connection()).get_columns("broadcast_recipients")
+            }
+        )
+
+        for column_name in ("telegram_attempts", "email_attempts"):
+            if column_name not in columns:
+                await session.execute(text(
+                    f"ALTER TABLE broadcast_recipients ADD COLUMN {column_name} INTEGER NOT NULL DEFAULT 0"
+                ))
+
+        await session.commit()
+        logger.info("✅ Migration 011 completed: delivery attempt counters added")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 011 failed: {e}")
+        await session.rollback()
+        raise
@@ -0,0 +1,44 @@
+"""
+Migration 012: Add live progress fields to broadcasts.
+"""
+from sqlalchemy import text, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Add columns to broadcasts:
+    - send_rate: FLOAT NULL (rolling recipients per second)
+    - progress_updated_at: TIMESTAMP NULL
+
+    Safe on fresh installs - the columns are already created via models.
+    """
+    try:
+        columns = await session.run_sync(
+            lambda sync_session: {
+                column["name"]
+                for column in inspect(sync_session.connection()).get_columns("broadcasts")
+            }
+        )
+
+        columns_to_add = [
+            ("send_rate", "FLOAT NULL"),
+            ("progress_updated_at", "TIMESTAMP NULL"),
+        ]
+
+        for column_name, column_def in columns_to_add:
+            if column_name not in columns:
+                await session.execute(text(
+                    f"ALTER TABLE broadcasts ADD COLUMN {column_name} {column_def}"
+                ))
+
+        await session.commit()
+        logger.info("✅ Migration 012 completed: broadcast progress fields added")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 012 failed: {e}")
+        await session.rollback()
+        raise
@@ -0,0 +1,70 @@
+"""
+Migration 013: Create audience segment tables.
+Creates audience_segments and audience_segment_members tables.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Create audience segment tables (database-agnostic):
+    - audience_segments: Сохранённые сегменты аудитории (имя + фильтры)
+    - audience_segment_members: Снимок пользователей сегмента
+
+    Safe on fresh installs - the tables are already created via models.
+    """
+    pk = "SERIAL PRIMARY KEY"
+    ts = "TIMESTAMP"
+    now = "CURRENT_TIMESTAMP"
+
+    try:
+        await session.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS audience_segments (
+                id {pk},
+                name VARCHAR(255) NOT NULL UNIQUE,
+                description TEXT,
+                filters JSON NOT NULL DEFAULT '{{}}',
+                member_count INTEGER DEFAULT 0,
+                refreshed_at {ts},
+                created_by INTEGER,
+                created_at {ts} DEFAULT {now},
+                updated_at {ts} DEFAULT {now}
+            )
+        """))
+        logger.info("✅ Created audience_segments table")
+
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_audience_segments_name
+            ON audience_segments(name)
+        """))
+
+        await session.execute(text("""
+            CREATE TABLE IF NOT EXISTS audience_segment_members (
+                segment_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                registration_id INTEGER,
+                competition_names TEXT,
+                roles TEXT,
+                PRIMARY KEY (segment_id, user_id),
+                FOREIGN KEY (segment_id) REFERENCES audience_segments(id) ON DELETE CASCADE
+            )
+        """))
+        logger.info("✅ Created audience_segment_members table")
+
+        # Incremental refreshes look members up by user across all segments
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_audience_segment_members_user_id
+            ON audience_segment_members(user_id)
+        """))
+
+        await session.commit()
+        logger.info("✅ Migration 013 completed: audience segment tables created")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 013 failed: {e}")
+        await session.rollback()
+        raise
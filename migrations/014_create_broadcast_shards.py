@@ -0,0 +1,68 @@
+"""
+Migration 014: Create broadcast shard and shared rate budget tables.
+Creates broadcast_shards and rate_budgets tables.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Create tables for multi-process broadcast execution (database-agnostic):
+    - broadcast_shards: Диапазоны получателей рассылки, которые забирают воркеры
+    - rate_budgets: Общий лимит отправки для всех процессов бота
+
+    Safe on fresh installs - the tables are already created via models.
+    """
+    pk = "SERIAL PRIMARY KEY"
+    ts = "TIMESTAMP"
+
+    try:
+        await session.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS broadcast_shards (
+                id {pk},
+                broadcast_id INTEGER NOT NULL,
+                shard_no INTEGER NOT NULL,
+                recipient_id_from INTEGER NOT NULL,
+                recipient_id_to INTEGER NOT NULL,
+                status VARCHAR(20) DEFAULT 'scheduled',
+                sent_count INTEGER DEFAULT 0,
+                failed_count INTEGER DEFAULT 0,
+                started_at {ts},
+                completed_at {ts},
+                heartbeat_at {ts},
+                FOREIGN KEY (broadcast_id) REFERENCES broadcasts(id)
+            )
+        """))
+        logger.info("✅ Created broadcast_shards table")
+
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_broadcast_shards_broadcast_id
+            ON broadcast_shards(broadcast_id)
+        """))
+
+        # Workers poll for claimable shards by status and lease age
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_broadcast_shards_status_heartbeat
+            ON broadcast_shards(status, heartbeat_at)
+        """))
+
+        await session.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS rate_budgets (
+                name VARCHAR(100) PRIMARY KEY,
+                tokens FLOAT NOT NULL DEFAULT 0,
+                updated_at {ts} NOT NULL
+            )
+        """))
+        logger.info("✅ Created rate_budgets table")
+
+        await session.commit()
+        logger.info("✅ Migration 014 completed: broadcast shard tables created")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 014 failed: {e}")
+        await session.rollback()
+        raise
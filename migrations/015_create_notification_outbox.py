@@ -0,0 +1,52 @@
+"""
+Migration 015: Create notification outbox table.
+Creates notification_outbox table.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Create the transactional outbox table (database-agnostic):
+    - notification_outbox: Уведомления пользователям и админам, записанные вместе с изменением заявки
+
+    Safe on fresh installs - the table is already created via models.
+    """
+    pk = "SERIAL PRIMARY KEY"
+    ts = "TIMESTAMP"
+    now = "CURRENT_TIMESTAMP"
+
+    try:
+        await session.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS notification_outbox (
+                id {pk},
+                chat_id BIGINT NOT NULL,
+                kind VARCHAR(50) NOT NULL,
+                text TEXT NOT NULL,
+                status VARCHAR(20) DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT,
+                available_at {ts} NOT NULL DEFAULT {now},
+                created_at {ts} DEFAULT {now},
+                sent_at {ts}
+            )
+        """))
+        logger.info("✅ Created notification_outbox table")
+
+        # The dispatcher polls for pending rows that are due, oldest first
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_notification_outbox_pending
+            ON notification_outbox(status, available_at)
+        """))
+
+        await session.commit()
+        logger.info("✅ Migration 015 completed: notification outbox created")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 015 failed: {e}")
+        await session.rollback()
+        raise
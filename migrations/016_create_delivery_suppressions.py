@@ -0,0 +1,40 @@
+"""
+Migration 016: Create delivery suppression table.
+Creates delivery_suppressions table.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Create the suppression list table (database-agnostic):
+    - delivery_suppressions: Адресаты, заблокировавшие бота, и недоставляемые email
+
+    Safe on fresh installs - the table is already created via models.
+    """
+    ts = "TIMESTAMP"
+    now = "CURRENT_TIMESTAMP"
+
+    try:
+        await session.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS delivery_suppressions (
+                channel VARCHAR(20) NOT NULL,
+                address VARCHAR(255) NOT NULL,
+                reason TEXT,
+                created_at {ts} DEFAULT {now},
+                PRIMARY KEY (channel, address)
+            )
+        """))
+        logger.info("✅ Created delivery_suppressions table")
+
+        await session.commit()
+        logger.info("✅ Migration 016 completed: delivery suppression table created")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 016 failed: {e}")
+        await session.rollback()
+        raise
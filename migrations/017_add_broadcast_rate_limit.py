@@ -0,0 +1,37 @@
+"""
+Migration 017: Add the adaptive Telegram rate limit to broadcasts.
+"""
+from sqlalchemy import text, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Add columns to broadcasts:
+    - rate_limit: FLOAT NULL (global Telegram messages per second allowed by the rate controller)
+
+    Safe on fresh installs - the columns are already created via models.
+    """
+    try:
+        columns = await session.run_sync(
+            lambda sync_session: {
+                column["name"]
+                for column in inspect(sync_session.connection()).get_columns("broadcasts")
+            }
+        )
+
+        if "rate_limit" not in columns:
+            await session.execute(text(
+                "ALTER TABLE broadcasts ADD COLUMN rate_limit FLOAT NULL"
+            ))
+
+        await session.commit()
+        logger.info("✅ Migration 017 completed: broadcast rate limit field added")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 017 failed: {e}")
+        await session.rollback()
+        raise
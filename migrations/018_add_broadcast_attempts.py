@@ -0,0 +1,43 @@
+"""
+Migration 018: Track broadcast runs and the last execution error.
+"""
+from sqlalchemy import text, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Add columns to broadcasts:
+    - attempts: INTEGER NOT NULL DEFAULT 0 (times the broadcast was started or reclaimed)
+    - last_error: TEXT NULL (error of the last failed run)
+
+    Safe on fresh installs - the columns are already created via models.
+    """
+    try:
+        columns = await session.run_sync(
+            lambda sync_session: {
+                column["name"]
+                for column in inspect(sync_session.connection()).get_columns("broadcasts")
+            }
+        )
+
+        if "attempts" not in columns:
+            await session.execute(text(
+                "ALTER TABLE broadcasts ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+            ))
+
+        if "last_error" not in columns:
+            await session.execute(text(
+                "ALTER TABLE broadcasts ADD COLUMN last_error TEXT NULL"
+            ))
+
+        await session.commit()
+        logger.info("✅ Migration 018 completed: broadcast attempt tracking fields added")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 018 failed: {e}")
+        await session.rollback()
+        raise
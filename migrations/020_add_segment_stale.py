@@ -0,0 +1,37 @@
+"""
+Migration 020: Mark audience segments whose snapshot is out of date.
+"""
+from sqlalchemy import text, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(session: AsyncSession):
+    """
+    Add columns to audience_segments:
+    - stale: BOOLEAN NOT NULL DEFAULT FALSE (a user changed since the last refresh)
+
+    Safe on fresh installs - the columns are already created via models.
+    """
+    try:
+        columns = await session.run_sync(
+            lambda sync_session: {
+                column["name"]
+                for column in inspect(sync_session.connection()).get_columns("audience_segments")
+            }
+        )
+
+        if "stale" not in columns:
+            await session.execute(text(
+                "ALTER TABLE audience_segments ADD COLUMN stale BOOLEAN NOT NULL DEFAULT FALSE"
+            ))
+
+        await session.commit()
+        logger.info("✅ Migration 020 completed: audience segment stale flag added")
+
+    except Exception as e:
+        logger.error(f"❌ Migration 020 failed: {e}")
+        await session.rollback()
+        raise
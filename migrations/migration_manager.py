@@ -70,7 +70,7 @@ class MigrationManager:
         # Get all migration files
         migration_files = sorted([
             f for f in os.listdir(self.migrations_dir)
-            if f.startswith('00') and f.endswith('.py') and f != 'migration_manager.py'
+            if f[:3].isdigit() and f.endswith('.py') and f != 'migration_manager.py'
         ])
 
         async with self.session_maker() as session:
@@ -5,7 +5,13 @@ from .time_slot import TimeSlotModel
 from .voter_time_slot import VoterTimeSlotModel
 from .jury_panel import JuryPanelModel
 from .voter_jury_panel import VoterJuryPanelModel
-from .broadcast import MessageTemplate, Broadcast, BroadcastRecipient, BroadcastStatus, DeliveryStatus
+from .broadcast import (
+    MessageTemplate, Broadcast, BroadcastRecipient, BroadcastStatus, DeliveryStatus,
+    BroadcastShard, RateBudget,
+)
+from .segment import AudienceSegment, AudienceSegmentMember
+from .outbox import OutboxMessage
+from .suppression import DeliverySuppression
 
 __all__ = [
     "UserModel",
@@ -21,5 +27,11 @@ __all__ = [
     "BroadcastRecipient",
     "BroadcastStatus",
     "DeliveryStatus",
+    "BroadcastShard",
+    "RateBudget",
+    "AudienceSegment",
+    "AudienceSegmentMember",
+    "OutboxMessage",
+    "DeliverySuppression",
     "Base",
 ]
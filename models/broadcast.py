@@ -1,5 +1,5 @@
 from typing import Optional, Dict, Any
-from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, JSON, ForeignKey, Enum, func
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, Float, JSON, ForeignKey, Enum, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -52,6 +52,9 @@ class MessageTemplate(Base):
 class Broadcast(Base):
 
     __tablename__: str = "broadcasts"
+    __table_args__ = (
+        Index("idx_broadcasts_status_scheduled_at", "status", "scheduled_at"),
+    )
     __allow_unmapped__ = True
 
     id: int = Column(Integer, primary_key=True)
@@ -72,15 +75,22 @@ class Broadcast(Base):
     total_recipients: int = Column(Integer, default=0)
     sent_count: int = Column(Integer, default=0)
     failed_count: int = Column(Integer, default=0)
+    send_rate: Optional[float] = Column(Float, nullable=True)
+    rate_limit: Optional[float] = Column(Float, nullable=True)
+    progress_updated_at: Optional[datetime] = Column(DateTime, nullable=True)
 
     started_at: Optional[datetime] = Column(DateTime, nullable=True)
     completed_at: Optional[datetime] = Column(DateTime, nullable=True)
+    heartbeat_at: Optional[datetime] = Column(DateTime, nullable=True)
+    attempts: int = Column(Integer, default=0, server_default="0", nullable=False)
+    last_error: Optional[str] = Column(Text, nullable=True)
 
     created_by: int = Column(Integer, nullable=False)
     created_at: datetime = Column(DateTime, server_default=func.now(), index=True)
     updated_at: datetime = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     recipients = relationship("BroadcastRecipient", back_populates="broadcast", cascade="all, delete-orphan")
+    shards = relationship("BroadcastShard", back_populates="broadcast", cascade="all, delete-orphan")
 
     def __str__(self) -> str:
         return f"Broadcast({self.name}, status={self.status.value})"
@@ -92,9 +102,16 @@ class Broadcast(Base):
         )
 
     def get_progress_percent(self) -> float:
-        if self.total_recipients == 0:
+        if not self.total_recipients:
             return 0.0
-        return min(100.0, (self.sent_count / self.total_recipients) * 100)
+        processed = (self.sent_count or 0) + (self.failed_count or 0)
+        return min(100.0, (processed / self.total_recipients) * 100)
+
+    def get_eta_seconds(self) -> Optional[float]:
+        if self.status != BroadcastStatus.in_progress or not self.send_rate:
+            return None
+        remaining = (self.total_recipients or 0) - (self.sent_count or 0) - (self.failed_count or 0)
+        return max(0.0, remaining / self.send_rate)
 
     def is_completed(self) -> bool:
         return self.status in (BroadcastStatus.completed, BroadcastStatus.failed)
@@ -102,6 +119,11 @@ class Broadcast(Base):
 class BroadcastRecipient(Base):
 
     __tablename__: str = "broadcast_recipients"
+    __table_args__ = (
+        Index("idx_broadcast_recipients_broadcast_user", "broadcast_id", "user_id"),
+        Index("idx_broadcast_recipients_telegram_pending", "broadcast_id", "telegram_status"),
+        Index("idx_broadcast_recipients_email_pending", "broadcast_id", "email_status"),
+    )
     __allow_unmapped__ = True
 
     id: int = Column(Integer, primary_key=True)
@@ -110,6 +132,7 @@ class BroadcastRecipient(Base):
     broadcast = relationship("Broadcast", back_populates="recipients")
 
     user_id: int = Column(Integer, nullable=False, index=True)
+    registration_id: Optional[int] = Column(Integer, nullable=True)
     telegram_id: int = Column(BigInteger, nullable=False, index=True)
 
     telegram_status: DeliveryStatus = Column(
@@ -120,6 +143,7 @@ class BroadcastRecipient(Base):
     telegram_sent_at: Optional[datetime] = Column(DateTime, nullable=True)
     telegram_error: Optional[str] = Column(Text, nullable=True)
     telegram_message_id: Optional[int] = Column(Integer, nullable=True)
+    telegram_attempts: int = Column(Integer, default=0, nullable=False)
 
     email_status: DeliveryStatus = Column(
         Enum(DeliveryStatus),
@@ -129,6 +153,7 @@ class BroadcastRecipient(Base):
     email_sent_at: Optional[datetime] = Column(DateTime, nullable=True)
     email_error: Optional[str] = Column(Text, nullable=True)
     email_address: Optional[str] = Column(String(255), nullable=True)
+    email_attempts: int = Column(Integer, default=0, nullable=False)
 
     rendered_subject: Optional[str] = Column(String(500), nullable=True)
     rendered_body: Optional[str] = Column(Text, nullable=True)
@@ -157,3 +182,50 @@ class BroadcastRecipient(Base):
             self.telegram_status == DeliveryStatus.failed or
             self.email_status == DeliveryStatus.failed
         )
+
+class BroadcastShard(Base):
+
+    __tablename__: str = "broadcast_shards"
+    __table_args__ = (
+        Index("idx_broadcast_shards_status_heartbeat", "status", "heartbeat_at"),
+    )
+    __allow_unmapped__ = True
+
+    id: int = Column(Integer, primary_key=True)
+
+    broadcast_id: int = Column(Integer, ForeignKey("broadcasts.id"), nullable=False, index=True)
+    broadcast = relationship("Broadcast", back_populates="shards")
+
+    shard_no: int = Column(Integer, nullable=False)
+    # Inclusive range of BroadcastRecipient.id owned by this shard
+    recipient_id_from: int = Column(Integer, nullable=False)
+    recipient_id_to: int = Column(Integer, nullable=False)
+
+    status: BroadcastStatus = Column(Enum(BroadcastStatus), default=BroadcastStatus.scheduled)
+
+    sent_count: int = Column(Integer, default=0)
+    failed_count: int = Column(Integer, default=0)
+
+    started_at: Optional[datetime] = Column(DateTime, nullable=True)
+    completed_at: Optional[datetime] = Column(DateTime, nullable=True)
+    heartbeat_at: Optional[datetime] = Column(DateTime, nullable=True)
+    attempts: int = Column(Integer, default=0, server_default="0", nullable=False)
+    last_error: Optional[str] = Column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<BroadcastShard id={self.id} broadcast_id={self.broadcast_id} shard_no={self.shard_no} "
+            f"recipients={self.recipient_id_from}..{self.recipient_id_to} status={self.status.value}>"
+        )
+
+class RateBudget(Base):
+
+    __tablename__: str = "rate_budgets"
+
+    # Token bucket shared by every bot process; rows are locked while tokens are taken
+    name: str = Column(String(100), primary_key=True)
+    tokens: float = Column(Float, nullable=False, default=0.0)
+    updated_at: datetime = Column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<RateBudget name='{self.name}' tokens={self.tokens} updated_at={self.updated_at}>"
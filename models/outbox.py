@@ -0,0 +1,34 @@
+from typing import Optional
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Enum, Index, func
+from datetime import datetime
+
+from models.user import Base
+from models.broadcast import DeliveryStatus
+
+class OutboxMessage(Base):
+
+    __tablename__: str = "notification_outbox"
+    __allow_unmapped__ = True
+    __table_args__ = (
+        # The dispatcher polls for pending rows that are due, oldest first
+        Index("idx_notification_outbox_pending", "status", "available_at"),
+    )
+
+    id: int = Column(Integer, primary_key=True)
+    chat_id: int = Column(BigInteger, nullable=False)
+    kind: str = Column(String(50), nullable=False)
+    text: str = Column(Text, nullable=False)
+
+    status: DeliveryStatus = Column(Enum(DeliveryStatus), default=DeliveryStatus.pending)
+    attempts: int = Column(Integer, default=0)
+    last_error: Optional[str] = Column(Text, nullable=True)
+    available_at: datetime = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    created_at: datetime = Column(DateTime, server_default=func.now())
+    sent_at: Optional[datetime] = Column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<OutboxMessage id={self.id} kind='{self.kind}' chat_id={self.chat_id} "
+            f"status={self.status.value if self.status else None} attempts={self.attempts}>"
+        )
@@ -0,0 +1,54 @@
+from typing import Optional, Dict, Any
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, func, false
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from models.user import Base
+
+class AudienceSegment(Base):
+
+    __tablename__: str = "audience_segments"
+    __allow_unmapped__ = True
+
+    id: int = Column(Integer, primary_key=True)
+    name: str = Column(String(255), unique=True, nullable=False, index=True)
+    description: Optional[str] = Column(Text, nullable=True)
+
+    filters: Dict[str, Any] = Column(JSON, nullable=False, default={})
+
+    member_count: int = Column(Integer, default=0)
+    refreshed_at: Optional[datetime] = Column(DateTime, nullable=True)
+    # Set when a user changed since the snapshot; the snapshot is rebuilt before the next broadcast
+    stale: bool = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    created_by: Optional[int] = Column(Integer, nullable=True)
+    created_at: datetime = Column(DateTime, server_default=func.now())
+    updated_at: datetime = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    members = relationship("AudienceSegmentMember", back_populates="segment", cascade="all, delete-orphan")
+
+    def __str__(self) -> str:
+        return f"AudienceSegment({self.name}, {self.member_count} members)"
+
+    def __repr__(self) -> str:
+        return (
+            f"<AudienceSegment id={self.id} name='{self.name}' "
+            f"member_count={self.member_count} refreshed_at={self.refreshed_at}>"
+        )
+
+class AudienceSegmentMember(Base):
+
+    __tablename__: str = "audience_segment_members"
+    __allow_unmapped__ = True
+
+    # (segment_id, user_id) is the primary key, so reading a segment is a range scan in user order
+    segment_id: int = Column(Integer, ForeignKey("audience_segments.id", ondelete="CASCADE"), primary_key=True)
+    segment = relationship("AudienceSegment", back_populates="members")
+
+    user_id: int = Column(Integer, primary_key=True, index=True)
+    registration_id: Optional[int] = Column(Integer, nullable=True)
+    competition_names: Optional[str] = Column(Text, nullable=True)
+    roles: Optional[str] = Column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<AudienceSegmentMember segment_id={self.segment_id} user_id={self.user_id}>"
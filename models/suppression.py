@@ -0,0 +1,19 @@
+from typing import Optional
+from sqlalchemy import Column, String, Text, DateTime, func
+from datetime import datetime
+
+from models.user import Base
+
+class DeliverySuppression(Base):
+
+    __tablename__: str = "delivery_suppressions"
+    __allow_unmapped__ = True
+
+    # address is the telegram_id for 'telegram' and the lower-cased address for 'email'
+    channel: str = Column(String(20), primary_key=True)
+    address: str = Column(String(255), primary_key=True)
+    reason: Optional[str] = Column(Text, nullable=True)
+    created_at: datetime = Column(DateTime, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<DeliverySuppression channel='{self.channel}' address='{self.address}'>"
@@ -0,0 +1,422 @@
+from typing import Dict, List, Optional, Tuple, Union
+from email.message import Message
+from email.utils import getaddresses
+import asyncio
+import base64
+import email.policy
+import logging
+import re
+import ssl
+import time
+
+logger = logging.getLogger(__name__)
+
+SMTP_POLICY = email.policy.compat32.clone(linesep="\r\n")
+
+class SMTPResponseError(Exception):
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+class SMTPRecipientRefused(SMTPResponseError):
+    # RCPT TO rejected with a permanent (5xx) code: the address itself is undeliverable
+    pass
+
+class PreparedMessage:
+
+    # A message already serialized for the wire, e.g. by a render worker process
+    def __init__(self, sender: str, recipients: List[str], data: bytes):
+        self.sender = sender
+        self.recipients = recipients
+        self.data = data
+
+    @classmethod
+    def from_message(cls, msg: Message) -> "PreparedMessage":
+        sender = getaddresses([msg["Sender"] or msg["From"] or ""])[0][1]
+        recipients = [
+            address
+            for _, address in getaddresses(
+                msg.get_all("To", []) + msg.get_all("Cc", []) + msg.get_all("Bcc", [])
+            )
+            if address
+        ]
+        return cls(sender, recipients, msg.as_bytes(policy=SMTP_POLICY))
+
+    def __repr__(self) -> str:
+        return f"<PreparedMessage from={self.sender} to={self.recipients} size={len(self.data)}>"
+
+async def upgrade_to_tls(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    context: ssl.SSLContext,
+    server_hostname: Optional[str] = None,
+    server_side: bool = False,
+) -> asyncio.StreamWriter:
+    if hasattr(writer, "start_tls"):
+        await writer.start_tls(context, server_hostname=server_hostname)
+        return writer
+
+    # Python 3.10 has no StreamWriter.start_tls: upgrade the transport underneath the streams
+    await writer.drain()
+    loop = asyncio.get_running_loop()
+    protocol = writer.transport.get_protocol()
+    try:
+        transport = await loop.start_tls(
+            writer.transport, protocol, context,
+            server_side=server_side,
+            server_hostname=server_hostname,
+        )
+    except BaseException as e:
+        # A failed handshake closes the socket without telling the stream protocol; wait_closed() would hang
+        protocol.connection_lost(e if isinstance(e, Exception) else None)
+        raise
+
+    # Same bookkeeping as StreamReaderProtocol._replace_writer() on 3.11+
+    protocol._over_ssl = True
+    return asyncio.StreamWriter(transport, protocol, reader, loop)
+
+class AsyncSMTPConnection:
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        timeout: float = 10.0,
+        tls_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.tls_context = tls_context
+
+        self.extensions: Dict[str, str] = {}
+        self.messages = 0
+        self.last_used = time.monotonic()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    @property
+    def supports_pipelining(self) -> bool:
+        return "pipelining" in self.extensions
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port),
+            timeout=self.timeout,
+        )
+        await self._expect(220)
+        await self.ehlo()
+
+        if self.use_tls:
+            await self.starttls()
+        if self.username:
+            await self.login()
+
+        self.last_used = time.monotonic()
+
+    async def ehlo(self) -> None:
+        self._write(b"EHLO localhost\r\n")
+        _, lines = await self._expect(250)
+
+        self.extensions = {}
+        for line in lines[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.lower()] = params
+
+    async def starttls(self) -> None:
+        if "starttls" not in self.extensions:
+            raise SMTPResponseError(502, "STARTTLS not supported by server")
+
+        self._write(b"STARTTLS\r\n")
+        await self._expect(220)
+        self._writer = await asyncio.wait_for(
+            upgrade_to_tls(
+                self._reader, self._writer,
+                self.tls_context or ssl.create_default_context(),
+                server_hostname=self.host,
+            ),
+            timeout=self.timeout,
+        )
+        await self.ehlo()
+
+    async def login(self) -> None:
+        mechanisms = self.extensions.get("auth", "").upper().split()
+
+        if "PLAIN" in mechanisms or not mechanisms:
+            token = base64.b64encode(f"\0{self.username}\0{self.password}".encode()).decode()
+            self._write(f"AUTH PLAIN {token}\r\n".encode())
+            await self._expect(235)
+            return
+
+        self._write(b"AUTH LOGIN\r\n")
+        await self._expect(334)
+        self._write(base64.b64encode(self.username.encode()) + b"\r\n")
+        await self._expect(334)
+        self._write(base64.b64encode(self.password.encode()) + b"\r\n")
+        await self._expect(235)
+
+    async def send_message(self, msg: Union[Message, PreparedMessage]) -> None:
+        if not isinstance(msg, PreparedMessage):
+            msg = PreparedMessage.from_message(msg)
+        if not msg.recipients:
+            raise SMTPResponseError(554, "No recipients")
+
+        data = self._prepare_data(msg.data)
+        envelope = [f"MAIL FROM:<{msg.sender}>\r\n".encode()]
+        envelope += [f"RCPT TO:<{address}>\r\n".encode() for address in msg.recipients]
+        envelope.append(b"DATA\r\n")
+
+        try:
+            if self.supports_pipelining:
+                # One write for the whole envelope, then collect the replies in order
+                self._write(b"".join(envelope))
+                replies = [await self._read_reply() for _ in envelope]
+            else:
+                replies = []
+                for command in envelope:
+                    self._write(command)
+                    replies.append(await self._read_reply())
+                    if replies[-1][0] >= 400:
+                        break
+
+            for index, ((code, lines), expected) in enumerate(zip(replies, [250] * (len(envelope) - 1) + [354])):
+                if code != expected:
+                    if code >= 500 and 0 < index < len(envelope) - 1:
+                        raise SMTPRecipientRefused(code, " ".join(lines))
+                    raise SMTPResponseError(code, " ".join(lines))
+        except SMTPResponseError:
+            await self.reset()
+            raise
+
+        self._write(data)
+        await self._expect(250)
+
+        self.messages += 1
+        self.last_used = time.monotonic()
+
+    @staticmethod
+    def _prepare_data(data: bytes) -> bytes:
+        data = re.sub(rb"(?m)^\.", b"..", data)
+        if not data.endswith(b"\r\n"):
+            data += b"\r\n"
+        return data + b".\r\n"
+
+    async def noop(self) -> bool:
+        try:
+            self._write(b"NOOP\r\n")
+            code, _ = await self._read_reply()
+            return code == 250
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, SMTPResponseError):
+            return False
+
+    async def reset(self) -> None:
+        try:
+            self._write(b"RSET\r\n")
+            await self._read_reply()
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, SMTPResponseError):
+            await self.close()
+
+    async def quit(self) -> None:
+        if not self.is_connected:
+            return
+        try:
+            self._write(b"QUIT\r\n")
+            await self._read_reply()
+        except Exception:
+            pass
+        await self.close()
+
+    async def close(self) -> None:
+        writer, self._writer, self._reader = self._writer, None, None
+        if writer is None:
+            return
+        writer.close()
+        try:
+            await asyncio.wait_for(writer.wait_closed(), timeout=self.timeout)
+        except Exception:
+            pass
+
+    def _write(self, data: bytes) -> None:
+        if not self.is_connected:
+            raise ConnectionError("SMTP connection is closed")
+        self._writer.write(data)
+
+    async def _read_reply(self) -> Tuple[int, List[str]]:
+        await asyncio.wait_for(self._writer.drain(), timeout=self.timeout)
+
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self._reader.readline(), timeout=self.timeout)
+            if not line:
+                raise ConnectionError("SMTP server closed the connection")
+
+            line = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            lines.append(line[4:])
+            if len(line) < 4 or line[3] != "-":
+                return int(line[:3]), lines
+
+    async def _expect(self, code: int) -> Tuple[int, List[str]]:
+        reply_code, lines = await self._read_reply()
+        if reply_code != code:
+            raise SMTPResponseError(reply_code, " ".join(lines))
+        return reply_code, lines
+
+    def __repr__(self) -> str:
+        state = "connected" if self.is_connected else "closed"
+        return f"<AsyncSMTPConnection {self.host}:{self.port} {state} messages={self.messages}>"
+
+class AsyncSMTPPool:
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        size: int = 4,
+        idle_check: float = 30.0,
+        max_messages_per_connection: int = 1000,
+        timeout: float = 10.0,
+        tls_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = max(1, size)
+        self.idle_check = idle_check
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+        self.tls_context = tls_context
+
+        self._idle: asyncio.LifoQueue = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(self.size)
+        self._connections: List[AsyncSMTPConnection] = []
+        self.connects = 0
+        self.sent = 0
+
+    @classmethod
+    def from_config(cls, config) -> "AsyncSMTPPool":
+        return cls(
+            host=config.SMTP_HOST,
+            port=config.SMTP_PORT,
+            username=config.SMTP_USERNAME,
+            password=config.SMTP_PASSWORD,
+            use_tls=config.SMTP_USE_TLS,
+            size=config.SMTP_POOL_SIZE,
+            idle_check=config.SMTP_IDLE_CHECK,
+        )
+
+    async def _connect(self) -> AsyncSMTPConnection:
+        connection = AsyncSMTPConnection(
+            self.host, self.port,
+            username=self.username,
+            password=self.password,
+            use_tls=self.use_tls,
+            timeout=self.timeout,
+            tls_context=self.tls_context,
+        )
+        try:
+            await connection.connect()
+        except BaseException:
+            await connection.close()
+            raise
+
+        self._connections.append(connection)
+        self.connects += 1
+        return connection
+
+    async def _discard(self, connection: AsyncSMTPConnection) -> None:
+        if connection in self._connections:
+            self._connections.remove(connection)
+        await connection.quit()
+
+    async def _checkout(self) -> AsyncSMTPConnection:
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+
+            if not connection.is_connected or connection.messages >= self.max_messages_per_connection:
+                await self._discard(connection)
+                continue
+
+            if time.monotonic() - connection.last_used > self.idle_check and not await connection.noop():
+                logger.info("🔄 Pooled SMTP connection went stale, reconnecting")
+                await self._discard(connection)
+                continue
+
+            return connection
+
+        return await self._connect()
+
+    @staticmethod
+    def _is_connection_error(error: BaseException) -> bool:
+        return isinstance(error, (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, OSError))
+
+    async def send(self, msg: Union[Message, PreparedMessage]) -> None:
+        async with self._slots:
+            connection = await self._checkout()
+            try:
+                await connection.send_message(msg)
+            except Exception as e:
+                if not self._is_connection_error(e):
+                    if connection.is_connected:
+                        self._idle.put_nowait(connection)
+                    else:
+                        await self._discard(connection)
+                    raise
+
+                logger.warning(f"⚠️  SMTP connection lost ({e}), retrying on a fresh connection")
+                await self._discard(connection)
+                connection = await self._connect()
+                try:
+                    await connection.send_message(msg)
+                except BaseException:
+                    await self._discard(connection)
+                    raise
+            except BaseException:
+                await self._discard(connection)
+                raise
+
+            self.sent += 1
+            self._idle.put_nowait(connection)
+
+    async def close(self) -> None:
+        connections, self._connections = self._connections, []
+        self._idle = asyncio.LifoQueue()
+        await asyncio.gather(*(connection.quit() for connection in connections), return_exceptions=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<AsyncSMTPPool {self.host}:{self.port} size={self.size} "
+            f"open={len(self._connections)} sent={self.sent}>"
+        )
+
+_async_smtp_pool: Optional[AsyncSMTPPool] = None
+
+def get_async_smtp_pool() -> AsyncSMTPPool:
+    global _async_smtp_pool
+    if _async_smtp_pool is None:
+        from config.email_settings import SMTPConfig
+
+        _async_smtp_pool = AsyncSMTPPool.from_config(SMTPConfig())
+    return _async_smtp_pool
+
+async def close_async_smtp_pool() -> None:
+    global _async_smtp_pool
+    if _async_smtp_pool is not None:
+        await _async_smtp_pool.close()
+        _async_smtp_pool = None
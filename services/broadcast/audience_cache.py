@@ -0,0 +1,87 @@
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine
+
+from .recipient_filter import RecipientFilter
+
+logger = logging.getLogger(__name__)
+
+class AudienceCountCache:
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._counts: Dict[Tuple, Tuple[int, float]] = {}
+        self._pending: Dict[Tuple, asyncio.Task] = {}
+
+    @classmethod
+    def from_settings(cls) -> "AudienceCountCache":
+        from settings import settings
+
+        return cls(ttl=settings.broadcast.audience_count_ttl)
+
+    def get(self, filters: Dict[str, Any]) -> Optional[int]:
+        key = RecipientFilter.normalize_filters(filters)
+        cached = self._counts.get(key)
+        if cached is None:
+            return None
+
+        count, counted_at = cached
+        if time.monotonic() - counted_at > self.ttl:
+            del self._counts[key]
+            return None
+        return count
+
+    def set(self, filters: Dict[str, Any], count: int) -> None:
+        self._counts[RecipientFilter.normalize_filters(filters)] = (count, time.monotonic())
+
+    def is_pending(self, filters: Dict[str, Any]) -> bool:
+        return RecipientFilter.normalize_filters(filters) in self._pending
+
+    def refresh(self, filters: Dict[str, Any], bind: AsyncEngine) -> asyncio.Task:
+        key = RecipientFilter.normalize_filters(filters)
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._count(key, filters, bind), name="audience-count")
+            self._pending[key] = task
+        return task
+
+    async def _count(self, key: Tuple, filters: Dict[str, Any], bind: AsyncEngine) -> Optional[int]:
+        started = time.perf_counter()
+        try:
+            # Not count_recipients(): it turns errors into 0, which must not be cached
+            filters = dict(filters)
+            segment_id = filters.pop('segment_id', None)
+            _, audience = RecipientFilter._audience_select(
+                RecipientFilter._build_conditions(**filters),
+                segment_id,
+            )
+            # Own session: the caller's one is busy serving the preview itself
+            async with AsyncSession(bind) as session:
+                result = await session.execute(select(func.count()).select_from(audience))
+                count = result.scalar() or 0
+            self._counts[key] = (count, time.monotonic())
+            logger.info(f"📋 Counted audience of {count} in {time.perf_counter() - started:.2f}s")
+            return count
+        except Exception as e:
+            logger.error(f"❌ Background audience count failed: {e}")
+            return None
+        finally:
+            self._pending.pop(key, None)
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+    def __repr__(self) -> str:
+        return f"<AudienceCountCache ttl={self.ttl}s cached={len(self._counts)} pending={len(self._pending)}>"
+
+_audience_cache: Optional[AudienceCountCache] = None
+
+def get_audience_cache() -> AudienceCountCache:
+    global _audience_cache
+    if _audience_cache is None:
+        _audience_cache = AudienceCountCache.from_settings()
+    return _audience_cache
@@ -0,0 +1,432 @@
+"""
+Broadcast pipeline benchmarks.
+
+Usage:
+    python -m services.broadcast.benchmark delivery --recipients 600 --concurrency 16
+    python -m services.broadcast.benchmark render --renders 10000
+    python -m services.broadcast.benchmark smtp --emails 200 --pool-size 4
+    python -m services.broadcast.benchmark load --recipients 2000 --concurrency 32 --error-rate 0.01
+"""
+from typing import Dict, Any, List, Optional
+from email.mime.text import MIMEText
+import argparse
+import asyncio
+import os
+import resource
+import shutil
+import smtplib
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, UserModel, CompetitionModel, RegistrationModel, MessageTemplate, Broadcast
+
+from .delivery_engine import DeliveryEngine
+from .rate_limiter import AIMDRateController, RateLimiter
+from .async_smtp import AsyncSMTPPool
+from .orchestrator import BroadcastOrchestrator
+from .simulation import SimulatedChannel, SMTPSink
+from .smtp_pool import SMTPConnectionPool
+from .template_renderer import TemplateRenderer
+
+BENCHMARK_TEMPLATE = (
+    "<p>Здравствуйте, {{ first_name }} {{ last_name }}!</p>\n"
+    "{% if competition_name %}<p>Соревнование: <b>{{ competition_name }}</b></p>{% endif %}\n"
+    "<p>Город: {{ city|default('-') }}, клуб: {{ club|upper }}</p>"
+)
+
+def _synthetic_recipients(count: int):
+    for i in range(count):
+        yield {
+            'user_id': i + 1,
+            'telegram_id': 100000 + i,
+            'email': f'user{i}@example.com',
+            'first_name': f'User{i}',
+        }
+
+async def benchmark_delivery(
+    recipients: int = 600,
+    concurrency: int = 16,
+    latency: float = 0.08,
+    global_rate: float = 30.0,
+    per_chat_rate: float = 1.0,
+) -> Dict[str, Any]:
+    limiter = RateLimiter(global_rate=global_rate, per_chat_rate=per_chat_rate)
+    channel = SimulatedChannel(latency=latency, rate_limiter=limiter)
+
+    engine = DeliveryEngine(
+        lambda recipient: channel.send(recipient, '', 'benchmark'),
+        concurrency=concurrency,
+    )
+
+    started = time.perf_counter()
+    await engine.run(_synthetic_recipients(recipients))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'recipients': recipients,
+        'concurrency': concurrency,
+        'latency': latency,
+        'global_rate': global_rate,
+        'elapsed': elapsed,
+        'messages_per_sec': channel.sent / elapsed if elapsed else 0.0,
+    }
+
+def benchmark_render(renders: int = 10000) -> Dict[str, Any]:
+    contexts = [
+        {
+            'first_name': f'User{i}',
+            'last_name': 'Test',
+            'competition_name': 'USN 2024',
+            'city': 'Moscow',
+            'club': f'club {i % 10}',
+        }
+        for i in range(renders)
+    ]
+
+    uncached = TemplateRenderer()
+    started = time.perf_counter()
+    for context in contexts:
+        uncached.clear_cache()
+        uncached.render(BENCHMARK_TEMPLATE, context)
+    uncached_elapsed = time.perf_counter() - started
+
+    cached = TemplateRenderer()
+    started = time.perf_counter()
+    for context in contexts:
+        cached.render(BENCHMARK_TEMPLATE, context)
+    cached_elapsed = time.perf_counter() - started
+
+    batched = TemplateRenderer()
+    started = time.perf_counter()
+    batched.render_many(BENCHMARK_TEMPLATE, contexts)
+    batched_elapsed = time.perf_counter() - started
+
+    return {
+        'renders': renders,
+        'uncached_us_per_render': uncached_elapsed / renders * 1e6,
+        'cached_us_per_render': cached_elapsed / renders * 1e6,
+        'render_many_us_per_render': batched_elapsed / renders * 1e6,
+        'speedup': uncached_elapsed / cached_elapsed if cached_elapsed else 0.0,
+    }
+
+def _benchmark_message(index: int) -> MIMEText:
+    msg = MIMEText(f"<p>Benchmark message {index}</p>", "html", "utf-8")
+    msg["Subject"] = f"Benchmark {index}"
+    msg["From"] = "bench@example.com"
+    msg["To"] = f"user{index}@example.com"
+    return msg
+
+async def benchmark_smtp(
+    emails: int = 200,
+    pool_size: int = 4,
+    connect_delay: float = 0.05,
+) -> Dict[str, Any]:
+    sink = await SMTPSink(connect_delay=connect_delay).start()
+    loop = asyncio.get_running_loop()
+
+    def send_per_connection(msg: MIMEText) -> None:
+        server = smtplib.SMTP(sink.host, sink.port, timeout=10)
+        server.login("bench", "bench")
+        server.send_message(msg)
+        server.quit()
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, send_per_connection, _benchmark_message(i))
+            for i in range(emails)
+        ))
+        per_connection_elapsed = time.perf_counter() - started
+        per_connection_connects = sink.connections
+
+        pool = SMTPConnectionPool(
+            sink.host, sink.port,
+            username="bench", password="bench",
+            use_tls=False, size=pool_size,
+        )
+        started = time.perf_counter()
+        await asyncio.gather(*(pool.send(_benchmark_message(i)) for i in range(emails)))
+        pooled_elapsed = time.perf_counter() - started
+        await pool.close()
+
+        async_pool = AsyncSMTPPool(
+            sink.host, sink.port,
+            username="bench", password="bench",
+            use_tls=False, size=pool_size,
+        )
+        started = time.perf_counter()
+        await asyncio.gather(*(async_pool.send(_benchmark_message(i)) for i in range(emails)))
+        asyncio_elapsed = time.perf_counter() - started
+        await async_pool.close()
+    finally:
+        await sink.stop()
+
+    return {
+        'emails': emails,
+        'connect_delay': connect_delay,
+        'per_connection_emails_per_sec': emails / per_connection_elapsed,
+        'per_connection_connects': per_connection_connects,
+        'pooled_emails_per_sec': emails / pooled_elapsed,
+        'pooled_connects': pool.connects,
+        'asyncio_emails_per_sec': emails / asyncio_elapsed,
+        'asyncio_connects': async_pool.connects,
+        'pool_size': pool_size,
+        'sink_messages': sink.messages,
+    }
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+async def _seed_load_test(session: AsyncSession, recipients: int, send_email: bool) -> int:
+    competition = CompetitionModel(
+        name="Load test",
+        competition_type="online",
+        available_roles=["player"],
+    )
+    session.add(competition)
+    await session.flush()
+
+    chunk = 1000
+    for start in range(0, recipients, chunk):
+        ids = range(start + 1, min(recipients, start + chunk) + 1)
+        await session.execute(insert(UserModel), [
+            {
+                'id': i,
+                'telegram_id': 10_000_000 + i,
+                'first_name': f'User{i}',
+                'last_name': 'Load',
+                'phone': f'+7{i:010d}',
+                'email': f'user{i}@example.com',
+                'city': 'Moscow',
+                'club': f'club {i % 50}',
+            }
+            for i in ids
+        ])
+        await session.execute(insert(RegistrationModel), [
+            {
+                'user_id': i,
+                'telegram_id': 10_000_000 + i,
+                'competition_id': competition.id,
+                'role': 'player',
+                'status': 'approved',
+            }
+            for i in ids
+        ])
+
+    template = MessageTemplate(
+        name="load-test",
+        subject="Load test for {{ first_name }}",
+        body_telegram=BENCHMARK_TEMPLATE,
+        body_email=BENCHMARK_TEMPLATE,
+        available_variables={},
+    )
+    session.add(template)
+    await session.flush()
+
+    broadcast = Broadcast(
+        name="Load test",
+        template_id=template.id,
+        filters={},
+        send_telegram=True,
+        send_email=send_email,
+        created_by=0,
+    )
+    session.add(broadcast)
+    await session.commit()
+    return broadcast.id
+
+async def benchmark_load(
+    recipients: int = 1000,
+    concurrency: int = 16,
+    latency: float = 0.05,
+    distribution: str = "lognormal",
+    error_rate: float = 0.0,
+    flood_rate: float = 0.0,
+    retry_after: float = 1.0,
+    global_rate: float = 30.0,
+    per_chat_rate: float = 1.0,
+    adaptive_max_rate: Optional[float] = None,
+    send_email: bool = False,
+    database_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    workdir = None
+    if database_url is None:
+        workdir = tempfile.mkdtemp(prefix="broadcast-load-")
+        database_url = f"sqlite+aiosqlite:///{os.path.join(workdir, 'load.sqlite')}"
+
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with session_maker() as session:
+            broadcast_id = await _seed_load_test(session, recipients, send_email)
+
+        controller = None
+        if adaptive_max_rate:
+            controller = AIMDRateController(rate=global_rate, max_rate=max(global_rate, adaptive_max_rate))
+        rate_limiter = RateLimiter(global_rate=global_rate, per_chat_rate=per_chat_rate, controller=controller)
+
+        channels = {
+            'telegram': SimulatedChannel(
+                name="SimulatedTelegram",
+                latency=latency,
+                rate_limiter=rate_limiter,
+                distribution=distribution,
+                error_rate=error_rate,
+                flood_rate=flood_rate,
+                retry_after=retry_after,
+            ),
+        }
+        if send_email:
+            channels['email'] = SimulatedChannel(
+                name="SimulatedEmail",
+                latency=latency,
+                distribution=distribution,
+                error_rate=error_rate,
+            )
+
+        async with session_maker() as session:
+            orchestrator = BroadcastOrchestrator(session, concurrency=concurrency)
+            orchestrator.channels = channels
+            # Shards would only be queued for workers; the benchmark measures one process sending everything
+            orchestrator.shard_count = 1
+
+            started = time.perf_counter()
+            result = await orchestrator.execute_broadcast(broadcast_id)
+            elapsed = time.perf_counter() - started
+    finally:
+        await engine.dispose()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+
+    latencies = [value for channel in channels.values() for value in channel.latencies]
+    messages = sum(channel.sent for channel in channels.values())
+
+    return {
+        'recipients': recipients,
+        'concurrency': concurrency,
+        'distribution': distribution,
+        'elapsed': elapsed,
+        'messages_sent': messages,
+        'messages_per_sec': messages / elapsed if elapsed else 0.0,
+        'send_attempts': len(latencies),
+        'simulated_errors': sum(channel.errors for channel in channels.values()),
+        'simulated_429s': sum(channel.floods for channel in channels.values()),
+        'recipients_sent': result['sent'],
+        'recipients_failed': result['failed'],
+        'p50_send_latency_ms': _percentile(latencies, 50) * 1000,
+        'p99_send_latency_ms': _percentile(latencies, 99) * 1000,
+        'final_rate_limit': rate_limiter.current_rate,
+        'rate_decreases': controller.decreases if controller else 0,
+        'db_flushes': orchestrator.status_flushes,
+        'db_write_seconds': orchestrator.status_write_seconds,
+        # ru_maxrss is reported in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+def _print_result(title: str, result: Dict[str, Any]) -> None:
+    print(f"📊 {title}")
+    for key, value in result.items():
+        if isinstance(value, float):
+            value = f"{value:.3f}"
+        print(f"   {key}: {value}")
+
+async def _run_delivery(args: argparse.Namespace) -> None:
+    serial = await benchmark_delivery(
+        recipients=min(args.recipients, 100),
+        concurrency=1,
+        latency=args.latency,
+        global_rate=args.global_rate,
+    )
+    _print_result("Serial (concurrency=1)", serial)
+
+    concurrent = await benchmark_delivery(
+        recipients=args.recipients,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        global_rate=args.global_rate,
+    )
+    _print_result(f"Concurrent (concurrency={args.concurrency})", concurrent)
+
+async def _run_render(args: argparse.Namespace) -> None:
+    _print_result("Template rendering", benchmark_render(args.renders))
+
+async def _run_smtp(args: argparse.Namespace) -> None:
+    result = await benchmark_smtp(
+        emails=args.emails,
+        pool_size=args.pool_size,
+        connect_delay=args.connect_delay,
+    )
+    _print_result("SMTP delivery against a local sink", result)
+
+async def _run_load(args: argparse.Namespace) -> None:
+    result = await benchmark_load(
+        recipients=args.recipients,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        distribution=args.distribution,
+        error_rate=args.error_rate,
+        flood_rate=args.flood_rate,
+        retry_after=args.retry_after,
+        global_rate=args.global_rate,
+        per_chat_rate=args.per_chat_rate,
+        adaptive_max_rate=args.adaptive_max_rate,
+        send_email=args.email,
+        database_url=args.database_url,
+    )
+    _print_result("Broadcast pipeline load test", result)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Broadcast pipeline benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    delivery = subparsers.add_parser("delivery", help="Delivery engine throughput against a simulated channel")
+    delivery.add_argument("--recipients", type=int, default=600)
+    delivery.add_argument("--concurrency", type=int, default=16)
+    delivery.add_argument("--latency", type=float, default=0.08, help="Simulated API latency, seconds")
+    delivery.add_argument("--global-rate", type=float, default=30.0, help="Global messages per second")
+    delivery.set_defaults(handler=_run_delivery)
+
+    render = subparsers.add_parser("render", help="Per-render cost with and without the compiled-template cache")
+    render.add_argument("--renders", type=int, default=10000)
+    render.set_defaults(handler=_run_render)
+
+    smtp = subparsers.add_parser("smtp", help="Per-message SMTP connections vs the thread pool vs the asyncio transport")
+    smtp.add_argument("--emails", type=int, default=200)
+    smtp.add_argument("--pool-size", type=int, default=4)
+    smtp.add_argument("--connect-delay", type=float, default=0.05, help="Simulated TLS + AUTH cost per connection, seconds")
+    smtp.set_defaults(handler=_run_smtp)
+
+    load = subparsers.add_parser("load", help="Full execute_broadcast run against simulated channels and a synthetic audience")
+    load.add_argument("--recipients", type=int, default=1000)
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--latency", type=float, default=0.05, help="Mean simulated send latency, seconds")
+    load.add_argument("--distribution", choices=SimulatedChannel.LATENCY_DISTRIBUTIONS, default="lognormal")
+    load.add_argument("--error-rate", type=float, default=0.0, help="Share of sends failing with a retryable error")
+    load.add_argument("--flood-rate", type=float, default=0.0, help="Share of sends answered with a 429")
+    load.add_argument("--retry-after", type=float, default=1.0, help="retry_after carried by injected 429s, seconds")
+    load.add_argument("--global-rate", type=float, default=30.0, help="Global Telegram messages per second")
+    load.add_argument("--per-chat-rate", type=float, default=1.0)
+    load.add_argument("--adaptive-max-rate", type=float, default=None, help="Let an AIMD controller move the global rate up to this ceiling")
+    load.add_argument("--email", action="store_true", help="Also deliver through a simulated email channel")
+    load.add_argument("--database-url", default=None, help="Scratch database to use instead of a temporary SQLite file")
+    load.set_defaults(handler=_run_load)
+
+    args = parser.parse_args()
+    asyncio.run(args.handler(args))
+
+if __name__ == "__main__":
+    main()
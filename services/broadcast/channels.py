@@ -14,6 +14,10 @@ class DeliveryResult:
     message_id: Optional[str] = None
     error: Optional[str] = None
     sent_at: Optional[datetime] = None
+    retryable: bool = False
+    retry_after: Optional[float] = None
+    # The address itself is dead (bot blocked, hard bounce), not just this message: worth suppressing
+    unreachable: bool = False
 
 class NotificationChannel(ABC):
 
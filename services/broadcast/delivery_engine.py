@@ -0,0 +1,135 @@
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, List, Optional, Tuple, Union
+import asyncio
+import heapq
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DeliveryEngine:
+
+    def __init__(
+        self,
+        worker: Callable[[Any], Awaitable[Any]],
+        concurrency: int = 16,
+        on_result: Optional[Callable[[Any, Any], None]] = None,
+    ):
+        self.worker = worker
+        self.concurrency = max(1, concurrency)
+        self.on_result = on_result
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        self._workers: List[asyncio.Task] = []
+        self._deferred: List[Tuple[float, int, Any]] = []
+        self._deferred_seq = itertools.count()
+        self._deferred_added = asyncio.Event()
+        self._outstanding = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def deferred(self) -> int:
+        return len(self._deferred)
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker_loop(), name=f"delivery-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._workers.append(asyncio.create_task(self._deferred_loop(), name="delivery-deferred"))
+
+    async def submit(self, item: Any) -> None:
+        self._track()
+        await self._queue.put(item)
+
+    def defer(self, item: Any, delay: float) -> None:
+        # Parked outside the work queue so retries never hold up first attempts
+        self._track()
+        due = asyncio.get_running_loop().time() + max(0.0, delay)
+        heapq.heappush(self._deferred, (due, next(self._deferred_seq), item))
+        self._deferred_added.set()
+
+    async def join(self) -> None:
+        try:
+            await self._idle.wait()
+        finally:
+            await self._stop_workers()
+
+    def _track(self) -> None:
+        self._outstanding += 1
+        self._idle.clear()
+
+    def _untrack(self) -> None:
+        self._outstanding -= 1
+        if self._outstanding <= 0:
+            self._outstanding = 0
+            self._idle.set()
+
+    async def run(self, items: Union[Iterable[Any], AsyncIterable[Any]]) -> None:
+        await self.start()
+        try:
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    await self.submit(item)
+            else:
+                for item in items:
+                    await self.submit(item)
+        except BaseException:
+            await self._stop_workers()
+            raise
+        await self.join()
+
+    async def _stop_workers(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker_loop(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                result = await self.worker(item)
+                if self.on_result:
+                    self.on_result(item, result)
+            except Exception as e:
+                logger.error(f"❌ Delivery worker failed: {e}")
+            finally:
+                self._queue.task_done()
+                self._untrack()
+
+    async def _deferred_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._deferred_added.clear()
+            if not self._deferred:
+                await self._deferred_added.wait()
+                continue
+
+            wait = self._deferred[0][0] - loop.time()
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._deferred_added.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, item = heapq.heappop(self._deferred)
+            await self._queue.put(item)
+
+    async def __aenter__(self) -> "DeliveryEngine":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.join()
+        else:
+            await self._stop_workers()
+
+    def __repr__(self) -> str:
+        return (
+            f"<DeliveryEngine concurrency={self.concurrency} "
+            f"queued={self._queue.qsize()} deferred={len(self._deferred)}>"
+        )
@@ -1,22 +1,62 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from datetime import datetime
+import asyncio
 import logging
 import email
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import re
 import smtplib
-import asyncio
 
 from config.email_settings import SMTPConfig
 from .channels import NotificationChannel, DeliveryResult
+from .async_smtp import AsyncSMTPConnection, AsyncSMTPPool, SMTPResponseError, SMTPRecipientRefused
+from .smtp_pool import SMTPConnectionPool, get_smtp_transport
 
 logger = logging.getLogger(__name__)
 
+def build_message(
+    from_header: str,
+    recipient_email: str,
+    subject: str,
+    body: str
+) -> MIMEMultipart:
+
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = from_header
+    msg["To"] = recipient_email
+    msg["X-Mailer"] = "USN Broadcast System"
+
+    is_html = body.lower().startswith("<html") or "<p>" in body.lower() or "<b>" in body.lower()
+
+    if is_html:
+
+        part = MIMEText(body, "html", _charset="utf-8")
+    else:
+
+        part = MIMEText(body, "plain", _charset="utf-8")
+
+    msg.attach(part)
+    return msg
+
 class EmailChannel(NotificationChannel):
 
-    def __init__(self):
+    def __init__(self, pool: Optional[Union[AsyncSMTPPool, SMTPConnectionPool]] = None):
         self.config = SMTPConfig()
+        self._pool = pool
+        self._configured: Optional[bool] = None
+
+    @property
+    def pool(self) -> Union[AsyncSMTPPool, SMTPConnectionPool]:
+        if self._pool is None:
+            self._pool = get_smtp_transport()
+        return self._pool
+
+    async def _ensure_configured(self) -> bool:
+        if self._configured is None:
+            self._configured = await self.validate_configuration()
+        return self._configured
 
     def get_channel_name(self) -> str:
         return "Email"
@@ -54,25 +94,10 @@ class EmailChannel(NotificationChannel):
         subject: str,
         body: str
     ) -> MIMEMultipart:
+        return build_message(self.get_from_header(), recipient_email, subject, body)
 
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        from_address = self.config.get_from_address()
-        msg["From"] = f"{self.config.EMAIL_FROM_NAME} <{from_address}>"
-        msg["To"] = recipient_email
-        msg["X-Mailer"] = "USN Broadcast System"
-
-        is_html = body.lower().startswith("<html") or "<p>" in body.lower() or "<b>" in body.lower()
-
-        if is_html:
-
-            part = MIMEText(body, "html", _charset="utf-8")
-        else:
-
-            part = MIMEText(body, "plain", _charset="utf-8")
-
-        msg.attach(part)
-        return msg
+    def get_from_header(self) -> str:
+        return f"{self.config.EMAIL_FROM_NAME} <{self.config.get_from_address()}>"
 
     async def send(
         self,
@@ -92,35 +117,17 @@ class EmailChannel(NotificationChannel):
 
         try:
 
-            if not await self.validate_configuration():
+            if not await self._ensure_configured():
                 return DeliveryResult(
                     success=False,
                     status="failed",
                     error="SMTP not configured"
                 )
 
-            msg = self._create_message(recipient_email, subject, body)
-
-            def send_smtp():
-
-                server = smtplib.SMTP(
-                    self.config.SMTP_HOST,
-                    self.config.SMTP_PORT,
-                    timeout=10
-                )
-
-                if self.config.SMTP_USE_TLS:
-                    server.starttls()
-
-                server.login(
-                    self.config.SMTP_USERNAME,
-                    self.config.SMTP_PASSWORD
-                )
-                server.send_message(msg)
-                server.quit()
+            # Prebuilt by the render worker pool when it is enabled
+            msg = recipient.get("email_message") or self._create_message(recipient_email, subject, body)
 
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, send_smtp)
+            await self.pool.send(msg)
 
             logger.info(f"✅ Email sent to {recipient_email}: {subject}")
 
@@ -130,13 +137,15 @@ class EmailChannel(NotificationChannel):
                 sent_at=datetime.utcnow()
             )
 
-        except TimeoutError:
+        except (TimeoutError, asyncio.TimeoutError):
+            # Distinct classes before Python 3.11: asyncio.wait_for raises the asyncio one
             error_msg = f"Timeout connecting to SMTP server {self.config.SMTP_HOST}:{self.config.SMTP_PORT}"
             logger.error(f"❌ {error_msg}")
             return DeliveryResult(
                 success=False,
                 status="failed",
-                error=error_msg
+                error=error_msg,
+                retryable=True
             )
 
         except ConnectionError as e:
@@ -145,7 +154,41 @@ class EmailChannel(NotificationChannel):
             return DeliveryResult(
                 success=False,
                 status="failed",
-                error=error_msg
+                error=error_msg,
+                retryable=True
+            )
+
+        except SMTPRecipientRefused as e:
+            # Hard bounce: the server refused the address itself, retrying will not help
+            error_msg = f"SMTP server refused recipient {recipient_email}: {str(e)}"
+            logger.warning(f"⚠️  {error_msg}")
+            return DeliveryResult(
+                success=False,
+                status="blocked",
+                error=error_msg,
+                unreachable=True
+            )
+
+        except smtplib.SMTPRecipientsRefused as e:
+            permanent = all(code >= 500 for code, _ in e.recipients.values())
+            error_msg = f"SMTP server refused recipient {recipient_email}: {e.recipients}"
+            logger.warning(f"⚠️  {error_msg}")
+            return DeliveryResult(
+                success=False,
+                status="blocked" if permanent else "failed",
+                error=error_msg,
+                retryable=not permanent,
+                unreachable=permanent
+            )
+
+        except SMTPResponseError as e:
+            error_msg = f"SMTP server rejected email to {recipient_email}: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            return DeliveryResult(
+                success=False,
+                status="failed",
+                error=error_msg,
+                retryable=400 <= e.code < 500
             )
 
         except Exception as e:
@@ -162,25 +205,16 @@ class EmailChannel(NotificationChannel):
             if not await self.validate_configuration():
                 return False
 
-            def test_smtp():
-                server = smtplib.SMTP(
-                    self.config.SMTP_HOST,
-                    self.config.SMTP_PORT,
-                    timeout=5
-                )
-
-                if self.config.SMTP_USE_TLS:
-                    server.starttls()
-
-                server.login(
-                    self.config.SMTP_USERNAME,
-                    self.config.SMTP_PASSWORD
-                )
-                server.quit()
-                return True
-
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, test_smtp)
+            connection = AsyncSMTPConnection(
+                self.config.SMTP_HOST,
+                self.config.SMTP_PORT,
+                username=self.config.SMTP_USERNAME,
+                password=self.config.SMTP_PASSWORD,
+                use_tls=self.config.SMTP_USE_TLS,
+                timeout=5
+            )
+            await connection.connect()
+            await connection.quit()
 
             logger.info("✅ Email SMTP connection successful")
             return True
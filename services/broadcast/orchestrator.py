@@ -1,31 +1,71 @@
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Deque, FrozenSet, List, Optional, Set, Tuple
 import logging
 import asyncio
+import json
+from collections import OrderedDict, deque
 from datetime import datetime
+from functools import partial
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import flag_modified
 
-from models import Broadcast, BroadcastRecipient, MessageTemplate, BroadcastStatus
+from models import Broadcast, BroadcastRecipient, BroadcastShard, MessageTemplate, BroadcastStatus
 from .channels import NotificationChannel, DeliveryResult
 from .telegram_channel import TelegramChannel
 from .email_channel import EmailChannel
 from .template_renderer import TemplateRenderer
 from .recipient_filter import RecipientFilter
+from .segments import SegmentManager
+from .delivery_engine import DeliveryEngine
+from .retry_policy import RetryPolicy
+from .status_writer import StatusWriter
+from .audience_cache import get_audience_cache
+from .render_pool import RenderPool, get_render_pool
+from .suppression import SuppressionList, get_suppression_list
 
 logger = logging.getLogger(__name__)
 
+# Worth another run once the scheduler reclaims the broadcast; anything else fails it right away
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)
+
 class BroadcastOrchestrator:
 
+    RENDER_MEMO_SIZE: int = 4096
+    RENDER_AHEAD: int = 2
+
     def __init__(
         self,
         session: AsyncSession,
         bot=None,
+        concurrency: Optional[int] = None,
     ):
+        from settings import settings
+
         self.session = session
         self.bot = bot
+        self.concurrency = concurrency or settings.broadcast.concurrency
+        self.email_concurrency = settings.broadcast.email_concurrency
+        self.lane_max_ahead = settings.broadcast.lane_max_ahead
+        self.status_batch_size = settings.broadcast.status_batch_size
+        self.status_flush_interval = settings.broadcast.status_flush_interval
+        self.recipient_batch_size = settings.broadcast.recipient_batch_size
+        self.heartbeat_interval = settings.broadcast.lease_timeout / 3
+        self.shard_count = settings.broadcast.shard_count
+        self.retry_policy = RetryPolicy.from_settings()
         self.renderer = TemplateRenderer()
+        self._rendered: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self.render_pool: Optional[RenderPool] = get_render_pool()
+        self.suppression: SuppressionList = get_suppression_list()
         self.recipient_filter = RecipientFilter(session)
+        self._session_lock = asyncio.Lock()
+        self._status_writer: Optional[StatusWriter] = None
+        self._engines: Dict[str, DeliveryEngine] = {}
+        self.status_flushes = 0
+        self.status_write_seconds = 0.0
+        self.lane_backlog_peak = 0
 
         self.channels: Dict[str, NotificationChannel] = {}
 
@@ -37,7 +77,8 @@ class BroadcastOrchestrator:
     async def preview_broadcast(
         self,
         broadcast_id: int,
-        sample_size: int = 5
+        sample_size: int = 5,
+        estimate: bool = False
     ) -> Dict[str, Any]:
         try:
 
@@ -46,13 +87,37 @@ class BroadcastOrchestrator:
                 return {'error': f'Broadcast {broadcast_id} not found'}
 
             template = broadcast.template
+            filters = broadcast.filters or {}
+            audience_cache = get_audience_cache()
 
-            total = await self.recipient_filter.count_recipients(**broadcast.filters)
+            total = audience_cache.get(filters)
+            total_is_estimate = False
 
-            samples_data = await self.recipient_filter.get_recipients(
-                limit=sample_size,
-                **broadcast.filters
-            )
+            if total is not None:
+                samples_data, _ = await self.recipient_filter.sample_recipients(
+                    limit=sample_size,
+                    with_total=False,
+                    **filters
+                )
+            elif estimate:
+                # Answer now; the exact count lands in the cache for the next preview
+                samples_data, total = await self.recipient_filter.sample_recipients(
+                    limit=sample_size,
+                    with_total=False,
+                    **filters
+                )
+                if total is not None:
+                    audience_cache.set(filters, total)
+                else:
+                    audience_cache.refresh(filters, self.session.bind)
+                    total = await self.recipient_filter.estimate_recipients(**filters)
+                    total_is_estimate = True
+            else:
+                samples_data, total = await self.recipient_filter.sample_recipients(
+                    limit=sample_size,
+                    **filters
+                )
+                audience_cache.set(filters, total)
 
             samples = []
             for recipient in samples_data:
@@ -74,6 +139,8 @@ class BroadcastOrchestrator:
                 'name': broadcast.name,
                 'template_name': template.name,
                 'total_recipients': total,
+                'total_is_estimate': total_is_estimate,
+                'total_pending': audience_cache.is_pending(filters),
                 'filters': broadcast.filters,
                 'send_telegram': broadcast.send_telegram,
                 'send_email': broadcast.send_email,
@@ -87,7 +154,8 @@ class BroadcastOrchestrator:
     async def execute_broadcast(
         self,
         broadcast_id: int,
-        dry_run: bool = False
+        dry_run: bool = False,
+        report_path: Optional[str] = None
     ) -> Dict[str, Any]:
         try:
 
@@ -99,18 +167,57 @@ class BroadcastOrchestrator:
             template = broadcast.template
             logger.info(f"📢 Starting broadcast '{broadcast.name}' (template: {template.name})")
 
+            channels = self._active_channels(broadcast)
+            previous = {'sent': 0, 'failed': 0}
+
             if not dry_run:
+                materialized = await self.recipient_filter.count_materialized(broadcast.id)
+
                 broadcast.status = BroadcastStatus.in_progress
-                broadcast.started_at = datetime.utcnow()
+                broadcast.started_at = broadcast.started_at or datetime.utcnow()
+                broadcast.heartbeat_at = datetime.utcnow()
                 await self.session.merge(broadcast)
                 await self.session.commit()
 
-            recipients = await self.recipient_filter.get_recipients(**broadcast.filters)
-            logger.info(f"📋 Found {len(recipients)} recipients")
+                if materialized:
+                    # Interrupted run: recipients are already materialized, continue with pending rows only
+                    total = materialized
+                    previous = await self.recipient_filter.count_delivery_outcomes(broadcast.id, channels)
+                    logger.info(
+                        f"🔄 Resuming broadcast {broadcast.id}: "
+                        f"{previous['sent'] + previous['failed']}/{total} recipients already processed"
+                    )
+                    broadcast.sent_count = previous['sent']
+                    broadcast.failed_count = previous['failed']
+                    await self.session.merge(broadcast)
+                    await self.session.commit()
+                else:
+                    segment_id = broadcast.filters.get('segment_id')
+                    if segment_id is not None:
+                        # Users changed since the snapshot: rebuild it once here rather than on every update
+                        await SegmentManager(self.session).refresh_if_stale(segment_id)
+                    total = await self.recipient_filter.materialize_recipients(
+                        broadcast.id,
+                        **broadcast.filters
+                    )
+                    broadcast.total_recipients = total
+                    broadcast.sent_count = 0
+                    broadcast.failed_count = 0
+                    await self.session.commit()
+                    logger.info(f"✅ Created {total} BroadcastRecipient records")
+
+                if await self.recipient_filter.exclude_suppressed(broadcast.id, channels):
+                    previous = await self.recipient_filter.count_delivery_outcomes(broadcast.id, channels)
+                    broadcast.sent_count = previous['sent']
+                    broadcast.failed_count = previous['failed']
+                    await self.session.merge(broadcast)
+                await self.session.commit()
+            else:
+                total = await self.recipient_filter.count_recipients(**broadcast.filters)
 
-            broadcast.total_recipients = len(recipients)
+            logger.info(f"📋 Found {total} recipients")
 
-            if not recipients:
+            if not total:
                 logger.warning("⚠️  No recipients found for broadcast")
                 if not dry_run:
                     broadcast.status = BroadcastStatus.completed
@@ -125,41 +232,47 @@ class BroadcastOrchestrator:
                     'error': 'No recipients found'
                 }
 
-            if not dry_run:
-                for recipient in recipients:
-                    broadcast_recipient = BroadcastRecipient(
-                        broadcast_id=broadcast.id,
-                        user_id=recipient['user_id'],
-                        telegram_id=recipient['telegram_id'],
-                        email_address=recipient['email'],
-                    )
-                    self.session.add(broadcast_recipient)
-
-                await self.session.commit()
-                logger.info(f"✅ Created {len(recipients)} BroadcastRecipient records")
+            if not dry_run and self.shard_count > 1:
+                shards = await self._create_shards(broadcast)
+                if shards:
+                    # Any worker (this one included) picks the shards up through the scheduler
+                    return {
+                        'broadcast_id': broadcast.id,
+                        'total_recipients': total,
+                        'shards': shards,
+                    }
 
-            sent_count = 0
-            failed_count = 0
-            results = []
-
-            for recipient in recipients:
-                result = await self._send_to_recipient(
-                    broadcast,
-                    template,
-                    recipient,
-                    dry_run=dry_run
+            if dry_run:
+                batches = partial(
+                    self.recipient_filter.iter_recipients,
+                    batch_size=self.recipient_batch_size,
+                    **broadcast.filters
+                )
+            else:
+                batches = partial(
+                    self.recipient_filter.iter_pending_recipients,
+                    broadcast.id,
+                    channels,
+                    batch_size=self.recipient_batch_size
                 )
 
-                results.append(result)
-
-                if result['success']:
-                    sent_count += 1
-                else:
-                    failed_count += 1
+            sent_count, failed_count = await self._deliver(
+                broadcast,
+                template,
+                batches,
+                previous,
+                dry_run=dry_run,
+                report_path=report_path,
+                heartbeat=None if dry_run else (Broadcast, broadcast.id),
+            )
 
             if not dry_run:
                 broadcast.sent_count = sent_count
                 broadcast.failed_count = failed_count
+                # The live rate was written behind the ORM's back, so the identity map still holds None
+                broadcast.send_rate = None
+                flag_modified(broadcast, 'send_rate')
+                broadcast.progress_updated_at = datetime.utcnow()
                 broadcast.status = BroadcastStatus.completed
                 broadcast.completed_at = datetime.utcnow()
                 await self.session.merge(broadcast)
@@ -167,18 +280,506 @@ class BroadcastOrchestrator:
 
             logger.info(f"✅ Broadcast completed: {sent_count} sent, {failed_count} failed")
 
-            return {
+            result = {
                 'broadcast_id': broadcast.id,
-                'total_recipients': len(recipients),
+                'total_recipients': total,
                 'sent': sent_count,
                 'failed': failed_count,
-                'details': results,
             }
+            if report_path:
+                result['report_path'] = report_path
+            return result
 
         except Exception as e:
             logger.error(f"❌ Broadcast execution failed: {e}")
+            if not dry_run:
+                await self._record_failure(broadcast_id, e)
             return {'error': str(e), 'broadcast_id': broadcast_id}
 
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        if isinstance(error, DBAPIError) and error.connection_invalidated:
+            return True
+        return isinstance(error, TRANSIENT_ERRORS)
+
+    async def _record_failure(self, broadcast_id: int, error: Exception) -> None:
+        values: Dict[str, Any] = {'last_error': str(error)}
+        if not self._is_transient(error):
+            values.update(status=BroadcastStatus.failed, completed_at=datetime.utcnow())
+
+        try:
+            await self.session.rollback()
+            await self.session.execute(
+                update(Broadcast)
+                .where(Broadcast.id == broadcast_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+        except Exception as e:
+            # Left in progress: the scheduler reclaims it once the lease expires
+            logger.warning(f"⚠️  Could not record failure of broadcast {broadcast_id}: {e}")
+            return
+
+        if 'status' in values:
+            logger.error(f"❌ Broadcast {broadcast_id} marked as failed")
+
+    async def _record_shard_failure(self, shard_id: int, error: Exception) -> None:
+        failed = not self._is_transient(error)
+        now = datetime.utcnow()
+
+        try:
+            await self.session.rollback()
+            shard_values: Dict[str, Any] = {'last_error': str(error)}
+            if failed:
+                shard_values.update(status=BroadcastStatus.failed, completed_at=now)
+            result = await self.session.execute(
+                update(BroadcastShard)
+                .where(BroadcastShard.id == shard_id)
+                .values(**shard_values)
+                .returning(BroadcastShard.broadcast_id, BroadcastShard.shard_no)
+                .execution_options(synchronize_session=False)
+            )
+            shard = result.first()
+
+            if failed and shard is not None:
+                # The broadcast can never complete without this shard's recipients
+                await self.session.execute(
+                    update(Broadcast)
+                    .where(
+                        Broadcast.id == shard.broadcast_id,
+                        Broadcast.status == BroadcastStatus.in_progress,
+                    )
+                    .values(
+                        status=BroadcastStatus.failed,
+                        completed_at=now,
+                        last_error=f"Shard {shard.shard_no}: {error}",
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            await self.session.commit()
+        except Exception as e:
+            # Left in progress: the scheduler reclaims the shard once its lease expires
+            logger.warning(f"⚠️  Could not record failure of broadcast shard {shard_id}: {e}")
+            return
+
+        if failed and shard is not None:
+            logger.error(f"❌ Broadcast {shard.broadcast_id} marked as failed (shard {shard.shard_no})")
+
+    async def _deliver(
+        self,
+        broadcast: Broadcast,
+        template: MessageTemplate,
+        batches: Callable[..., AsyncIterator[List[Dict[str, Any]]]],
+        previous: Dict[str, int],
+        dry_run: bool = False,
+        report_path: Optional[str] = None,
+        heartbeat: Optional[Tuple[Any, int]] = None
+    ) -> Tuple[int, int]:
+        sent_count = previous['sent']
+        failed_count = previous['failed']
+        report_mode = 'a' if any(previous.values()) else 'w'
+        report = open(report_path, report_mode, encoding='utf-8') if report_path else None
+
+        def collect(recipient: Dict[str, Any], result: Dict[str, Any]) -> None:
+            nonlocal sent_count, failed_count
+            if result.get('retrying'):
+                return
+            if result['success']:
+                sent_count += 1
+            else:
+                failed_count += 1
+            if self._status_writer:
+                self._status_writer.record_outcome(result['success'])
+            if report:
+                report.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+
+        async def worker(recipient: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                return await self._send_to_recipient(broadcast, template, recipient, dry_run=dry_run)
+            except Exception as e:
+                # Still reported, otherwise a lane merge never completes and the recipient is never counted
+                logger.error(f"❌ Delivery to user {recipient['user_id']} failed: {e}")
+                return {
+                    'user_id': recipient['user_id'],
+                    'success': recipient.get('delivered', False),
+                    'error': str(e),
+                    'channels': {},
+                }
+
+        self._rendered.clear()
+        lanes = [] if dry_run else self._active_channels(broadcast)
+
+        if len(lanes) > 1:
+            # Each channel reads its own pending rows and has its own workers,
+            # so a slow SMTP server never holds up Telegram and vice versa
+            waiting: Dict[int, Tuple[str, Set[str], Dict[str, Any]]] = {}
+            # Recipients each lane finished that other lanes still owe; capped so a fast lane
+            # cannot buffer the whole audience while a slow one catches up
+            ahead = {lane: 0 for lane in lanes}
+            room = {lane: asyncio.Event() for lane in lanes}
+
+            def merge(recipient: Dict[str, Any], result: Dict[str, Any]) -> None:
+                if result.get('retrying'):
+                    return
+                user_id = recipient['user_id']
+                entry = waiting.get(user_id)
+                if entry is None:
+                    remaining = recipient['fanout'] - recipient['pending_channels']
+                    if remaining:
+                        lane = next(iter(recipient['pending_channels']))
+                        waiting[user_id] = (lane, remaining, result)
+                        ahead[lane] += 1
+                        self.lane_backlog_peak = max(self.lane_backlog_peak, len(waiting))
+                    else:
+                        collect(recipient, result)
+                    return
+
+                lane, remaining, merged = entry
+                remaining -= recipient['pending_channels']
+                merged.setdefault('channels', {}).update(result.get('channels', {}))
+                merged['success'] = merged['success'] or result['success']
+                if remaining:
+                    waiting[user_id] = (lane, remaining, merged)
+                    return
+
+                del waiting[user_id]
+                ahead[lane] -= 1
+                room[lane].set()
+                collect(recipient, merged)
+
+            async def wait_for_room(lane: str) -> None:
+                # Lanes read recipients in id order, so the lane being waited on is never blocked itself
+                while ahead[lane] >= self.lane_max_ahead:
+                    room[lane].clear()
+                    await room[lane].wait()
+
+            self._engines = {
+                lane: DeliveryEngine(worker, concurrency=self._lane_concurrency(lane), on_result=merge)
+                for lane in lanes
+            }
+
+            async def run() -> None:
+                await self._run_lanes([
+                    engine.run(self._lane_recipients(lane, lanes, batches, template, wait_for_room))
+                    for lane, engine in self._engines.items()
+                ])
+        else:
+            engine = DeliveryEngine(worker, concurrency=self.concurrency, on_result=collect)
+            self._engines = {lane: engine for lane in lanes}
+
+            async def run() -> None:
+                await engine.run(self._stream_recipients(
+                    batches(),
+                    template,
+                    build_email=broadcast.send_email and not dry_run
+                ))
+
+        try:
+            if dry_run:
+                await run()
+            else:
+                # Pick up suppressions added or cleared by other processes since the last run
+                await self.suppression.load(self.session)
+                self._status_writer = StatusWriter(
+                    self.session,
+                    broadcast.id,
+                    batch_size=self.status_batch_size,
+                    flush_interval=self.status_flush_interval,
+                    lock=self._session_lock,
+                    rate_limit=self._rate_limit_metric(broadcast),
+                )
+                heartbeat_task = asyncio.create_task(self._heartbeat(*heartbeat))
+                try:
+                    async with self._status_writer:
+                        await run()
+                finally:
+                    heartbeat_task.cancel()
+                    await asyncio.gather(heartbeat_task, return_exceptions=True)
+                    self.status_flushes = self._status_writer.flushes
+                    self.status_write_seconds = self._status_writer.flush_seconds
+                    self._status_writer = None
+                    try:
+                        await self.suppression.flush(self.session)
+                    except Exception as e:
+                        logger.warning(f"⚠️  Could not save suppressed recipients: {e}")
+        finally:
+            self._engines = {}
+            if report:
+                report.close()
+
+        return sent_count, failed_count
+
+    async def execute_shard(self, shard_id: int) -> Dict[str, Any]:
+        try:
+
+            shard = await self.session.get(BroadcastShard, shard_id)
+            if not shard:
+                logger.error(f"❌ Broadcast shard {shard_id} not found")
+                return {'error': 'Shard not found', 'shard_id': shard_id}
+
+            broadcast = await self._load_broadcast(shard.broadcast_id)
+            template = broadcast.template
+            channels = self._active_channels(broadcast)
+            id_range = (shard.recipient_id_from, shard.recipient_id_to)
+
+            shard.status = BroadcastStatus.in_progress
+            shard.started_at = shard.started_at or datetime.utcnow()
+            shard.heartbeat_at = datetime.utcnow()
+            await self.session.commit()
+
+            await self.recipient_filter.exclude_suppressed(broadcast.id, channels, id_range)
+            await self.session.commit()
+            previous = await self.recipient_filter.count_delivery_outcomes(broadcast.id, channels, id_range)
+            logger.info(
+                f"📢 Running shard {shard.shard_no} of broadcast {broadcast.id} "
+                f"(recipients {id_range[0]}..{id_range[1]})"
+            )
+
+            batches = partial(
+                self.recipient_filter.iter_pending_recipients,
+                broadcast.id,
+                channels,
+                batch_size=self.recipient_batch_size,
+                id_range=id_range
+            )
+            sent_count, failed_count = await self._deliver(
+                broadcast,
+                template,
+                batches,
+                previous,
+                heartbeat=(BroadcastShard, shard.id),
+            )
+
+            shard.sent_count = sent_count
+            shard.failed_count = failed_count
+            shard.status = BroadcastStatus.completed
+            shard.completed_at = datetime.utcnow()
+            await self.session.commit()
+
+            logger.info(f"✅ Shard {shard.shard_no} of broadcast {broadcast.id} completed: {sent_count} sent, {failed_count} failed")
+            await self._complete_sharded_broadcast(broadcast, channels)
+
+            return {
+                'broadcast_id': broadcast.id,
+                'shard_id': shard.id,
+                'sent': sent_count,
+                'failed': failed_count,
+            }
+
+        except Exception as e:
+            logger.error(f"❌ Broadcast shard {shard_id} failed: {e}")
+            await self._record_shard_failure(shard_id, e)
+            return {'error': str(e), 'shard_id': shard_id}
+
+    async def _create_shards(self, broadcast: Broadcast) -> int:
+        result = await self.session.execute(
+            select(func.count()).select_from(BroadcastShard).where(
+                BroadcastShard.broadcast_id == broadcast.id
+            )
+        )
+        existing = result.scalar()
+        if existing:
+            return existing
+
+        bounds = await self.recipient_filter.get_recipient_id_bounds(broadcast.id)
+        if bounds is None:
+            return 0
+
+        # Recipients come from one INSERT ... SELECT, so their ids are dense and equal ranges are equal work
+        low, high = bounds
+        count = min(self.shard_count, high - low + 1)
+        step = -(-(high - low + 1) // count)
+
+        for shard_no in range(count):
+            start = low + shard_no * step
+            if start > high:
+                break
+            self.session.add(BroadcastShard(
+                broadcast_id=broadcast.id,
+                shard_no=shard_no,
+                recipient_id_from=start,
+                recipient_id_to=min(high, start + step - 1),
+                status=BroadcastStatus.scheduled,
+            ))
+        await self.session.commit()
+
+        logger.info(f"✅ Broadcast {broadcast.id} split into {count} shards")
+        return count
+
+    async def _complete_sharded_broadcast(self, broadcast: Broadcast, channels: List[str]) -> bool:
+        # Every shard checks after committing its own completion, so the last one to finish always sees all of them
+        result = await self.session.execute(
+            select(func.count()).select_from(BroadcastShard).where(
+                BroadcastShard.broadcast_id == broadcast.id,
+                BroadcastShard.status != BroadcastStatus.completed,
+            )
+        )
+        if result.scalar():
+            return False
+
+        outcomes = await self.recipient_filter.count_delivery_outcomes(broadcast.id, channels)
+        await self.session.execute(
+            update(Broadcast)
+            .where(
+                Broadcast.id == broadcast.id,
+                Broadcast.status == BroadcastStatus.in_progress,
+            )
+            .values(
+                sent_count=outcomes['sent'],
+                failed_count=outcomes['failed'],
+                send_rate=None,
+                progress_updated_at=datetime.utcnow(),
+                status=BroadcastStatus.completed,
+                completed_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+
+        logger.info(
+            f"✅ Broadcast completed: {outcomes['sent']} sent, {outcomes['failed']} failed "
+            f"(all shards of broadcast {broadcast.id} done)"
+        )
+        return True
+
+    async def _heartbeat(self, model, row_id: int) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self._session_lock:
+                    await self.session.execute(
+                        update(model)
+                        .where(model.id == row_id)
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+                    await self.session.commit()
+            except Exception as e:
+                logger.warning(f"⚠️  Heartbeat for {model.__tablename__} {row_id} failed: {e}")
+
+    async def _run_lanes(self, runs: List[Awaitable[None]]) -> None:
+        tasks = [asyncio.ensure_future(run) for run in runs]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # One lane failing stops the others instead of leaving them running unobserved
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _lane_recipients(
+        self,
+        lane: str,
+        lanes: List[str],
+        batches: Callable[..., AsyncIterator[List[Dict[str, Any]]]],
+        template: MessageTemplate,
+        wait_for_room: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async for recipient in self._stream_recipients(batches(lane=lane), template, build_email=lane == 'email'):
+            if wait_for_room is not None:
+                await wait_for_room(lane)
+            # fanout: every channel still owed to this recipient, so merge() knows when it is finished
+            fanout = set(recipient.get('pending_channels') or lanes) & set(lanes)
+            yield {**recipient, 'pending_channels': {lane}, 'fanout': fanout}
+
+    def _lane_concurrency(self, lane: str) -> int:
+        return self.email_concurrency if lane == 'email' else self.concurrency
+
+    async def _stream_recipients(
+        self,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+        template: Optional[MessageTemplate] = None,
+        build_email: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        if template is not None and self.render_pool is not None:
+            async for recipient in self._stream_rendered_in_pool(batches, template, build_email):
+                yield recipient
+            return
+
+        try:
+            while True:
+                # Status flushes share this session, so page fetches must not interleave with them
+                async with self._session_lock:
+                    batch = await anext(batches, None)
+                if batch is None:
+                    return
+                if template is not None:
+                    self._render_batch(template, batch)
+                for recipient in batch:
+                    yield recipient
+        finally:
+            await batches.aclose()
+
+    async def _stream_rendered_in_pool(
+        self,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+        template: MessageTemplate,
+        build_email: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # At most RENDER_AHEAD batches are held in memory: one being sent, the rest rendering
+        in_flight: Deque[Tuple[List[Dict[str, Any]], asyncio.Future]] = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.RENDER_AHEAD:
+                    async with self._session_lock:
+                        batch = await anext(batches, None)
+                    if batch is None:
+                        exhausted = True
+                        break
+                    in_flight.append((
+                        batch,
+                        asyncio.ensure_future(self._render_batch_in_pool(template, batch, build_email)),
+                    ))
+
+                if not in_flight:
+                    return
+
+                batch, rendering = in_flight.popleft()
+                await rendering
+                for recipient in batch:
+                    yield recipient
+        finally:
+            for _, rendering in in_flight:
+                rendering.cancel()
+            await batches.aclose()
+
+    async def _render_batch_in_pool(
+        self,
+        template: MessageTemplate,
+        recipients: List[Dict[str, Any]],
+        build_email: bool
+    ) -> None:
+        variables = self._template_variables(template)
+
+        groups: Dict[Tuple, int] = {}
+        contexts: List[Dict[str, Any]] = []
+        emails: List[Tuple[int, Optional[str]]] = []
+        for recipient in recipients:
+            key = self.renderer.context_key(variables, recipient)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = len(contexts)
+                # Only the variables the template reads cross the process boundary
+                contexts.append({name: recipient.get(name) for name in variables})
+            wants_email = build_email and self._should_send(recipient, 'email')
+            emails.append((group, recipient.get('email') if wants_email else None))
+
+        email_channel = self.channels.get('email')
+        from_header = email_channel.get_from_header() if isinstance(email_channel, EmailChannel) else None
+
+        rendered, messages = await self.render_pool.render(
+            (template.subject, template.body_telegram, template.body_email),
+            contexts,
+            emails,
+            from_header,
+        )
+
+        for recipient, (group, _), message in zip(recipients, emails, messages):
+            recipient['rendered'] = rendered[group]
+            if message is not None:
+                recipient['email_message'] = message
+
     async def _send_to_recipient(
         self,
         broadcast: Broadcast,
@@ -187,18 +788,18 @@ class BroadcastOrchestrator:
         dry_run: bool = False
     ) -> Dict[str, Any]:
 
-        try:
-            subject = self.renderer.render(template.subject, recipient)
-            body_telegram = self.renderer.render(template.body_telegram, recipient)
-            body_email = self.renderer.render(template.body_email, recipient)
-        except Exception as e:
-            logger.error(f"❌ Template rendering failed for {recipient['user_id']}: {e}")
+        rendered = recipient.get('rendered') or self._render_message(template, recipient)
+        if 'error' in rendered:
             return {
                 'user_id': recipient['user_id'],
-                'success': False,
-                'error': f'Rendering failed: {str(e)}'
+                'success': recipient.get('delivered', False),
+                'error': f"Rendering failed: {rendered['error']}"
             }
 
+        subject = rendered['subject']
+        body_telegram = rendered['body_telegram']
+        body_email = rendered['body_email']
+
         result = {
             'user_id': recipient['user_id'],
             'telegram_id': recipient['telegram_id'],
@@ -206,7 +807,7 @@ class BroadcastOrchestrator:
             'channels': {},
         }
 
-        if broadcast.send_telegram and self._channel_enabled('telegram'):
+        if broadcast.send_telegram and self._should_send(recipient, 'telegram'):
             if dry_run:
                 result['channels']['telegram'] = {'status': 'simulated'}
             else:
@@ -217,7 +818,7 @@ class BroadcastOrchestrator:
                 )
                 result['channels']['telegram'] = tg_result
 
-        if broadcast.send_email and self._channel_enabled('email'):
+        if broadcast.send_email and self._should_send(recipient, 'email'):
             if dry_run:
                 result['channels']['email'] = {'status': 'simulated'}
             else:
@@ -229,13 +830,81 @@ class BroadcastOrchestrator:
                 )
                 result['channels']['email'] = email_result
 
-        result['success'] = any(
+        result['success'] = recipient.get('delivered', False) or any(
             ch.get('success', False)
             for ch in result['channels'].values()
         )
 
+        retry_channels = {
+            name for name, ch in result['channels'].items()
+            if ch.get('retry')
+        }
+        engine = self._engines.get(min(retry_channels)) if retry_channels else None
+        if engine:
+            attempts = dict(recipient.get('attempts') or {})
+            for name in retry_channels:
+                attempts[name] = self._attempt(recipient, name)
+
+            delay = max(
+                self.retry_policy.delay(attempts[name], result['channels'][name].get('retry_after'))
+                for name in retry_channels
+            )
+            engine.defer(
+                {
+                    **recipient,
+                    'pending_channels': retry_channels,
+                    'attempts': attempts,
+                    'delivered': result['success'],
+                },
+                delay
+            )
+            result['retrying'] = sorted(retry_channels)
+            logger.info(
+                f"🔄 Retrying {', '.join(result['retrying'])} for user {recipient['user_id']} "
+                f"in {delay:.1f}s"
+            )
+
         return result
 
+    def _render_message(self, template: MessageTemplate, recipient: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return {
+                'subject': self.renderer.render(template.subject, recipient),
+                'body_telegram': self.renderer.render(template.body_telegram, recipient),
+                'body_email': self.renderer.render(template.body_email, recipient),
+            }
+        except Exception as e:
+            logger.error(f"❌ Template rendering failed for {recipient['user_id']}: {e}")
+            return {'error': str(e)}
+
+    def _template_variables(self, template: MessageTemplate) -> FrozenSet[str]:
+        return (
+            self.renderer.get_variables(template.subject)
+            | self.renderer.get_variables(template.body_telegram)
+            | self.renderer.get_variables(template.body_email)
+        )
+
+    def _render_batch(self, template: MessageTemplate, recipients: List[Dict[str, Any]]) -> None:
+        variables = self._template_variables(template)
+
+        groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+        for recipient in recipients:
+            groups.setdefault(self.renderer.context_key(variables, recipient), []).append(recipient)
+
+        for key, members in groups.items():
+            rendered = self._rendered.get(key)
+            if rendered is None:
+                rendered = self._render_message(template, members[0])
+                self._rendered[key] = rendered
+                while len(self._rendered) > self.RENDER_MEMO_SIZE:
+                    self._rendered.popitem(last=False)
+            else:
+                self._rendered.move_to_end(key)
+
+            # Shared by reference: every member of the group sends the same strings
+            for recipient in members:
+                recipient['rendered'] = rendered
+
     async def _send_telegram(
         self,
         recipient: Dict[str, Any],
@@ -247,29 +916,22 @@ class BroadcastOrchestrator:
             if not channel:
                 return {'status': 'disabled'}
 
-            delivery = await channel.send(recipient, '', body)
+            delivery = await self._send_unless_suppressed(
+                channel, 'telegram', recipient.get('telegram_id'), recipient, '', body
+            )
 
-            if delivery.success:
-                await self._update_recipient_status(
-                    broadcast_id,
-                    recipient['user_id'],
-                    'telegram',
-                    'sent',
-                    message_id=delivery.message_id
-                )
-            else:
-                await self._update_recipient_status(
-                    broadcast_id,
-                    recipient['user_id'],
-                    'telegram',
-                    delivery.status,
-                    error=delivery.error
-                )
+            attempt = self._attempt(recipient, 'telegram')
+            retry = self.retry_policy.should_retry(delivery, attempt)
+            await self._record_delivery(
+                recipient['user_id'], 'telegram', delivery, attempt, final=not retry
+            )
 
             return {
                 'success': delivery.success,
                 'status': delivery.status,
                 'error': delivery.error,
+                'retry': retry,
+                'retry_after': delivery.retry_after,
             }
 
         except Exception as e:
@@ -292,28 +954,22 @@ class BroadcastOrchestrator:
             if not channel:
                 return {'status': 'disabled'}
 
-            delivery = await channel.send(recipient, subject, body)
+            delivery = await self._send_unless_suppressed(
+                channel, 'email', recipient.get('email'), recipient, subject, body
+            )
 
-            if delivery.success:
-                await self._update_recipient_status(
-                    broadcast_id,
-                    recipient['user_id'],
-                    'email',
-                    'sent'
-                )
-            else:
-                await self._update_recipient_status(
-                    broadcast_id,
-                    recipient['user_id'],
-                    'email',
-                    delivery.status,
-                    error=delivery.error
-                )
+            attempt = self._attempt(recipient, 'email')
+            retry = self.retry_policy.should_retry(delivery, attempt)
+            await self._record_delivery(
+                recipient['user_id'], 'email', delivery, attempt, final=not retry
+            )
 
             return {
                 'success': delivery.success,
                 'status': delivery.status,
                 'error': delivery.error,
+                'retry': retry,
+                'retry_after': delivery.retry_after,
             }
 
         except Exception as e:
@@ -324,47 +980,76 @@ class BroadcastOrchestrator:
                 'error': str(e),
             }
 
+    async def _send_unless_suppressed(
+        self,
+        channel: NotificationChannel,
+        channel_name: str,
+        address: Any,
+        recipient: Dict[str, Any],
+        subject: str,
+        body: str
+    ) -> DeliveryResult:
+        # Rows suppressed before the run never get here; this catches addresses suppressed
+        # during it, e.g. an email shared by several users that has just hard-bounced
+        if self.suppression.is_suppressed(channel_name, address):
+            return DeliveryResult(
+                success=False,
+                status="blocked",
+                error=f"Suppressed: {channel_name} recipient is unreachable"
+            )
+
+        delivery = await channel.send(recipient, subject, body)
+        # Not every "blocked" result: a missing or malformed address says nothing about the recipient
+        if delivery.unreachable:
+            self.suppression.add(channel_name, address, delivery.error)
+        return delivery
+
+    def _rate_limit_metric(self, broadcast: Broadcast) -> Optional[Callable[[], float]]:
+        rate_limiter = getattr(self.channels.get('telegram'), 'rate_limiter', None)
+        if not broadcast.send_telegram or rate_limiter is None:
+            return None
+        return lambda: rate_limiter.current_rate
+
     def _channel_enabled(self, channel_name: str) -> bool:
         return channel_name in self.channels
 
+    def _active_channels(self, broadcast: Broadcast) -> List[str]:
+        channels = []
+        if broadcast.send_telegram and self._channel_enabled('telegram'):
+            channels.append('telegram')
+        if broadcast.send_email and self._channel_enabled('email'):
+            channels.append('email')
+        return channels
+
+    @staticmethod
+    def _attempt(recipient: Dict[str, Any], channel_name: str) -> int:
+        return (recipient.get('attempts') or {}).get(channel_name, 0) + 1
+
+    def _should_send(self, recipient: Dict[str, Any], channel_name: str) -> bool:
+        if not self._channel_enabled(channel_name):
+            return False
+        pending = recipient.get('pending_channels')
+        return pending is None or channel_name in pending
+
     async def _load_broadcast(self, broadcast_id: int) -> Optional[Broadcast]:
         result = await self.session.execute(
-            select(Broadcast).where(Broadcast.id == broadcast_id)
+            select(Broadcast)
+            .options(selectinload(Broadcast.template))
+            .where(Broadcast.id == broadcast_id)
         )
         return result.scalar()
 
-    async def _update_recipient_status(
+    async def _record_delivery(
         self,
-        broadcast_id: int,
         user_id: int,
         channel: str,
-        status: str,
-        message_id: Optional[str] = None,
-        error: Optional[str] = None
+        delivery: DeliveryResult,
+        attempts: int = 1,
+        final: bool = True
     ):
+        if not self._status_writer:
+            return
         try:
-            result = await self.session.execute(
-                select(BroadcastRecipient).where(
-                    (BroadcastRecipient.broadcast_id == broadcast_id) &
-                    (BroadcastRecipient.user_id == user_id)
-                )
-            )
-            recipient = result.scalar()
-
-            if recipient:
-                if channel == 'telegram':
-                    recipient.telegram_status = status
-                    recipient.telegram_sent_at = datetime.utcnow()
-                    recipient.telegram_error = error
-                    if message_id:
-                        recipient.telegram_message_id = int(message_id)
-                elif channel == 'email':
-                    recipient.email_status = status
-                    recipient.email_sent_at = datetime.utcnow()
-                    recipient.email_error = error
-
-                await self.session.merge(recipient)
-                await self.session.commit()
-
+            await self._status_writer.add(user_id, channel, delivery, attempts, final=final)
         except Exception as e:
             logger.error(f"❌ Failed to update recipient status: {e}")
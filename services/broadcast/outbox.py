@@ -0,0 +1,176 @@
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+import asyncio
+import logging
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import OutboxMessage, DeliveryStatus
+from .channels import DeliveryResult
+from .rate_limiter import MessagePriority
+from .retry_policy import RetryPolicy
+from .telegram_channel import TelegramChannel
+
+logger = logging.getLogger(__name__)
+
+def enqueue_notification(session: AsyncSession, chat_id: int, text: str, kind: str) -> OutboxMessage:
+    # Added to the caller's session, so it commits or rolls back together with the change it reports
+    message = OutboxMessage(chat_id=chat_id, text=text, kind=kind)
+    session.add(message)
+    return message
+
+class OutboxDispatcher:
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        bot,
+        poll_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        lease: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        from settings import settings
+
+        self.session_factory = session_factory
+        # Plain text: notification bodies embed user-supplied names
+        self.channel = TelegramChannel(bot, priority=MessagePriority.transactional, parse_mode=None)
+        self.poll_interval = poll_interval or settings.broadcast.outbox_poll_interval
+        self.batch_size = batch_size or settings.broadcast.outbox_batch_size
+        self.lease = lease or settings.broadcast.outbox_lease
+        self.retry_policy = retry_policy or RetryPolicy.from_settings()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="notification-outbox")
+            logger.info(f"✅ Notification outbox dispatcher started (poll every {self.poll_interval}s)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                while await self.dispatch_batch() >= self.batch_size:
+                    pass
+            except Exception as e:
+                logger.error(f"❌ Notification outbox dispatch failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def dispatch_batch(self) -> int:
+        messages = await self._claim_batch()
+        if not messages:
+            return 0
+
+        # Sent with no transaction open: a slow or rate-limited send holds no row locks
+        deliveries = await asyncio.gather(*(
+            self.channel.send({"telegram_id": message.chat_id}, message.kind, message.text)
+            for message in messages
+        ))
+
+        async with self.session_factory() as session:
+            for message, delivery in zip(messages, deliveries):
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(
+                        OutboxMessage.id == message.id,
+                        OutboxMessage.status == DeliveryStatus.pending,
+                        # Another dispatcher took the row over after our lease expired
+                        OutboxMessage.attempts == message.attempts,
+                    )
+                    .values(**self._record(message, delivery))
+                )
+            await session.commit()
+
+        return len(messages)
+
+    async def _claim_batch(self) -> List[OutboxMessage]:
+        now = datetime.utcnow()
+
+        async with self.session_factory() as session:
+            # Locked only while claiming, so concurrent dispatchers skip the rows
+            result = await session.execute(
+                select(OutboxMessage)
+                .where(
+                    OutboxMessage.status == DeliveryStatus.pending,
+                    OutboxMessage.available_at <= now,
+                )
+                .order_by(OutboxMessage.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            messages = result.scalars().all()
+            if not messages:
+                return []
+
+            # The lease hides the batch until its outcome is written. A crash before that
+            # makes the rows due again once it expires: delivery is at least once
+            lease_until = now + timedelta(seconds=self.lease)
+            for message in messages:
+                message.attempts = (message.attempts or 0) + 1
+                message.available_at = lease_until
+            await session.commit()
+
+        return messages
+
+    def _record(self, message: OutboxMessage, delivery: DeliveryResult) -> Dict[str, Any]:
+        if delivery.success:
+            return {
+                'status': DeliveryStatus.sent,
+                'sent_at': delivery.sent_at or datetime.utcnow(),
+                'last_error': None,
+            }
+
+        if self.retry_policy.should_retry(delivery, message.attempts):
+            delay = self.retry_policy.delay(message.attempts, delivery.retry_after)
+            return {
+                'available_at': datetime.utcnow() + timedelta(seconds=delay),
+                'last_error': delivery.error,
+            }
+
+        logger.warning(
+            f"⚠️  Outbox notification {message.id} ({message.kind}) to {message.chat_id} "
+            f"dropped after {message.attempts} attempts: {delivery.error}"
+        )
+        return {
+            'status': DeliveryStatus.blocked if delivery.status == "blocked" else DeliveryStatus.failed,
+            'last_error': delivery.error,
+        }
+
+    def __repr__(self) -> str:
+        state = "running" if self._task else "stopped"
+        return f"<OutboxDispatcher {state} batch_size={self.batch_size} poll={self.poll_interval}s>"
+
+_outbox_dispatcher: Optional[OutboxDispatcher] = None
+
+def start_outbox_dispatcher(session_factory: Callable[[], AsyncSession], bot) -> OutboxDispatcher:
+    global _outbox_dispatcher
+    if _outbox_dispatcher is None:
+        _outbox_dispatcher = OutboxDispatcher(session_factory, bot)
+    _outbox_dispatcher.start()
+    return _outbox_dispatcher
+
+async def stop_outbox_dispatcher() -> None:
+    global _outbox_dispatcher
+    if _outbox_dispatcher is not None:
+        await _outbox_dispatcher.stop()
+        _outbox_dispatcher = None
+
+def wake_outbox() -> None:
+    # Lets a committed notification go out now instead of at the next poll
+    if _outbox_dispatcher is not None:
+        _outbox_dispatcher.wake()
@@ -0,0 +1,95 @@
+from typing import Callable, Optional
+from datetime import datetime
+import asyncio
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import RateBudget
+from .rate_limiter import get_telegram_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+class SharedTokenBucket:
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        name: str,
+        rate: float,
+        capacity: Optional[float] = None,
+        lease_size: Optional[float] = None,
+    ):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.session_factory = session_factory
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(self.rate, 1.0)
+        self._burst = self.capacity / self.rate
+        # Tokens taken per database round trip: small leases keep the split fair between processes
+        self.lease_size = lease_size or max(1.0, self.rate / 5)
+        self._tokens = 0.0
+        self._lock = asyncio.Lock()
+        self.leases = 0
+
+    async def _lease(self, wanted: float) -> float:
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(RateBudget).where(RateBudget.name == self.name).with_for_update()
+            )
+            budget = result.scalar()
+
+            if budget is None:
+                budget = RateBudget(name=self.name, tokens=self.capacity, updated_at=now)
+                session.add(budget)
+                try:
+                    await session.flush()
+                except IntegrityError:
+                    # Another process created the row first; take tokens on the next round
+                    await session.rollback()
+                    return 0.0
+
+            elapsed = max(0.0, (now - budget.updated_at).total_seconds())
+            available = min(self.capacity, budget.tokens + elapsed * self.rate)
+            taken = min(wanted, available)
+
+            budget.tokens = available - taken
+            budget.updated_at = now
+            await session.commit()
+
+        self.leases += 1
+        return taken
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while self._tokens < tokens:
+                self._tokens += await self._lease(max(self.lease_size, tokens - self._tokens))
+                if self._tokens < tokens:
+                    # Wait for a whole lease to refill rather than polling the row for single tokens
+                    await asyncio.sleep((max(self.lease_size, tokens) - self._tokens) / self.rate)
+            self._tokens -= tokens
+
+    def set_rate(self, rate: float) -> None:
+        # Each process refills the shared row at the rate it last observed
+        self.rate = float(rate)
+        # The next lease clamps the stored tokens to the smaller capacity
+        self.capacity = max(self.rate * self._burst, 1.0)
+
+    def __repr__(self) -> str:
+        return f"<SharedTokenBucket name='{self.name}' rate={self.rate}/s lease={self.lease_size}>"
+
+def use_shared_rate_budget(session_factory: Callable[[], AsyncSession]) -> SharedTokenBucket:
+    limiter = get_telegram_rate_limiter()
+    bucket = SharedTokenBucket(
+        session_factory,
+        name="telegram_global",
+        rate=limiter.global_bucket.rate,
+        capacity=limiter.global_bucket.capacity,
+    )
+    limiter.global_bucket = bucket
+    logger.info(f"✅ Telegram global rate shared across processes ({bucket.rate}/s)")
+    return bucket
@@ -0,0 +1,219 @@
+from typing import List, Optional, Tuple
+from collections import OrderedDict
+from enum import IntEnum
+import asyncio
+import heapq
+import itertools
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(self.rate, 1.0)
+        # Seconds of sending a full bucket covers; kept when the rate changes
+        self._burst = self.capacity / self.rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self._tokens >= self.capacity
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def set_rate(self, rate: float) -> None:
+        # Settle tokens earned at the old rate before switching
+        self._refill()
+        self.rate = float(rate)
+        # A lowered rate must not still allow a burst sized for the old one
+        self.capacity = max(self.rate * self._burst, 1.0)
+        self._tokens = min(self._tokens, self.capacity)
+
+class AIMDRateController:
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float = 1.0,
+        max_rate: Optional[float] = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate) if max_rate is not None else float(rate)
+        self.rate = min(self.max_rate, max(self.min_rate, float(rate)))
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.decreases = 0
+        self._hold_until = 0.0
+
+    def on_success(self) -> float:
+        if time.monotonic() < self._hold_until:
+            return self.rate
+        # +increase msg/s per `rate` successful sends, i.e. about once a second at full speed
+        self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+        return self.rate
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> float:
+        now = time.monotonic()
+        if now < self._hold_until:
+            # 429s from the same burst are one congestion event, not several
+            return self.rate
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self._hold_until = now + max(self.cooldown, retry_after or 0.0)
+        self.decreases += 1
+        logger.warning(f"⚠️  Telegram flood control, send rate lowered to {self.rate:.1f}/s")
+        return self.rate
+
+    def __repr__(self) -> str:
+        return (
+            f"<AIMDRateController rate={self.rate:.1f}/s "
+            f"range={self.min_rate}-{self.max_rate}/s decreases={self.decreases}>"
+        )
+
+class MessagePriority(IntEnum):
+    # Lower value goes first
+    transactional = 0
+    bulk = 10
+
+class RateLimiter:
+
+    MAX_CHAT_BUCKETS: int = 10000
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        per_chat_rate: float = 1.0,
+        global_burst: Optional[float] = None,
+        per_chat_burst: float = 1.0,
+        controller: Optional[AIMDRateController] = None,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.controller = controller
+        if controller is not None:
+            self.global_bucket.set_rate(controller.rate)
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self._chat_buckets: "OrderedDict[int, TokenBucket]" = OrderedDict()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _get_chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is not None:
+            self._chat_buckets.move_to_end(chat_id)
+            return bucket
+
+        if len(self._chat_buckets) >= self.MAX_CHAT_BUCKETS:
+            self._evict_idle_buckets()
+
+        bucket = TokenBucket(self.per_chat_rate, self.per_chat_burst)
+        self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _evict_idle_buckets(self) -> None:
+        # Full buckets carry no state worth keeping: a fresh bucket behaves the same
+        for chat_id in list(self._chat_buckets):
+            if len(self._chat_buckets) < self.MAX_CHAT_BUCKETS:
+                break
+            if self._chat_buckets[chat_id].is_full():
+                del self._chat_buckets[chat_id]
+
+    async def acquire(
+        self,
+        chat_id: Optional[int] = None,
+        priority: MessagePriority = MessagePriority.bulk,
+    ) -> None:
+        if chat_id is not None:
+            await self._get_chat_bucket(chat_id).acquire()
+
+        # Global tokens are handed out by priority, FIFO within a priority
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        if (
+            self._dispatcher is None
+            or self._dispatcher.done()
+            or self._dispatcher.get_loop() is not waiter.get_loop()
+        ):
+            self._dispatcher = asyncio.create_task(self._dispatch(), name="rate-limiter-dispatch")
+        await waiter
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            await self.global_bucket.acquire()
+            while self._waiters:
+                _, _, waiter = heapq.heappop(self._waiters)
+                if not waiter.done():
+                    waiter.set_result(None)
+                    break
+
+    def record_success(self) -> None:
+        if self.controller is not None:
+            self.global_bucket.set_rate(self.controller.on_success())
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        if self.controller is not None:
+            self.global_bucket.set_rate(self.controller.on_throttle(retry_after))
+
+    @property
+    def current_rate(self) -> float:
+        return self.global_bucket.rate
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        from settings import settings
+
+        controller = None
+        if settings.broadcast.telegram_adaptive_rate:
+            controller = AIMDRateController(
+                rate=settings.broadcast.telegram_global_rate,
+                max_rate=max(settings.broadcast.telegram_global_rate, settings.broadcast.telegram_max_rate),
+            )
+
+        return cls(
+            global_rate=settings.broadcast.telegram_global_rate,
+            per_chat_rate=settings.broadcast.telegram_per_chat_rate,
+            controller=controller,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"<RateLimiter global={self.current_rate:.1f}/s adaptive={self.controller is not None} "
+            f"per_chat={self.per_chat_rate}/s chats={len(self._chat_buckets)} queued={self.queued}>"
+        )
+
+_telegram_rate_limiter: Optional[RateLimiter] = None
+
+def get_telegram_rate_limiter() -> RateLimiter:
+    global _telegram_rate_limiter
+    if _telegram_rate_limiter is None:
+        _telegram_rate_limiter = RateLimiter.from_settings()
+    return _telegram_rate_limiter
@@ -1,17 +1,195 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+import json
 import logging
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, insert, update, literal, func, and_, or_, case, cast, exists, String
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import UserModel, RegistrationModel, CompetitionModel, RegistrationStatus
+from models import (
+    UserModel, RegistrationModel, CompetitionModel, RegistrationStatus,
+    BroadcastRecipient, DeliveryStatus, DeliverySuppression, AudienceSegment, AudienceSegmentMember,
+)
 
 logger = logging.getLogger(__name__)
 
+AGGREGATE_SEPARATOR = "\x1f"
+
 class RecipientFilter:
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @staticmethod
+    def _build_conditions(
+        competition_ids: Optional[List[int]] = None,
+        roles: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        countries: Optional[List[str]] = None,
+        cities: Optional[List[str]] = None,
+        has_email: bool = False,
+        user_ids: Optional[List[int]] = None,
+    ) -> list:
+        conditions = []
+
+        if competition_ids:
+            conditions.append(RegistrationModel.competition_id.in_(competition_ids))
+
+        if roles:
+            conditions.append(RegistrationModel.role.in_(roles))
+
+        if statuses:
+
+            status_enums = [
+                RegistrationStatus(s) if isinstance(s, str) else s
+                for s in statuses
+            ]
+            conditions.append(RegistrationModel.status.in_(status_enums))
+
+        if countries:
+            conditions.append(UserModel.country.in_(countries))
+
+        if cities:
+            conditions.append(UserModel.city.in_(cities))
+
+        if has_email:
+            conditions.append(UserModel.email.isnot(None))
+            conditions.append(UserModel.email != '')
+
+        if user_ids:
+            conditions.append(UserModel.id.in_(user_ids))
+
+        return conditions
+
+    @staticmethod
+    def normalize_filters(filters: Optional[Dict[str, Any]]) -> Tuple:
+        # Same audience, same key: order, duplicates and empty filters do not matter
+        normalized = []
+        for name, value in sorted((filters or {}).items()):
+            if not value:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                value = tuple(sorted({str(item) for item in value}))
+            normalized.append((name, value))
+        return tuple(normalized)
+
+    @staticmethod
+    def _join_registrations(query):
+        return query.join(
+            RegistrationModel,
+            UserModel.id == RegistrationModel.user_id,
+            isouter=True
+        ).join(
+            CompetitionModel,
+            RegistrationModel.competition_id == CompetitionModel.id,
+            isouter=True
+        )
+
+    @staticmethod
+    def _recipient_select():
+        return select(
+            UserModel.id,
+            UserModel.telegram_id,
+            UserModel.email,
+            UserModel.first_name,
+            UserModel.last_name,
+            UserModel.phone,
+            UserModel.country,
+            UserModel.city,
+            UserModel.club,
+            UserModel.company,
+            UserModel.position,
+            RegistrationModel.id.label("registration_id"),
+            RegistrationModel.role,
+            RegistrationModel.status,
+            CompetitionModel.name.label("competition_name"),
+        )
+
+    @classmethod
+    def _audience_select(cls, conditions: list, segment_id: Optional[int] = None):
+        if segment_id is not None and conditions:
+            # Ad hoc filters narrow the segment down: fold the users that match them and are members
+            conditions = [*conditions, UserModel.id.in_(
+                select(AudienceSegmentMember.user_id).where(AudienceSegmentMember.segment_id == segment_id)
+            )]
+        elif segment_id is not None:
+            # A segment already is the folded audience, snapshotted
+            audience = select(
+                AudienceSegmentMember.user_id,
+                AudienceSegmentMember.registration_id,
+                AudienceSegmentMember.competition_names,
+                AudienceSegmentMember.roles,
+            ).where(
+                AudienceSegmentMember.segment_id == segment_id
+            ).subquery("audience")
+            return cls._audience_join(audience), audience
+
+        # One row per user: matching registrations are folded into the aggregated columns
+        audience = cls._join_registrations(
+            select(
+                UserModel.id.label("user_id"),
+                func.min(RegistrationModel.id).label("registration_id"),
+                func.aggregate_strings(CompetitionModel.name, AGGREGATE_SEPARATOR).label("competition_names"),
+                func.aggregate_strings(RegistrationModel.role, AGGREGATE_SEPARATOR).label("roles"),
+            ).select_from(UserModel)
+        )
+        if conditions:
+            audience = audience.where(and_(*conditions))
+        audience = audience.group_by(UserModel.id).subquery("audience")
+        return cls._audience_join(audience), audience
+
+    @classmethod
+    def _audience_join(cls, audience):
+        return cls._recipient_select().add_columns(
+            audience.c.competition_names,
+            audience.c.roles,
+        ).select_from(audience).join(
+            UserModel,
+            UserModel.id == audience.c.user_id
+        ).join(
+            RegistrationModel,
+            RegistrationModel.id == audience.c.registration_id,
+            isouter=True
+        ).join(
+            CompetitionModel,
+            RegistrationModel.competition_id == CompetitionModel.id,
+            isouter=True
+        )
+
+    @staticmethod
+    def _split_aggregate(value: Optional[str]) -> List[str]:
+        if not value:
+            return []
+        return list(dict.fromkeys(item for item in value.split(AGGREGATE_SEPARATOR) if item))
+
+    @classmethod
+    def _row_to_recipient(cls, row) -> Dict[str, Any]:
+        competition_names = getattr(row, "competition_names", None)
+        roles = getattr(row, "roles", None)
+        return {
+            'user_id': row.id,
+            'telegram_id': row.telegram_id,
+            'email': row.email,
+            'first_name': row.first_name,
+            'last_name': row.last_name,
+            'phone': row.phone,
+            'country': row.country,
+            'city': row.city,
+            'club': row.club,
+            'company': row.company,
+            'position': row.position,
+            'registration_id': row.registration_id,
+            'role': row.role,
+            'status': row.status,
+            'competition_name': row.competition_name,
+            'competition_names': (
+                cls._split_aggregate(competition_names) if competition_names is not None
+                else [name for name in [row.competition_name] if name]
+            ),
+            'roles': (
+                cls._split_aggregate(roles) if roles is not None
+                else [role for role in [row.role] if role]
+            ),
+        }
+
     async def get_recipients(
         self,
         competition_ids: Optional[List[int]] = None,
@@ -20,65 +198,18 @@ class RecipientFilter:
         countries: Optional[List[str]] = None,
         cities: Optional[List[str]] = None,
         has_email: bool = False,
+        user_ids: Optional[List[int]] = None,
+        segment_id: Optional[int] = None,
         limit: Optional[int] = None,
         offset: int = 0
     ) -> List[Dict[str, Any]]:
         try:
 
-            query = select(
-                UserModel.id,
-                UserModel.telegram_id,
-                UserModel.email,
-                UserModel.first_name,
-                UserModel.last_name,
-                UserModel.phone,
-                UserModel.country,
-                UserModel.city,
-                UserModel.club,
-                UserModel.company,
-                UserModel.position,
-                RegistrationModel.id.label("registration_id"),
-                RegistrationModel.role,
-                RegistrationModel.status,
-                CompetitionModel.name.label("competition_name"),
-            ).join(
-                RegistrationModel,
-                UserModel.id == RegistrationModel.user_id,
-                isouter=True
-            ).join(
-                CompetitionModel,
-                RegistrationModel.competition_id == CompetitionModel.id,
-                isouter=True
-            )
-
-            conditions = []
-
-            if competition_ids:
-                conditions.append(RegistrationModel.competition_id.in_(competition_ids))
-
-            if roles:
-                conditions.append(RegistrationModel.role.in_(roles))
-
-            if statuses:
-
-                status_enums = [
-                    RegistrationStatus(s) if isinstance(s, str) else s
-                    for s in statuses
-                ]
-                conditions.append(RegistrationModel.status.in_(status_enums))
-
-            if countries:
-                conditions.append(UserModel.country.in_(countries))
-
-            if cities:
-                conditions.append(UserModel.city.in_(cities))
-
-            if has_email:
-                conditions.append(UserModel.email.isnot(None))
-                conditions.append(UserModel.email != '')
-
-            if conditions:
-                query = query.where(and_(*conditions))
+            conditions = self._build_conditions(
+                competition_ids, roles, statuses, countries, cities, has_email, user_ids
+            )
+            query, audience = self._audience_select(conditions, segment_id)
+            query = query.order_by(audience.c.user_id)
 
             if limit:
                 query = query.limit(limit)
@@ -88,25 +219,7 @@ class RecipientFilter:
             result = await self.session.execute(query)
             rows = result.fetchall()
 
-            recipients = []
-            for row in rows:
-                recipients.append({
-                    'user_id': row.id,
-                    'telegram_id': row.telegram_id,
-                    'email': row.email,
-                    'first_name': row.first_name,
-                    'last_name': row.last_name,
-                    'phone': row.phone,
-                    'country': row.country,
-                    'city': row.city,
-                    'club': row.club,
-                    'company': row.company,
-                    'position': row.position,
-                    'registration_id': row.registration_id,
-                    'role': row.role,
-                    'status': row.status.value if row.status else None,
-                    'competition_name': row.competition_name,
-                })
+            recipients = [self._row_to_recipient(row) for row in rows]
 
             logger.info(f"✅ Found {len(recipients)} recipients matching filters")
             return recipients
@@ -115,6 +228,46 @@ class RecipientFilter:
             logger.error(f"❌ Error filtering recipients: {e}")
             raise
 
+    async def iter_recipients(
+        self,
+        batch_size: int = 500,
+        competition_ids: Optional[List[int]] = None,
+        roles: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        countries: Optional[List[str]] = None,
+        cities: Optional[List[str]] = None,
+        has_email: bool = False,
+        user_ids: Optional[List[int]] = None,
+        segment_id: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        conditions = self._build_conditions(
+            competition_ids, roles, statuses, countries, cities, has_email, user_ids
+        )
+        query, audience = self._audience_select(conditions, segment_id)
+        query = query.order_by(audience.c.user_id).limit(batch_size)
+
+        last_user_id = None
+        while True:
+            page = query
+            if last_user_id is not None:
+                page = page.where(audience.c.user_id > last_user_id)
+
+            try:
+                result = await self.session.execute(page)
+                rows = result.fetchall()
+            except Exception as e:
+                logger.error(f"❌ Error streaming recipients: {e}")
+                raise
+
+            if not rows:
+                return
+
+            yield [self._row_to_recipient(row) for row in rows]
+
+            if len(rows) < batch_size:
+                return
+            last_user_id = rows[-1].id
+
     async def count_recipients(
         self,
         competition_ids: Optional[List[int]] = None,
@@ -123,59 +276,370 @@ class RecipientFilter:
         countries: Optional[List[str]] = None,
         cities: Optional[List[str]] = None,
         has_email: bool = False,
+        user_ids: Optional[List[int]] = None,
+        segment_id: Optional[int] = None,
     ) -> int:
         try:
 
-            from sqlalchemy import func
+            conditions = self._build_conditions(
+                competition_ids, roles, statuses, countries, cities, has_email, user_ids
+            )
+            _, audience = self._audience_select(conditions, segment_id)
+
+            result = await self.session.execute(
+                select(func.count()).select_from(audience)
+            )
+            count = result.scalar()
 
-            query = select(func.count(UserModel.id)).distinct()
+            return count or 0
 
-            query = query.join(
-                RegistrationModel,
-                UserModel.id == RegistrationModel.user_id,
-                isouter=True
-            ).join(
-                CompetitionModel,
-                RegistrationModel.competition_id == CompetitionModel.id,
-                isouter=True
+        except Exception as e:
+            logger.error(f"❌ Error counting recipients: {e}")
+            return 0
+
+    async def estimate_recipients(
+        self,
+        competition_ids: Optional[List[int]] = None,
+        roles: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        countries: Optional[List[str]] = None,
+        cities: Optional[List[str]] = None,
+        has_email: bool = False,
+        user_ids: Optional[List[int]] = None,
+        segment_id: Optional[int] = None,
+    ) -> Optional[int]:
+        if segment_id is not None:
+            # A segment bounds the scan to its members, so an exact count is already cheap
+            return await self.count_recipients(
+                competition_ids=competition_ids,
+                roles=roles,
+                statuses=statuses,
+                countries=countries,
+                cities=cities,
+                has_email=has_email,
+                user_ids=user_ids,
+                segment_id=segment_id,
             )
 
-            conditions = []
+        # Planner row estimate: instant, but only as good as the last ANALYZE
+        dialect = self.session.get_bind().dialect
+        if dialect.name != 'postgresql':
+            return None
 
-            if competition_ids:
-                conditions.append(RegistrationModel.competition_id.in_(competition_ids))
+        try:
+
+            conditions = self._build_conditions(
+                competition_ids, roles, statuses, countries, cities, has_email, user_ids
+            )
+            # Same grouping as the audience, minus the aggregates that do not change the row count
+            query = self._join_registrations(select(UserModel.id).select_from(UserModel))
+            if conditions:
+                query = query.where(and_(*conditions))
+            compiled = query.group_by(UserModel.id).compile(
+                dialect=dialect,
+                compile_kwargs={"literal_binds": True},
+            )
 
-            if roles:
-                conditions.append(RegistrationModel.role.in_(roles))
+            connection = await self.session.connection()
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
 
-            if statuses:
-                status_enums = [
-                    RegistrationStatus(s) if isinstance(s, str) else s
-                    for s in statuses
-                ]
-                conditions.append(RegistrationModel.status.in_(status_enums))
+            return int(plan[0]["Plan"]["Plan Rows"])
 
-            if countries:
-                conditions.append(UserModel.country.in_(countries))
+        except Exception as e:
+            logger.error(f"❌ Error estimating recipients: {e}")
+            return None
 
-            if cities:
-                conditions.append(UserModel.city.in_(cities))
+    async def sample_recipients(
+        self,
+        limit: int = 5,
+        with_total: bool = True,
+        competition_ids: Optional[List[int]] = None,
+        roles: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        countries: Optional[List[str]] = None,
+        cities: Optional[List[str]] = None,
+        has_email: bool = False,
+        user_ids: Optional[List[int]] = None,
+        segment_id: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        filters = dict(
+            competition_ids=competition_ids,
+            roles=roles,
+            statuses=statuses,
+            countries=countries,
+            cities=cities,
+            has_email=has_email,
+            user_ids=user_ids,
+        )
+        if limit <= 0:
+            total = await self.count_recipients(segment_id=segment_id, **filters) if with_total else None
+            return [], total
 
-            if has_email:
-                conditions.append(UserModel.email.isnot(None))
-                conditions.append(UserModel.email != '')
+        try:
 
-            if conditions:
-                query = query.where(and_(*conditions))
+            conditions = self._build_conditions(**filters)
+            query, audience = self._audience_select(conditions, segment_id)
+            if with_total:
+                # The window runs before LIMIT, so one round trip gives both samples and size
+                query = query.add_columns(func.count().over().label("audience_total"))
+            query = query.order_by(audience.c.user_id).limit(limit)
 
             result = await self.session.execute(query)
-            count = result.scalar()
+            rows = result.fetchall()
 
-            return count or 0
+            samples = [self._row_to_recipient(row) for row in rows]
+            if len(rows) < limit:
+                total = len(rows)
+            elif with_total:
+                total = rows[0].audience_total
+            else:
+                total = None
+
+            return samples, total
 
         except Exception as e:
-            logger.error(f"❌ Error counting recipients: {e}")
-            return 0
+            logger.error(f"❌ Error sampling recipients: {e}")
+            raise
+
+    async def materialize_recipients(
+        self,
+        broadcast_id: int,
+        competition_ids: Optional[List[int]] = None,
+        roles: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        countries: Optional[List[str]] = None,
+        cities: Optional[List[str]] = None,
+        has_email: bool = False,
+        user_ids: Optional[List[int]] = None,
+        segment_id: Optional[int] = None,
+    ) -> int:
+        try:
+
+            conditions = self._build_conditions(
+                competition_ids, roles, statuses, countries, cities, has_email, user_ids
+            )
+            _, audience = self._audience_select(conditions, segment_id)
+
+            query = select(
+                literal(broadcast_id).label("broadcast_id"),
+                UserModel.id,
+                audience.c.registration_id,
+                UserModel.telegram_id,
+                UserModel.email,
+            ).select_from(audience).join(
+                UserModel,
+                UserModel.id == audience.c.user_id
+            )
+
+            result = await self.session.execute(
+                insert(BroadcastRecipient).from_select(
+                    ["broadcast_id", "user_id", "registration_id", "telegram_id", "email_address"],
+                    query,
+                )
+            )
+
+            created = result.rowcount or 0
+            logger.info(f"✅ Materialized {created} recipients for broadcast {broadcast_id}")
+            return created
+
+        except Exception as e:
+            logger.error(f"❌ Error materializing recipients: {e}")
+            raise
+
+    async def exclude_suppressed(
+        self,
+        broadcast_id: int,
+        channels: List[str],
+        id_range: Optional[Tuple[int, int]] = None,
+    ) -> int:
+        # Known-dead addresses are settled in one statement per channel, so they are never streamed or queued
+        addresses = {
+            'telegram': cast(BroadcastRecipient.telegram_id, String),
+            'email': func.lower(func.trim(BroadcastRecipient.email_address)),
+        }
+        excluded = 0
+        for channel, column in self._status_columns(channels).items():
+            result = await self.session.execute(
+                update(BroadcastRecipient)
+                .where(
+                    BroadcastRecipient.broadcast_id == broadcast_id,
+                    column == DeliveryStatus.pending,
+                    *self._id_range_condition(id_range),
+                    exists().where(
+                        DeliverySuppression.channel == channel,
+                        DeliverySuppression.address == addresses[channel],
+                    ),
+                )
+                .values({
+                    column: DeliveryStatus.blocked,
+                    self._error_columns([channel])[channel]: f"Suppressed: {channel} recipient is unreachable",
+                })
+                .execution_options(synchronize_session=False)
+            )
+            excluded += result.rowcount or 0
+
+        if excluded:
+            logger.info(f"✅ Skipped {excluded} suppressed deliveries for broadcast {broadcast_id}")
+        return excluded
+
+    async def count_materialized(self, broadcast_id: int) -> int:
+        result = await self.session.execute(
+            select(func.count(BroadcastRecipient.id)).where(
+                BroadcastRecipient.broadcast_id == broadcast_id
+            )
+        )
+        return result.scalar() or 0
+
+    @staticmethod
+    def _attempt_columns(channels: List[str]) -> Dict[str, Any]:
+        columns = {
+            'telegram': BroadcastRecipient.telegram_attempts,
+            'email': BroadcastRecipient.email_attempts,
+        }
+        return {channel: columns[channel] for channel in channels}
+
+    @staticmethod
+    def _error_columns(channels: List[str]) -> Dict[str, Any]:
+        columns = {
+            'telegram': BroadcastRecipient.telegram_error,
+            'email': BroadcastRecipient.email_error,
+        }
+        return {channel: columns[channel] for channel in channels}
+
+    @staticmethod
+    def _status_columns(channels: List[str]) -> Dict[str, Any]:
+        columns = {
+            'telegram': BroadcastRecipient.telegram_status,
+            'email': BroadcastRecipient.email_status,
+        }
+        return {channel: columns[channel] for channel in channels}
+
+    @staticmethod
+    def _id_range_condition(id_range: Optional[Tuple[int, int]]) -> list:
+        if id_range is None:
+            return []
+        return [BroadcastRecipient.id.between(*id_range)]
+
+    async def get_recipient_id_bounds(self, broadcast_id: int) -> Optional[Tuple[int, int]]:
+        result = await self.session.execute(
+            select(func.min(BroadcastRecipient.id), func.max(BroadcastRecipient.id)).where(
+                BroadcastRecipient.broadcast_id == broadcast_id
+            )
+        )
+        low, high = result.one()
+        if low is None:
+            return None
+        return low, high
+
+    async def count_delivery_outcomes(
+        self,
+        broadcast_id: int,
+        channels: List[str],
+        id_range: Optional[Tuple[int, int]] = None,
+    ) -> Dict[str, int]:
+        columns = self._status_columns(channels)
+        if not columns:
+            return {'sent': 0, 'failed': 0}
+
+        done = and_(*[column != DeliveryStatus.pending for column in columns.values()])
+        delivered = or_(*[
+            column.in_([DeliveryStatus.sent, DeliveryStatus.delivered])
+            for column in columns.values()
+        ])
+
+        result = await self.session.execute(
+            select(
+                func.sum(case((and_(done, delivered), 1), else_=0)).label("sent"),
+                func.sum(case((and_(done, ~delivered), 1), else_=0)).label("failed"),
+            ).where(
+                BroadcastRecipient.broadcast_id == broadcast_id,
+                *self._id_range_condition(id_range),
+            )
+        )
+        row = result.one()
+        return {'sent': row.sent or 0, 'failed': row.failed or 0}
+
+    async def iter_pending_recipients(
+        self,
+        broadcast_id: int,
+        channels: List[str],
+        batch_size: int = 500,
+        id_range: Optional[Tuple[int, int]] = None,
+        lane: Optional[str] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        columns = self._status_columns(channels)
+        if not columns:
+            return
+
+        # A lane streams rows pending on its own channel; pending_channels still covers all of them
+        waiting_on = [columns[lane]] if lane in columns else list(columns.values())
+
+        query = self._recipient_select().add_columns(
+            BroadcastRecipient.id.label("broadcast_recipient_id"),
+            *[column.label(f"{channel}_status") for channel, column in columns.items()],
+            *[
+                column.label(f"{channel}_attempts")
+                for channel, column in self._attempt_columns(channels).items()
+            ],
+        ).select_from(BroadcastRecipient).join(
+            UserModel,
+            UserModel.id == BroadcastRecipient.user_id
+        ).join(
+            RegistrationModel,
+            RegistrationModel.id == BroadcastRecipient.registration_id,
+            isouter=True
+        ).join(
+            CompetitionModel,
+            RegistrationModel.competition_id == CompetitionModel.id,
+            isouter=True
+        ).where(
+            BroadcastRecipient.broadcast_id == broadcast_id,
+            or_(*[column == DeliveryStatus.pending for column in waiting_on]),
+            *self._id_range_condition(id_range),
+        ).order_by(BroadcastRecipient.id).limit(batch_size)
+
+        last_id = None
+        while True:
+            page = query
+            if last_id is not None:
+                page = page.where(BroadcastRecipient.id > last_id)
+
+            try:
+                result = await self.session.execute(page)
+                rows = result.fetchall()
+            except Exception as e:
+                logger.error(f"❌ Error streaming pending recipients: {e}")
+                raise
+
+            if not rows:
+                return
+
+            batch = []
+            for row in rows:
+                recipient = self._row_to_recipient(row)
+                recipient['pending_channels'] = {
+                    channel
+                    for channel in columns
+                    if getattr(row, f"{channel}_status") == DeliveryStatus.pending
+                }
+                recipient['attempts'] = {
+                    channel: getattr(row, f"{channel}_attempts") or 0
+                    for channel in columns
+                }
+                # Counted as sent like count_delivery_outcomes() does, even if the channels left now fail
+                recipient['delivered'] = any(
+                    getattr(row, f"{channel}_status") in (DeliveryStatus.sent, DeliveryStatus.delivered)
+                    for channel in columns
+                )
+                batch.append(recipient)
+            yield batch
+
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1].broadcast_recipient_id
 
     async def get_available_filters(self) -> Dict[str, Any]:
         try:
@@ -211,6 +675,7 @@ class RecipientFilter:
                 'statuses': [s.value for s in RegistrationStatus],
                 'countries': countries,
                 'cities': cities,
+                'segments': await self.get_segments(),
             }
 
         except Exception as e:
@@ -221,7 +686,27 @@ class RecipientFilter:
                 'statuses': [],
                 'countries': [],
                 'cities': [],
+                'segments': [],
+            }
+
+    async def get_segments(self) -> List[Dict[str, Any]]:
+        result = await self.session.execute(
+            select(
+                AudienceSegment.id,
+                AudienceSegment.name,
+                AudienceSegment.member_count,
+                AudienceSegment.refreshed_at,
+            ).order_by(AudienceSegment.name)
+        )
+        return [
+            {
+                'id': row.id,
+                'name': row.name,
+                'member_count': row.member_count,
+                'refreshed_at': row.refreshed_at,
             }
+            for row in result.fetchall()
+        ]
 
     async def get_sample_recipients(self, limit: int = 5) -> List[Dict[str, Any]]:
         return await self.get_recipients(limit=limit)
@@ -0,0 +1,133 @@
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import logging
+import multiprocessing
+
+from .template_renderer import TemplateRenderer
+from .async_smtp import PreparedMessage
+from .email_channel import build_message
+
+logger = logging.getLogger(__name__)
+
+RENDER_MEMO_SIZE: int = 4096
+
+# Per worker process: compiled templates live in the renderer's cache, rendered groups in the memo
+_worker_renderer: Optional[TemplateRenderer] = None
+_worker_rendered: "OrderedDict[Tuple, Dict[str, str]]" = OrderedDict()
+
+def _get_worker_renderer() -> TemplateRenderer:
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = TemplateRenderer()
+    return _worker_renderer
+
+def _render_context(templates: Tuple[str, str, str], context: Dict[str, Any]) -> Dict[str, str]:
+    renderer = _get_worker_renderer()
+    key = (
+        tuple(renderer.template_key(text) for text in templates),
+        TemplateRenderer.context_key(context.keys(), context),
+    )
+
+    rendered = _worker_rendered.get(key)
+    if rendered is not None:
+        _worker_rendered.move_to_end(key)
+        return rendered
+
+    subject, body_telegram, body_email = templates
+    try:
+        rendered = {
+            'subject': renderer.render(subject, context),
+            'body_telegram': renderer.render(body_telegram, context),
+            'body_email': renderer.render(body_email, context),
+        }
+    except Exception as e:
+        rendered = {'error': str(e)}
+
+    _worker_rendered[key] = rendered
+    while len(_worker_rendered) > RENDER_MEMO_SIZE:
+        _worker_rendered.popitem(last=False)
+    return rendered
+
+def render_payloads(
+    templates: Tuple[str, str, str],
+    contexts: List[Dict[str, Any]],
+    emails: List[Tuple[int, Optional[str]]],
+    from_header: Optional[str] = None,
+) -> Tuple[List[Dict[str, str]], List[Optional[PreparedMessage]]]:
+    rendered = [_render_context(templates, context) for context in contexts]
+
+    messages: List[Optional[PreparedMessage]] = []
+    for group, address in emails:
+        item = rendered[group]
+        if from_header is None or not address or 'error' in item:
+            messages.append(None)
+            continue
+        msg = build_message(from_header, address, item['subject'], item['body_email'])
+        messages.append(PreparedMessage.from_message(msg))
+
+    return rendered, messages
+
+class RenderPool:
+
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.batches = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and DB pools is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def render(
+        self,
+        templates: Tuple[str, str, str],
+        contexts: List[Dict[str, Any]],
+        emails: List[Tuple[int, Optional[str]]],
+        from_header: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, str]], List[Optional[PreparedMessage]]]:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._get_executor(),
+            render_payloads,
+            templates,
+            contexts,
+            emails,
+            from_header,
+        )
+        self.batches += 1
+        return result
+
+    async def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, executor.shutdown)
+
+    def __repr__(self) -> str:
+        state = "running" if self._executor else "idle"
+        return f"<RenderPool workers={self.workers} {state} batches={self.batches}>"
+
+_render_pool: Optional[RenderPool] = None
+
+def get_render_pool() -> Optional[RenderPool]:
+    global _render_pool
+    if _render_pool is None:
+        from settings import settings
+
+        if not settings.broadcast.render_workers:
+            return None
+        _render_pool = RenderPool(settings.broadcast.render_workers)
+    return _render_pool
+
+async def close_render_pool() -> None:
+    global _render_pool
+    if _render_pool is not None:
+        await _render_pool.close()
+        _render_pool = None
@@ -0,0 +1,43 @@
+from typing import Optional
+import random
+
+from .channels import DeliveryResult
+
+class RetryPolicy:
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 300.0,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        from settings import settings
+
+        return cls(
+            max_attempts=settings.broadcast.retry_max_attempts,
+            base_delay=settings.broadcast.retry_base_delay,
+            max_delay=settings.broadcast.retry_max_delay,
+        )
+
+    def should_retry(self, delivery: DeliveryResult, attempt: int) -> bool:
+        return delivery.retryable and attempt < self.max_attempts
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after:
+            # Telegram tells us exactly when the flood wait ends; spread the wake-ups a little
+            return retry_after + random.uniform(0, self.base_delay)
+
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(backoff / 2, backoff)
+
+    def __repr__(self) -> str:
+        return (
+            f"<RetryPolicy max_attempts={self.max_attempts} "
+            f"base_delay={self.base_delay}s max_delay={self.max_delay}s>"
+        )
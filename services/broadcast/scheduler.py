@@ -0,0 +1,203 @@
+from typing import Callable, Optional
+from datetime import datetime, timedelta
+import asyncio
+import logging
+
+from sqlalchemy import select, update, or_, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Broadcast, BroadcastShard, BroadcastStatus
+from .orchestrator import BroadcastOrchestrator
+
+logger = logging.getLogger(__name__)
+
+class BroadcastScheduler:
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        bot=None,
+        poll_interval: Optional[float] = None,
+        lease_timeout: Optional[float] = None,
+    ):
+        from settings import settings
+
+        self.session_factory = session_factory
+        self.bot = bot
+        self.poll_interval = poll_interval or settings.broadcast.scheduler_poll_interval
+        self.lease_timeout = lease_timeout or settings.broadcast.lease_timeout
+        self.max_runs = settings.broadcast.max_runs
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="broadcast-scheduler")
+            logger.info(f"✅ Broadcast scheduler started (poll every {self.poll_interval}s)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                while await self.run_next():
+                    pass
+            except Exception as e:
+                logger.error(f"❌ Broadcast scheduler poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def run_next(self) -> bool:
+        broadcast_id = await self.claim_next()
+        if broadcast_id is not None:
+            async with self.session_factory() as session:
+                orchestrator = BroadcastOrchestrator(session, bot=self.bot)
+                result = await orchestrator.execute_broadcast(broadcast_id)
+
+            if 'error' in result:
+                logger.error(f"❌ Scheduled broadcast {broadcast_id} failed: {result['error']}")
+            return True
+
+        shard_id = await self.claim_shard()
+        if shard_id is not None:
+            async with self.session_factory() as session:
+                orchestrator = BroadcastOrchestrator(session, bot=self.bot)
+                result = await orchestrator.execute_shard(shard_id)
+
+            if 'error' in result:
+                logger.error(f"❌ Broadcast shard {shard_id} failed: {result['error']}")
+            return True
+
+        return False
+
+    async def claim_next(self) -> Optional[int]:
+        now = datetime.utcnow()
+
+        async with self.session_factory() as session:
+            # Due broadcasts first, then ones whose owner stopped renewing its lease
+            candidates = [
+                select(Broadcast).where(
+                    Broadcast.status == BroadcastStatus.scheduled,
+                    Broadcast.scheduled_at <= now,
+                ).order_by(Broadcast.scheduled_at),
+                select(Broadcast).where(
+                    Broadcast.status == BroadcastStatus.in_progress,
+                    or_(
+                        Broadcast.heartbeat_at.is_(None),
+                        Broadcast.heartbeat_at < now - timedelta(seconds=self.lease_timeout),
+                    ),
+                    # Sharded broadcasts are leased shard by shard, see claim_shard()
+                    ~exists().where(BroadcastShard.broadcast_id == Broadcast.id),
+                ).order_by(Broadcast.started_at),
+            ]
+
+            for query in candidates:
+                while True:
+                    result = await session.execute(
+                        query.limit(1).with_for_update(skip_locked=True)
+                    )
+                    broadcast = result.scalar()
+                    if broadcast is None:
+                        break
+
+                    reclaim = broadcast.status == BroadcastStatus.in_progress
+                    if reclaim and (broadcast.attempts or 0) >= self.max_runs:
+                        # Every run so far died or was abandoned: stop reclaiming it
+                        logger.error(
+                            f"❌ Broadcast {broadcast.id} failed after {broadcast.attempts} runs: "
+                            f"{broadcast.last_error or 'lease expired'}"
+                        )
+                        broadcast.status = BroadcastStatus.failed
+                        broadcast.completed_at = now
+                        broadcast.last_error = broadcast.last_error or "Lease expired"
+                        await session.commit()
+                        continue
+
+                    if reclaim:
+                        logger.info(f"🔄 Reclaiming interrupted broadcast {broadcast.id}")
+                    else:
+                        logger.info(f"📢 Claimed scheduled broadcast {broadcast.id} (due {broadcast.scheduled_at})")
+
+                    broadcast.status = BroadcastStatus.in_progress
+                    broadcast.heartbeat_at = now
+                    # A rescheduled broadcast starts counting its runs again
+                    broadcast.attempts = (broadcast.attempts or 0) + 1 if reclaim else 1
+                    if not reclaim:
+                        broadcast.last_error = None
+                    await session.commit()
+                    return broadcast.id
+
+        return None
+
+    async def claim_shard(self) -> Optional[int]:
+        now = datetime.utcnow()
+
+        async with self.session_factory() as session:
+            while True:
+                result = await session.execute(
+                    select(BroadcastShard).where(
+                        or_(
+                            BroadcastShard.status == BroadcastStatus.scheduled,
+                            (BroadcastShard.status == BroadcastStatus.in_progress) & or_(
+                                BroadcastShard.heartbeat_at.is_(None),
+                                BroadcastShard.heartbeat_at < now - timedelta(seconds=self.lease_timeout),
+                            ),
+                        ),
+                        # Shards of a broadcast that already failed are not started again
+                        exists().where(
+                            Broadcast.id == BroadcastShard.broadcast_id,
+                            Broadcast.status == BroadcastStatus.in_progress,
+                        ),
+                    ).order_by(
+                        BroadcastShard.broadcast_id,
+                        BroadcastShard.shard_no,
+                    ).limit(1).with_for_update(skip_locked=True)
+                )
+                shard = result.scalar()
+                if shard is None:
+                    return None
+
+                reclaim = shard.status == BroadcastStatus.in_progress
+                if reclaim and (shard.attempts or 0) >= self.max_runs:
+                    # One shard that never finishes would keep its broadcast in progress forever
+                    error = shard.last_error or "Lease expired"
+                    logger.error(
+                        f"❌ Shard {shard.shard_no} of broadcast {shard.broadcast_id} failed "
+                        f"after {shard.attempts} runs: {error}"
+                    )
+                    shard.status = BroadcastStatus.failed
+                    shard.completed_at = now
+                    shard.last_error = error
+                    await session.execute(
+                        update(Broadcast)
+                        .where(
+                            Broadcast.id == shard.broadcast_id,
+                            Broadcast.status == BroadcastStatus.in_progress,
+                        )
+                        .values(
+                            status=BroadcastStatus.failed,
+                            completed_at=now,
+                            last_error=f"Shard {shard.shard_no}: {error}",
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    await session.commit()
+                    continue
+
+                if reclaim:
+                    logger.info(f"🔄 Reclaiming interrupted shard {shard.shard_no} of broadcast {shard.broadcast_id}")
+                else:
+                    logger.info(f"📢 Claimed shard {shard.shard_no} of broadcast {shard.broadcast_id}")
+
+                shard.status = BroadcastStatus.in_progress
+                shard.heartbeat_at = now
+                shard.attempts = (shard.attempts or 0) + 1
+                await session.commit()
+                return shard.id
+
+    def __repr__(self) -> str:
+        state = "running" if self._task else "stopped"
+        return f"<BroadcastScheduler {state} poll_interval={self.poll_interval}s>"
@@ -0,0 +1,124 @@
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import logging
+
+from sqlalchemy import select, insert, delete, update, literal, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import AudienceSegment, AudienceSegmentMember, UserModel
+from .recipient_filter import RecipientFilter
+
+logger = logging.getLogger(__name__)
+
+MEMBER_COLUMNS = ["segment_id", "user_id", "registration_id", "competition_names", "roles"]
+
+class SegmentManager:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def _segment_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # Segments are always built from the base tables, never from another segment
+        return {name: value for name, value in (filters or {}).items() if name != 'segment_id'}
+
+    @classmethod
+    def _members_select(cls, segment: AudienceSegment, user_id: Optional[int] = None):
+        conditions = RecipientFilter._build_conditions(**cls._segment_filters(segment.filters))
+        if user_id is not None:
+            conditions.append(UserModel.id == user_id)
+
+        _, audience = RecipientFilter._audience_select(conditions)
+        return select(
+            literal(segment.id).label("segment_id"),
+            audience.c.user_id,
+            audience.c.registration_id,
+            audience.c.competition_names,
+            audience.c.roles,
+        )
+
+    async def _update_member_count(self, segment: AudienceSegment) -> int:
+        result = await self.session.execute(
+            select(func.count()).select_from(AudienceSegmentMember).where(
+                AudienceSegmentMember.segment_id == segment.id
+            )
+        )
+        segment.member_count = result.scalar() or 0
+        segment.refreshed_at = datetime.utcnow()
+        segment.stale = False
+        return segment.member_count
+
+    async def create_segment(
+        self,
+        name: str,
+        filters: Dict[str, Any],
+        created_by: Optional[int] = None,
+        description: Optional[str] = None,
+    ) -> AudienceSegment:
+        segment = AudienceSegment(
+            name=name,
+            description=description,
+            filters=self._segment_filters(filters),
+            created_by=created_by,
+        )
+        self.session.add(segment)
+        await self.session.flush()
+
+        await self.refresh_segment(segment.id)
+        return segment
+
+    async def refresh_segment(self, segment_id: int) -> int:
+        try:
+
+            segment = await self.session.get(AudienceSegment, segment_id)
+            if not segment:
+                raise ValueError(f"Segment {segment_id} not found")
+
+            await self.session.execute(
+                delete(AudienceSegmentMember).where(AudienceSegmentMember.segment_id == segment.id)
+            )
+            await self.session.execute(
+                insert(AudienceSegmentMember).from_select(MEMBER_COLUMNS, self._members_select(segment))
+            )
+            count = await self._update_member_count(segment)
+            await self.session.commit()
+
+            logger.info(f"✅ Segment '{segment.name}' refreshed: {count} members")
+            return count
+
+        except Exception as e:
+            logger.error(f"❌ Error refreshing segment {segment_id}: {e}")
+            await self.session.rollback()
+            raise
+
+    async def mark_stale(self) -> int:
+        # One UPDATE instead of re-evaluating the user against every segment; refresh_if_stale rebuilds them later
+        result = await self.session.execute(
+            update(AudienceSegment).where(AudienceSegment.stale == False).values(stale=True)
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def refresh_if_stale(self, segment_id: int) -> bool:
+        result = await self.session.execute(
+            select(AudienceSegment.stale).where(AudienceSegment.id == segment_id)
+        )
+        if not result.scalar():
+            return False
+
+        await self.refresh_segment(segment_id)
+        return True
+
+    async def delete_segment(self, segment_id: int) -> bool:
+        await self.session.execute(
+            delete(AudienceSegmentMember).where(AudienceSegmentMember.segment_id == segment_id)
+        )
+        result = await self.session.execute(
+            delete(AudienceSegment).where(AudienceSegment.id == segment_id)
+        )
+        await self.session.commit()
+        return bool(result.rowcount)
+
+    async def get_segments(self) -> List[AudienceSegment]:
+        result = await self.session.execute(select(AudienceSegment).order_by(AudienceSegment.name))
+        return result.scalars().all()
@@ -0,0 +1,208 @@
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import asyncio
+import itertools
+import logging
+import math
+import random
+import ssl
+import time
+
+from .async_smtp import upgrade_to_tls
+from .channels import NotificationChannel, DeliveryResult
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+class SimulatedChannel(NotificationChannel):
+
+    LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+    def __init__(
+        self,
+        name: str = "Simulated",
+        latency: float = 0.05,
+        rate_limiter: Optional[RateLimiter] = None,
+        distribution: str = "fixed",
+        error_rate: float = 0.0,
+        flood_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        if distribution not in self.LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+
+        self.name = name
+        self.latency = latency
+        self.rate_limiter = rate_limiter
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.flood_rate = flood_rate
+        self.retry_after = retry_after
+        self.sent = 0
+        self.errors = 0
+        self.floods = 0
+        self.latencies: List[float] = []
+        self._random = random.Random(seed)
+        self._message_ids = itertools.count(1)
+
+    def get_channel_name(self) -> str:
+        return self.name
+
+    async def validate_configuration(self) -> bool:
+        return True
+
+    async def validate_recipient(self, recipient: Dict[str, Any]) -> bool:
+        return recipient.get("telegram_id") is not None or bool(recipient.get("email"))
+
+    def _sample_latency(self) -> float:
+        if self.latency <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            return self._random.uniform(0, 2 * self.latency)
+        if self.distribution == "exponential":
+            return self._random.expovariate(1 / self.latency)
+        if self.distribution == "lognormal":
+            # sigma=1 gives a long right tail; mu is chosen so the mean stays at `latency`
+            return self._random.lognormvariate(math.log(self.latency) - 0.5, 1.0)
+        return self.latency
+
+    async def send(
+        self,
+        recipient: Dict[str, Any],
+        subject: str,
+        body: str
+    ) -> DeliveryResult:
+        started = time.perf_counter()
+        try:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(recipient.get("telegram_id"))
+
+            await asyncio.sleep(self._sample_latency())
+
+            roll = self._random.random()
+            if roll < self.flood_rate:
+                self.floods += 1
+                if self.rate_limiter:
+                    self.rate_limiter.record_throttle(self.retry_after)
+                return DeliveryResult(
+                    success=False,
+                    status="failed",
+                    error=f"Simulated flood control, retry in {self.retry_after}s",
+                    retryable=True,
+                    retry_after=self.retry_after
+                )
+            if roll < self.flood_rate + self.error_rate:
+                self.errors += 1
+                return DeliveryResult(
+                    success=False,
+                    status="failed",
+                    error="Simulated server error",
+                    retryable=True
+                )
+
+            self.sent += 1
+            if self.rate_limiter:
+                self.rate_limiter.record_success()
+            return DeliveryResult(
+                success=True,
+                status="sent",
+                message_id=str(next(self._message_ids)),
+                sent_at=datetime.utcnow()
+            )
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+    def __repr__(self) -> str:
+        return (
+            f"<SimulatedChannel name={self.name} latency={self.latency}s "
+            f"distribution={self.distribution} error_rate={self.error_rate} flood_rate={self.flood_rate}>"
+        )
+
+class SMTPSink:
+
+    def __init__(
+        self,
+        connect_delay: float = 0.0,
+        pipelining: bool = True,
+        tls_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.connect_delay = connect_delay
+        self.pipelining = pipelining
+        # Server-side context: when set the sink advertises STARTTLS
+        self.tls_context = tls_context
+        self.host = "127.0.0.1"
+        self.port = 0
+        self.connections = 0
+        self.messages = 0
+        self.tls_upgrades = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> "SMTPSink":
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            # Stands in for the TLS handshake and AUTH round trips of a real server
+            await asyncio.sleep(self.connect_delay)
+            writer.write(b"220 sink ESMTP\r\n")
+            await writer.drain()
+            secure = False
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                command = line[:4].upper()
+
+                if command == b"EHLO":
+                    extensions = [b"250-sink", b"250-AUTH PLAIN LOGIN", b"250-8BITMIME"]
+                    if self.pipelining:
+                        extensions.append(b"250-PIPELINING")
+                    if self.tls_context is not None and not secure:
+                        extensions.append(b"250-STARTTLS")
+                    extensions.append(b"250 SIZE 10485760")
+                    writer.write(b"\r\n".join(extensions) + b"\r\n")
+                elif command == b"HELO":
+                    writer.write(b"250 sink\r\n")
+                elif command == b"STAR" and self.tls_context is not None and not secure:
+                    writer.write(b"220 2.0.0 Ready to start TLS\r\n")
+                    await writer.drain()
+                    writer = await upgrade_to_tls(reader, writer, self.tls_context, server_side=True)
+                    secure = True
+                    self.tls_upgrades += 1
+                    continue
+                elif command == b"AUTH":
+                    writer.write(b"235 2.7.0 Authentication successful\r\n")
+                elif command == b"DATA":
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    self.messages += 1
+                    writer.write(b"250 2.0.0 Ok: queued\r\n")
+                elif command == b"QUIT":
+                    writer.write(b"221 2.0.0 Bye\r\n")
+                    await writer.drain()
+                    return
+                elif command in (b"MAIL", b"RCPT", b"RSET", b"NOOP"):
+                    writer.write(b"250 2.0.0 Ok\r\n")
+                else:
+                    writer.write(b"502 5.5.2 Command not recognized\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ssl.SSLError):
+            pass
+        finally:
+            writer.close()
+
+    def __repr__(self) -> str:
+        return f"<SMTPSink {self.host}:{self.port} messages={self.messages}>"
@@ -0,0 +1,207 @@
+from typing import List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+
+from .async_smtp import AsyncSMTPPool, PreparedMessage, get_async_smtp_pool, close_async_smtp_pool
+
+logger = logging.getLogger(__name__)
+
+class SMTPConnectionPool:
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        size: int = 4,
+        idle_check: float = 30.0,
+        max_messages_per_connection: int = 1000,
+        timeout: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = max(1, size)
+        self.idle_check = idle_check
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self._connections: List[smtplib.SMTP] = []
+        self._connections_lock = threading.Lock()
+        self.connects = 0
+        self.sent = 0
+
+    @classmethod
+    def from_config(cls, config) -> "SMTPConnectionPool":
+        return cls(
+            host=config.SMTP_HOST,
+            port=config.SMTP_PORT,
+            username=config.SMTP_USERNAME,
+            password=config.SMTP_PASSWORD,
+            use_tls=config.SMTP_USE_TLS,
+            size=config.SMTP_POOL_SIZE,
+            idle_check=config.SMTP_IDLE_CHECK,
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.size,
+                thread_name_prefix="smtp-pool",
+            )
+        return self._executor
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._quietly_close(server)
+            raise
+
+        with self._connections_lock:
+            self._connections.append(server)
+            self.connects += 1
+
+        self._local.server = server
+        self._local.messages = 0
+        self._local.last_used = time.monotonic()
+        return server
+
+    def _discard(self) -> None:
+        server = getattr(self._local, "server", None)
+        self._local.server = None
+        if server is not None:
+            with self._connections_lock:
+                if server in self._connections:
+                    self._connections.remove(server)
+            self._quietly_close(server)
+
+    @staticmethod
+    def _quietly_close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _is_connection_error(error: BaseException) -> bool:
+        # SMTPException subclasses OSError, but only disconnects mean the session is unusable
+        if isinstance(error, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(error, smtplib.SMTPException):
+            return False
+        return isinstance(error, OSError)
+
+    def _checkout(self) -> smtplib.SMTP:
+        server = getattr(self._local, "server", None)
+        if server is None:
+            return self._connect()
+
+        if self._local.messages >= self.max_messages_per_connection:
+            self._discard()
+            return self._connect()
+
+        if time.monotonic() - self._local.last_used > self.idle_check:
+            try:
+                code, _ = server.noop()
+                healthy = code == 250
+            except OSError:
+                healthy = False
+
+            if not healthy:
+                logger.info("🔄 Pooled SMTP connection went stale, reconnecting")
+                self._discard()
+                return self._connect()
+
+        return server
+
+    @staticmethod
+    def _deliver(server: smtplib.SMTP, msg: Union[Message, PreparedMessage]) -> None:
+        if isinstance(msg, PreparedMessage):
+            server.sendmail(msg.sender, msg.recipients, msg.data)
+        else:
+            server.send_message(msg)
+
+    def _send_sync(self, msg: Union[Message, PreparedMessage]) -> None:
+        server = self._checkout()
+        try:
+            self._deliver(server, msg)
+        except OSError as e:
+            if not self._is_connection_error(e):
+                raise
+            logger.warning(f"⚠️  SMTP connection lost ({e}), retrying on a fresh connection")
+            self._discard()
+            server = self._connect()
+            self._deliver(server, msg)
+
+        self._local.messages += 1
+        self._local.last_used = time.monotonic()
+        with self._connections_lock:
+            self.sent += 1
+
+    async def send(self, msg: Union[Message, PreparedMessage]) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._get_executor(), self._send_sync, msg)
+
+    def _close_sync(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for server in connections:
+            self._quietly_close(server)
+        self._local = threading.local()
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._close_sync)
+
+    def __repr__(self) -> str:
+        return (
+            f"<SMTPConnectionPool {self.host}:{self.port} size={self.size} "
+            f"open={len(self._connections)} sent={self.sent}>"
+        )
+
+_smtp_pool: Optional[SMTPConnectionPool] = None
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    global _smtp_pool
+    if _smtp_pool is None:
+        from config.email_settings import SMTPConfig
+
+        _smtp_pool = SMTPConnectionPool.from_config(SMTPConfig())
+    return _smtp_pool
+
+def get_smtp_transport() -> Union[SMTPConnectionPool, AsyncSMTPPool]:
+    from config.email_settings import SMTPConfig
+
+    if SMTPConfig.SMTP_TRANSPORT == "thread":
+        return get_smtp_pool()
+    return get_async_smtp_pool()
+
+async def close_smtp_pool() -> None:
+    global _smtp_pool
+    if _smtp_pool is not None:
+        await _smtp_pool.close()
+        _smtp_pool = None
+    await close_async_smtp_pool()
@@ -0,0 +1,260 @@
+from typing import Callable, Deque, Dict, Any, List, Optional, Tuple
+from collections import deque
+from datetime import datetime
+import asyncio
+import logging
+import time
+
+from sqlalchemy import update, values, column, cast, bindparam, func, Integer, BigInteger, DateTime, Text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Broadcast, BroadcastRecipient, DeliveryStatus
+from .channels import DeliveryResult
+
+logger = logging.getLogger(__name__)
+
+recipients_table = BroadcastRecipient.__table__
+
+CHANNEL_COLUMNS: Dict[str, Dict[str, str]] = {
+    'telegram': {
+        'status': 'telegram_status',
+        'sent_at': 'telegram_sent_at',
+        'error': 'telegram_error',
+        'message_id': 'telegram_message_id',
+        'attempts': 'telegram_attempts',
+    },
+    'email': {
+        'status': 'email_status',
+        'sent_at': 'email_sent_at',
+        'error': 'email_error',
+        'attempts': 'email_attempts',
+    },
+}
+
+RATE_WINDOW: float = 60.0
+
+class StatusWriter:
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        broadcast_id: int,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        lock: Optional[asyncio.Lock] = None,
+        rate_limit: Optional[Callable[[], float]] = None,
+    ):
+        self.session = session
+        self.broadcast_id = broadcast_id
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._session_lock = lock or asyncio.Lock()
+        self.rate_limit = rate_limit
+        self._flush_lock = asyncio.Lock()
+        self._buffer: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._ticker: Optional[asyncio.Task] = None
+        self._sent_delta = 0
+        self._failed_delta = 0
+        self._processed = 0
+        self._rate_samples: Deque[Tuple[float, int]] = deque([(time.monotonic(), 0)])
+        self.flushed = 0
+        self.flushes = 0
+        self.flush_seconds = 0.0
+
+    async def start(self) -> None:
+        if self._ticker is None and self.flush_interval > 0:
+            self._ticker = asyncio.create_task(self._tick(), name=f"status-writer-{self.broadcast_id}")
+
+    async def add(
+        self,
+        user_id: int,
+        channel: str,
+        delivery: DeliveryResult,
+        attempts: int = 1,
+        final: bool = True,
+    ) -> None:
+        if channel not in CHANNEL_COLUMNS:
+            raise ValueError(f"Unknown channel: {channel}")
+
+        if delivery.success:
+            status = DeliveryStatus.sent
+        elif not final:
+            status = DeliveryStatus.pending
+        else:
+            status = DeliveryStatus(delivery.status)
+
+        self._buffer[(channel, user_id)] = {
+            'user_id': user_id,
+            'status': status,
+            'attempts': attempts,
+            'sent_at': delivery.sent_at or datetime.utcnow(),
+            'error': delivery.error,
+            'message_id': int(delivery.message_id) if delivery.message_id else None,
+        }
+
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    def record_outcome(self, success: bool) -> None:
+        if success:
+            self._sent_delta += 1
+        else:
+            self._failed_delta += 1
+        self._processed += 1
+
+    @property
+    def send_rate(self) -> float:
+        now = time.monotonic()
+        while len(self._rate_samples) > 1 and now - self._rate_samples[1][0] >= RATE_WINDOW:
+            self._rate_samples.popleft()
+
+        started, processed = self._rate_samples[0]
+        elapsed = now - started
+        return (self._processed - processed) / elapsed if elapsed > 0 else 0.0
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._buffer and not (self._sent_delta or self._failed_delta):
+                return 0
+
+            pending, self._buffer = self._buffer, {}
+            sent_delta, self._sent_delta = self._sent_delta, 0
+            failed_delta, self._failed_delta = self._failed_delta, 0
+
+            groups: Dict[Tuple[str, DeliveryStatus], List[Dict[str, Any]]] = {}
+            for (channel, _), row in pending.items():
+                groups.setdefault((channel, row['status']), []).append(row)
+
+            started = time.perf_counter()
+            try:
+                async with self._session_lock:
+                    for (channel, status), rows in groups.items():
+                        await self._write_group(channel, status, rows)
+                    await self._write_progress(sent_delta, failed_delta)
+                    await self.session.commit()
+
+            except Exception as e:
+                logger.error(f"❌ Failed to flush {len(pending)} delivery statuses: {e}")
+                async with self._session_lock:
+                    await self.session.rollback()
+                for key, row in pending.items():
+                    self._buffer.setdefault(key, row)
+                self._sent_delta += sent_delta
+                self._failed_delta += failed_delta
+                raise
+
+            self.flushed += len(pending)
+            self.flushes += 1
+            self.flush_seconds += time.perf_counter() - started
+            return len(pending)
+
+    async def _write_group(self, channel: str, status: DeliveryStatus, rows: List[Dict[str, Any]]) -> None:
+        columns = CHANNEL_COLUMNS[channel]
+
+        if self.session.get_bind().dialect.name == 'postgresql':
+            delivery = values(
+                column('user_id', Integer),
+                column('sent_at', DateTime),
+                column('error', Text),
+                column('message_id', BigInteger),
+                column('attempts', Integer),
+                name='delivery',
+            ).data([
+                (row['user_id'], row['sent_at'], row['error'], row['message_id'], row['attempts'])
+                for row in rows
+            ])
+
+            assignments = {
+                columns['status']: status,
+                columns['sent_at']: cast(delivery.c.sent_at, DateTime),
+                columns['error']: cast(delivery.c.error, Text),
+                columns['attempts']: cast(delivery.c.attempts, Integer),
+            }
+            if 'message_id' in columns:
+                assignments[columns['message_id']] = cast(delivery.c.message_id, Integer)
+
+            await self.session.execute(
+                update(recipients_table)
+                .where(
+                    recipients_table.c.broadcast_id == self.broadcast_id,
+                    recipients_table.c.user_id == delivery.c.user_id,
+                )
+                .values(assignments)
+            )
+            return
+
+        # UPDATE ... FROM (VALUES ...) is PostgreSQL-specific; elsewhere use one executemany
+        assignments = {
+            columns['status']: status,
+            columns['sent_at']: bindparam('b_sent_at'),
+            columns['error']: bindparam('b_error'),
+            columns['attempts']: bindparam('b_attempts'),
+        }
+        if 'message_id' in columns:
+            assignments[columns['message_id']] = bindparam('b_message_id')
+
+        await self.session.execute(
+            update(recipients_table)
+            .where(
+                recipients_table.c.broadcast_id == self.broadcast_id,
+                recipients_table.c.user_id == bindparam('b_user_id'),
+            )
+            .values(assignments),
+            [
+                {
+                    'b_user_id': row['user_id'],
+                    'b_sent_at': row['sent_at'],
+                    'b_error': row['error'],
+                    'b_message_id': row['message_id'],
+                    'b_attempts': row['attempts'],
+                }
+                for row in rows
+            ]
+        )
+
+    async def _write_progress(self, sent_delta: int, failed_delta: int) -> None:
+        self._rate_samples.append((time.monotonic(), self._processed))
+
+        values = dict(
+            sent_count=func.coalesce(Broadcast.sent_count, 0) + sent_delta,
+            failed_count=func.coalesce(Broadcast.failed_count, 0) + failed_delta,
+            send_rate=round(self.send_rate, 3),
+            progress_updated_at=datetime.utcnow(),
+        )
+        if self.rate_limit is not None:
+            values['rate_limit'] = round(self.rate_limit(), 3)
+
+        await self.session.execute(
+            update(Broadcast)
+            .where(Broadcast.id == self.broadcast_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        if self._ticker:
+            self._ticker.cancel()
+            await asyncio.gather(self._ticker, return_exceptions=True)
+            self._ticker = None
+        await self.flush()
+
+    async def __aenter__(self) -> "StatusWriter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"<StatusWriter broadcast_id={self.broadcast_id} "
+            f"buffered={len(self._buffer)} flushed={self.flushed}>"
+        )
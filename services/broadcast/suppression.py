@@ -0,0 +1,120 @@
+from typing import Any, Dict, Optional, Set, Tuple
+from datetime import datetime
+import logging
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import DeliverySuppression
+
+logger = logging.getLogger(__name__)
+
+class SuppressionList:
+
+    CHANNELS: Tuple[str, ...] = ('telegram', 'email')
+    # Rows per INSERT, keeps the statement under the bind parameter limit
+    FLUSH_CHUNK: int = 1000
+
+    def __init__(self):
+        self._suppressed: Dict[str, Set[str]] = {channel: set() for channel in self.CHANNELS}
+        # Added during delivery, written to the database in one round trip by flush()
+        self._pending: Dict[Tuple[str, str], Optional[str]] = {}
+        self.loaded_at: Optional[datetime] = None
+
+    @staticmethod
+    def normalize(channel: str, address: Any) -> str:
+        value = str(address).strip()
+        return value.lower() if channel == 'email' else value
+
+    async def load(self, session: AsyncSession) -> int:
+        result = await session.execute(select(DeliverySuppression.channel, DeliverySuppression.address))
+
+        suppressed: Dict[str, Set[str]] = {channel: set() for channel in self.CHANNELS}
+        for channel, address in result.all():
+            suppressed.setdefault(channel, set()).add(address)
+        for channel, address in self._pending:
+            suppressed.setdefault(channel, set()).add(address)
+
+        self._suppressed = suppressed
+        self.loaded_at = datetime.utcnow()
+        return len(self)
+
+    def is_suppressed(self, channel: str, address: Any) -> bool:
+        if address is None:
+            return False
+        return self.normalize(channel, address) in self._suppressed.get(channel, ())
+
+    def add(self, channel: str, address: Any, reason: Optional[str] = None) -> bool:
+        if address is None or self.is_suppressed(channel, address):
+            return False
+        address = self.normalize(channel, address)
+        self._suppressed.setdefault(channel, set()).add(address)
+        self._pending[(channel, address)] = reason
+        return True
+
+    async def flush(self, session: AsyncSession) -> int:
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        # Addresses another process suppressed in the meantime are skipped by the database
+        if session.get_bind().dialect.name == 'postgresql':
+            insert = postgresql_insert
+        else:
+            insert = sqlite_insert
+        rows = [
+            {'channel': channel, 'address': address, 'reason': reason}
+            for (channel, address), reason in pending.items()
+        ]
+
+        inserted = 0
+        try:
+            for start in range(0, len(rows), self.FLUSH_CHUNK):
+                result = await session.execute(
+                    insert(DeliverySuppression)
+                    .values(rows[start:start + self.FLUSH_CHUNK])
+                    .on_conflict_do_nothing(index_elements=['channel', 'address'])
+                )
+                inserted += max(result.rowcount or 0, 0)
+            await session.commit()
+        except Exception as e:
+            logger.error(f"❌ Failed to save {len(pending)} suppressed recipients: {e}")
+            await session.rollback()
+            for key, reason in pending.items():
+                self._pending.setdefault(key, reason)
+            raise
+
+        if inserted:
+            logger.info(f"✅ Suppressed {inserted} unreachable recipients")
+        return inserted
+
+    async def remove(self, session: AsyncSession, channel: str, address: Any) -> bool:
+        address = self.normalize(channel, address)
+        self._suppressed.get(channel, set()).discard(address)
+        self._pending.pop((channel, address), None)
+
+        result = await session.execute(
+            delete(DeliverySuppression).where(
+                DeliverySuppression.channel == channel,
+                DeliverySuppression.address == address,
+            )
+        )
+        await session.commit()
+        return bool(result.rowcount)
+
+    def __len__(self) -> int:
+        return sum(len(addresses) for addresses in self._suppressed.values())
+
+    def __repr__(self) -> str:
+        counts = " ".join(f"{channel}={len(addresses)}" for channel, addresses in self._suppressed.items())
+        return f"<SuppressionList {counts} pending={len(self._pending)}>"
+
+_suppression_list: Optional[SuppressionList] = None
+
+def get_suppression_list() -> SuppressionList:
+    global _suppression_list
+    if _suppression_list is None:
+        _suppression_list = SuppressionList()
+    return _suppression_list
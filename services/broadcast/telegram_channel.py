@@ -1,7 +1,6 @@
 from typing import Dict, Any, Optional
 from datetime import datetime
 import logging
-import asyncio
 
 from aiogram import Bot
 from aiogram.exceptions import (
@@ -9,19 +8,28 @@ from aiogram.exceptions import (
     TelegramBadRequest,
     TelegramUnauthorizedError,
     TelegramServerError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
 )
 
 from .channels import NotificationChannel, DeliveryResult
+from .rate_limiter import RateLimiter, MessagePriority, get_telegram_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 class TelegramChannel(NotificationChannel):
 
-    RATE_LIMIT_DELAY: float = 0.05
-
-    def __init__(self, bot: Bot):
+    def __init__(
+        self,
+        bot: Bot,
+        rate_limiter: Optional[RateLimiter] = None,
+        priority: MessagePriority = MessagePriority.bulk,
+        parse_mode: Optional[str] = "HTML",
+    ):
         self.bot = bot
-        self._last_send_time: float = 0
+        self.rate_limiter = rate_limiter or get_telegram_rate_limiter()
+        self.priority = priority
+        self.parse_mode = parse_mode
 
     def get_channel_name(self) -> str:
         return "Telegram"
@@ -43,15 +51,8 @@ class TelegramChannel(NotificationChannel):
             return False
         return recipient["telegram_id"] > 0
 
-    async def _apply_rate_limit(self):
-        current_time = asyncio.get_event_loop().time()
-        time_since_last_send = current_time - self._last_send_time
-
-        if time_since_last_send < self.RATE_LIMIT_DELAY:
-            wait_time = self.RATE_LIMIT_DELAY - time_since_last_send
-            await asyncio.sleep(wait_time)
-
-        self._last_send_time = asyncio.get_event_loop().time()
+    async def _apply_rate_limit(self, chat_id: int):
+        await self.rate_limiter.acquire(chat_id, priority=self.priority)
 
     async def send(
         self,
@@ -69,15 +70,16 @@ class TelegramChannel(NotificationChannel):
         telegram_id = recipient["telegram_id"]
 
         try:
-            await self._apply_rate_limit()
+            await self._apply_rate_limit(telegram_id)
 
             message = await self.bot.send_message(
                 chat_id=telegram_id,
                 text=body,
-                parse_mode="HTML"
+                parse_mode=self.parse_mode
             )
 
             logger.info(f"✅ Telegram message sent to {telegram_id}: msg_id={message.message_id}")
+            self.rate_limiter.record_success()
 
             return DeliveryResult(
                 success=True,
@@ -86,13 +88,26 @@ class TelegramChannel(NotificationChannel):
                 sent_at=datetime.utcnow()
             )
 
+        except TelegramRetryAfter as e:
+            error_msg = f"Flood control for user {telegram_id}, retry in {e.retry_after}s"
+            logger.warning(f"⚠️  {error_msg}")
+            self.rate_limiter.record_throttle(float(e.retry_after))
+            return DeliveryResult(
+                success=False,
+                status="failed",
+                error=error_msg,
+                retryable=True,
+                retry_after=float(e.retry_after)
+            )
+
         except TelegramForbiddenError:
             error_msg = f"Bot blocked by user {telegram_id}"
             logger.warning(f"⚠️  {error_msg}")
             return DeliveryResult(
                 success=False,
                 status="blocked",
-                error=error_msg
+                error=error_msg,
+                unreachable=True
             )
 
         except TelegramBadRequest as e:
@@ -110,7 +125,18 @@ class TelegramChannel(NotificationChannel):
             return DeliveryResult(
                 success=False,
                 status="failed",
-                error=error_msg
+                error=error_msg,
+                retryable=True
+            )
+
+        except (TelegramNetworkError, TimeoutError) as e:
+            error_msg = f"Network error sending to {telegram_id}: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            return DeliveryResult(
+                success=False,
+                status="failed",
+                error=error_msg,
+                retryable=True
             )
 
         except Exception as e:
@@ -119,7 +145,8 @@ class TelegramChannel(NotificationChannel):
             return DeliveryResult(
                 success=False,
                 status="failed",
-                error=error_msg
+                error=error_msg,
+                retryable=True
             )
 
     async def test_connection(self) -> bool:
@@ -1,4 +1,6 @@
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Set, Tuple
+from collections import OrderedDict
+import hashlib
 import logging
 import re
 
@@ -28,15 +30,78 @@ class TemplateRenderer:
         'presentation': 'Presentation topic',
         'bio': 'User biography',
         'competition_name': 'Competition name',
+        'competition_names': 'All matching competition names (list)',
         'competition_type': 'Competition type',
         'role': 'User role (player, voter, viewer, adviser)',
+        'roles': 'All matching roles (list)',
         'registration_status': 'Registration status (pending, approved, rejected)',
         'date': 'Current date',
         'time': 'Current time',
     }
 
-    def __init__(self):
+    CACHE_SIZE: int = 256
+
+    def __init__(self, cache_size: Optional[int] = None):
         self.env = Environment(trim_blocks=True, lstrip_blocks=True)
+        self.cache_size = max(1, cache_size or self.CACHE_SIZE)
+        self._cache: "OrderedDict[str, Tuple[Template, FrozenSet[str]]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def template_key(template_text: str) -> str:
+        return hashlib.sha1(template_text.encode("utf-8")).hexdigest()
+
+    def get_compiled(self, template_text: str) -> Tuple[Template, FrozenSet[str]]:
+        key = self.template_key(template_text)
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry
+
+        self.cache_misses += 1
+        entry = (
+            self.env.from_string(template_text),
+            frozenset(self.extract_variables(template_text)),
+        )
+        self._cache[key] = entry
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def get_variables(self, template_text: str) -> FrozenSet[str]:
+        return self.get_compiled(template_text)[1]
+
+    @classmethod
+    def _freeze(cls, value: Any) -> Any:
+        if isinstance(value, dict):
+            return tuple(sorted((k, cls._freeze(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return tuple(cls._freeze(v) for v in value)
+        return value
+
+    @classmethod
+    def context_key(cls, variables: Iterable[str], context: Dict[str, Any]) -> Tuple:
+        # Two contexts with equal keys render identically in non-strict mode
+        return tuple((name, cls._freeze(context.get(name))) for name in sorted(variables))
+
+    @staticmethod
+    def _render_compiled(
+        template: Template,
+        variables: FrozenSet[str],
+        context: Dict[str, Any],
+        strict: bool
+    ) -> str:
+        if strict:
+            return template.render(context)
+
+        safe_context = {k: v for k, v in context.items() if k in variables}
+        return template.render(**safe_context)
 
     def render(
         self,
@@ -45,15 +110,33 @@ class TemplateRenderer:
         strict: bool = False
     ) -> str:
         try:
-            template = self.env.from_string(template_text)
+            template, variables = self.get_compiled(template_text)
+            return self._render_compiled(template, variables, context, strict)
 
-            if strict:
-                result = template.render(context)
-            else:
-                safe_context = {k: v for k, v in context.items() if k in self.extract_variables(template_text)}
-                result = template.render(**safe_context)
+        except TemplateSyntaxError as e:
+            logger.error(f"❌ Template syntax error: {e}")
+            raise
 
-            return result
+        except UndefinedError as e:
+            logger.error(f"❌ Undefined variable in template: {e}")
+            raise
+
+        except Exception as e:
+            logger.error(f"❌ Template rendering error: {e}")
+            raise
+
+    def render_many(
+        self,
+        template_text: str,
+        contexts: Iterable[Dict[str, Any]],
+        strict: bool = False
+    ) -> List[str]:
+        try:
+            template, variables = self.get_compiled(template_text)
+            return [
+                self._render_compiled(template, variables, context, strict)
+                for context in contexts
+            ]
 
         except TemplateSyntaxError as e:
             logger.error(f"❌ Template syntax error: {e}")
@@ -127,8 +210,10 @@ class TemplateRenderer:
             'presentation': 'The Future of Chess',
             'bio': 'International chess player with 15 years experience',
             'competition_name': 'World Chess Championship 2024',
+            'competition_names': ['World Chess Championship 2024'],
             'competition_type': 'Online Tournament',
             'role': 'player',
+            'roles': ['player'],
             'registration_status': 'approved',
             'date': datetime.now().strftime('%Y-%m-%d'),
             'time': datetime.now().strftime('%H:%M:%S'),
@@ -96,6 +96,9 @@ class SMTPConfig(BaseModel):
     support_email: Optional[str] = Field(default=None, description="Support email address")
     email_from_name: str = Field(default="USN Competitions", description="Email sender name")
     support_telegram_id: Optional[int] = Field(default=None, ge=1, description="Support Telegram user ID")
+    smtp_pool_size: int = Field(default=4, ge=1, le=64, description="Persistent SMTP connections kept open")
+    smtp_idle_check: float = Field(default=30.0, gt=0, description="Seconds idle before a pooled connection is health-checked")
+    smtp_transport: str = Field(default="asyncio", description="SMTP transport: 'asyncio' (native streams) or 'thread' (smtplib pool)")
 
     @field_validator("smtp_host", mode="before")
     @classmethod
@@ -157,6 +160,34 @@ class SMTPConfig(BaseModel):
             return v
         return None
 
+    @field_validator("smtp_pool_size", mode="before")
+    @classmethod
+    def get_smtp_pool_size(cls, v):
+        env_val = os.getenv("SMTP_POOL_SIZE")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 4
+
+    @field_validator("smtp_idle_check", mode="before")
+    @classmethod
+    def get_smtp_idle_check(cls, v):
+        env_val = os.getenv("SMTP_IDLE_CHECK")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 30.0
+
+    @field_validator("smtp_transport", mode="before")
+    @classmethod
+    def get_smtp_transport(cls, v):
+        transport = (os.getenv("SMTP_TRANSPORT") or v or "asyncio").lower()
+        if transport not in ("asyncio", "thread"):
+            raise ValueError("SMTP_TRANSPORT must be 'asyncio' or 'thread'")
+        return transport
+
     def is_configured(self) -> bool:
         """Check if SMTP is fully configured"""
         return bool(
@@ -185,11 +216,277 @@ class SMTPConfig(BaseModel):
         return True
 
 
+class BroadcastConfig(BaseModel):
+    """Broadcast delivery configuration"""
+
+    class Config:
+        validate_default = True
+
+    concurrency: int = Field(default=16, ge=1, le=512, description="Concurrent delivery workers per broadcast")
+    email_concurrency: int = Field(default=8, ge=1, le=512, description="Concurrent email workers when a broadcast also sends to Telegram")
+    lane_max_ahead: int = Field(default=5000, ge=1, le=1000000, description="Recipients a channel lane may finish before the other lanes reach them")
+    telegram_global_rate: float = Field(default=30.0, gt=0, description="Telegram messages per second (bot-wide)")
+    telegram_per_chat_rate: float = Field(default=1.0, gt=0, description="Telegram messages per second per chat")
+    telegram_adaptive_rate: bool = Field(default=True, description="Adjust the global Telegram rate from 429 feedback (AIMD)")
+    telegram_max_rate: float = Field(default=30.0, gt=0, description="Ceiling for the adaptive global Telegram rate, messages per second")
+    status_batch_size: int = Field(default=500, ge=1, le=10000, description="Delivery statuses buffered per flush")
+    status_flush_interval: float = Field(default=1.0, gt=0, description="Max seconds between delivery status flushes")
+    recipient_batch_size: int = Field(default=500, ge=1, le=10000, description="Recipients fetched per page while streaming")
+    scheduler_poll_interval: float = Field(default=5.0, gt=0, description="Seconds between scheduler polls for due broadcasts")
+    lease_timeout: float = Field(default=60.0, gt=0, description="Seconds without a heartbeat before a running broadcast is considered abandoned")
+    max_runs: int = Field(default=3, ge=1, le=100, description="Times a broadcast is started or reclaimed before it is marked failed")
+    retry_max_attempts: int = Field(default=5, ge=1, le=50, description="Delivery attempts per channel before giving up")
+    retry_base_delay: float = Field(default=1.0, gt=0, description="Initial retry backoff, seconds")
+    retry_max_delay: float = Field(default=300.0, gt=0, description="Maximum retry backoff, seconds")
+    audience_count_ttl: float = Field(default=300.0, ge=0, description="Seconds an exact audience count is reused by previews")
+    shard_count: int = Field(default=1, ge=1, le=256, description="Recipient shards per broadcast, claimed by any bot process")
+    render_workers: int = Field(default=0, ge=0, le=64, description="Worker processes rendering templates and building emails (0 renders on the event loop)")
+    outbox_poll_interval: float = Field(default=2.0, gt=0, description="Seconds between notification outbox polls")
+    outbox_batch_size: int = Field(default=50, ge=1, le=1000, description="Outbox notifications sent per dispatcher batch")
+    outbox_lease: float = Field(default=120.0, gt=0, description="Seconds a claimed outbox batch is hidden from other dispatchers while it is sent")
+    shared_rate_budget: bool = Field(default=False, description="Take the global Telegram rate from a budget shared through the database")
+
+    @field_validator("concurrency", mode="before")
+    @classmethod
+    def get_concurrency(cls, v):
+        env_val = os.getenv("BROADCAST_CONCURRENCY")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 16
+
+    @field_validator("email_concurrency", mode="before")
+    @classmethod
+    def get_email_concurrency(cls, v):
+        env_val = os.getenv("BROADCAST_EMAIL_CONCURRENCY")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 8
+
+    @field_validator("lane_max_ahead", mode="before")
+    @classmethod
+    def get_lane_max_ahead(cls, v):
+        env_val = os.getenv("BROADCAST_LANE_MAX_AHEAD")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 5000
+
+    @field_validator("telegram_global_rate", mode="before")
+    @classmethod
+    def get_telegram_global_rate(cls, v):
+        env_val = os.getenv("TELEGRAM_GLOBAL_RATE")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 30.0
+
+    @field_validator("telegram_per_chat_rate", mode="before")
+    @classmethod
+    def get_telegram_per_chat_rate(cls, v):
+        env_val = os.getenv("TELEGRAM_PER_CHAT_RATE")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 1.0
+
+    @field_validator("telegram_adaptive_rate", mode="before")
+    @classmethod
+    def parse_telegram_adaptive_rate(cls, v):
+        env_val = os.getenv("TELEGRAM_ADAPTIVE_RATE")
+        if env_val is not None:
+            return env_val.lower() == "true"
+        if isinstance(v, bool):
+            return v
+        if isinstance(v, str):
+            return v.lower() == "true"
+        return bool(v)
+
+    @field_validator("telegram_max_rate", mode="before")
+    @classmethod
+    def get_telegram_max_rate(cls, v):
+        env_val = os.getenv("TELEGRAM_MAX_RATE")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 30.0
+
+    @field_validator("status_batch_size", mode="before")
+    @classmethod
+    def get_status_batch_size(cls, v):
+        env_val = os.getenv("BROADCAST_STATUS_BATCH_SIZE")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 500
+
+    @field_validator("status_flush_interval", mode="before")
+    @classmethod
+    def get_status_flush_interval(cls, v):
+        env_val = os.getenv("BROADCAST_STATUS_FLUSH_INTERVAL")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 1.0
+
+    @field_validator("recipient_batch_size", mode="before")
+    @classmethod
+    def get_recipient_batch_size(cls, v):
+        env_val = os.getenv("BROADCAST_RECIPIENT_BATCH_SIZE")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 500
+
+    @field_validator("scheduler_poll_interval", mode="before")
+    @classmethod
+    def get_scheduler_poll_interval(cls, v):
+        env_val = os.getenv("BROADCAST_SCHEDULER_POLL_INTERVAL")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 5.0
+
+    @field_validator("lease_timeout", mode="before")
+    @classmethod
+    def get_lease_timeout(cls, v):
+        env_val = os.getenv("BROADCAST_LEASE_TIMEOUT")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 60.0
+
+    @field_validator("max_runs", mode="before")
+    @classmethod
+    def get_max_runs(cls, v):
+        env_val = os.getenv("BROADCAST_MAX_RUNS")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 3
+
+    @field_validator("retry_max_attempts", mode="before")
+    @classmethod
+    def get_retry_max_attempts(cls, v):
+        env_val = os.getenv("BROADCAST_RETRY_MAX_ATTEMPTS")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 5
+
+    @field_validator("retry_base_delay", mode="before")
+    @classmethod
+    def get_retry_base_delay(cls, v):
+        env_val = os.getenv("BROADCAST_RETRY_BASE_DELAY")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 1.0
+
+    @field_validator("retry_max_delay", mode="before")
+    @classmethod
+    def get_retry_max_delay(cls, v):
+        env_val = os.getenv("BROADCAST_RETRY_MAX_DELAY")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 300.0
+
+    @field_validator("audience_count_ttl", mode="before")
+    @classmethod
+    def get_audience_count_ttl(cls, v):
+        env_val = os.getenv("BROADCAST_AUDIENCE_COUNT_TTL")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 300.0
+
+    @field_validator("shard_count", mode="before")
+    @classmethod
+    def get_shard_count(cls, v):
+        env_val = os.getenv("BROADCAST_SHARD_COUNT")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 1
+
+    @field_validator("render_workers", mode="before")
+    @classmethod
+    def get_render_workers(cls, v):
+        env_val = os.getenv("BROADCAST_RENDER_WORKERS")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 0
+
+    @field_validator("outbox_poll_interval", mode="before")
+    @classmethod
+    def get_outbox_poll_interval(cls, v):
+        env_val = os.getenv("OUTBOX_POLL_INTERVAL")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 2.0
+
+    @field_validator("outbox_batch_size", mode="before")
+    @classmethod
+    def get_outbox_batch_size(cls, v):
+        env_val = os.getenv("OUTBOX_BATCH_SIZE")
+        if env_val:
+            return int(env_val)
+        if isinstance(v, int):
+            return v
+        return 50
+
+    @field_validator("outbox_lease", mode="before")
+    @classmethod
+    def get_outbox_lease(cls, v):
+        env_val = os.getenv("OUTBOX_LEASE")
+        if env_val:
+            return float(env_val)
+        if isinstance(v, (int, float)):
+            return float(v)
+        return 120.0
+
+    @field_validator("shared_rate_budget", mode="before")
+    @classmethod
+    def parse_shared_rate_budget(cls, v):
+        env_val = os.getenv("BROADCAST_SHARED_RATE_BUDGET")
+        if env_val is not None:
+            return env_val.lower() == "true"
+        if isinstance(v, bool):
+            return v
+        if isinstance(v, str):
+            return v.lower() == "true"
+        return bool(v)
+
+
 class Settings(BaseModel):
     """Combined application settings"""
     bot: BotConfig = Field(default_factory=BotConfig)
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     smtp: SMTPConfig = Field(default_factory=SMTPConfig)
+    broadcast: BroadcastConfig = Field(default_factory=BroadcastConfig)
 
     class Config:
         validate_default = True
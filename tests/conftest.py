@@ -0,0 +1,76 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import (  # noqa: E402
+    Base, UserModel, MessageTemplate, Broadcast, BroadcastRecipient, BroadcastStatus,
+)
+
+async def _create_schema(engine) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # NullPool: every asyncio.run() in a test opens its connections on its own loop
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+    asyncio.run(_create_schema(engine))
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+async def seed_broadcast(
+    session_factory,
+    recipients: int = 3,
+    users: int = None,
+    body: str = "Hello {{ first_name }}",
+    **fields,
+) -> int:
+    async with session_factory() as session:
+        for i in range(users if users is not None else recipients):
+            session.add(UserModel(
+                id=i + 1,
+                telegram_id=1000 + i,
+                first_name=f"User{i + 1}",
+                last_name="Test",
+                phone=f"+7000000{i:04d}",
+                email=f"user{i + 1}@example.com",
+                city="Moscow",
+                club="Club",
+            ))
+
+        template = MessageTemplate(
+            name=f"template-{len(fields)}-{recipients}",
+            subject="Subject",
+            body_telegram=body,
+            body_email=body,
+            available_variables={},
+        )
+        session.add(template)
+        await session.flush()
+
+        fields.setdefault("status", BroadcastStatus.draft)
+        fields.setdefault("filters", {})
+        broadcast = Broadcast(name="test", template_id=template.id, created_by=1, **fields)
+        session.add(broadcast)
+        await session.flush()
+
+        for i in range(recipients):
+            session.add(BroadcastRecipient(
+                broadcast_id=broadcast.id,
+                user_id=i + 1,
+                telegram_id=1000 + i,
+                email_address=f"user{i + 1}@example.com",
+            ))
+
+        await session.commit()
+        return broadcast.id
+
+@pytest.fixture
+def seed():
+    return seed_broadcast
@@ -0,0 +1,113 @@
+import asyncio
+import os
+
+import django
+from django.conf import settings
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "admin_panel.settings")
+if not settings.configured or not django.apps.apps.ready:
+    django.setup()
+
+from django.contrib import admin  # noqa: E402
+from django.contrib.messages.storage.cookie import CookieStorage  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from admin_panel.apps.BotDataApp.admin import User  # noqa: E402
+from admin_panel.apps.BotDataApp.models import Broadcast as BroadcastRow  # noqa: E402
+from sqlalchemy import select, update  # noqa: E402
+
+from models import Broadcast, BroadcastStatus, MessageTemplate  # noqa: E402
+from services.broadcast.scheduler import BroadcastScheduler  # noqa: E402
+
+class AdminUser:
+
+    id = 1
+    is_active = True
+    is_staff = True
+    is_superuser = True
+
+    def get_username(self):
+        return "admin"
+
+def _use_database(path):
+    # The admin talks to the same schema the bot created
+    connections["default"].close()
+    connections["default"].settings_dict["NAME"] = str(path)
+
+def _send_custom_message(user_ids, **data):
+    request = RequestFactory().post("/admin/BotDataApp/user/", {
+        'confirm_send': '1',
+        'message': "Привет, {first_name}! {not a placeholder}",
+        'subject': "Новости",
+        'send_telegram': '1',
+        **data,
+    })
+    request.user = AdminUser()
+    request._messages = CookieStorage(request)
+
+    model_admin = admin.site._registry[User]
+    return model_admin.send_custom_message(request, User.objects.filter(id__in=user_ids))
+
+def test_admin_message_is_queued_as_a_scheduled_broadcast(session_factory, seed, tmp_path):
+    async def scheduled():
+        async with session_factory() as session:
+            result = await session.execute(select(Broadcast).where(Broadcast.status == BroadcastStatus.scheduled))
+            broadcast = result.scalar_one()
+            template = await session.get(MessageTemplate, broadcast.template_id)
+            return broadcast, template
+
+    asyncio.run(seed(session_factory, recipients=0, users=3))
+    _use_database(tmp_path / "test.db")
+    try:
+        assert _send_custom_message([1, 3]) is None
+    finally:
+        connections["default"].close()
+
+    broadcast, template = asyncio.run(scheduled())
+    assert broadcast.status == BroadcastStatus.scheduled
+    assert broadcast.attempts == 0
+    assert broadcast.filters == {'user_ids': [1, 3]}
+    assert (broadcast.send_telegram, broadcast.send_email, broadcast.total_recipients) == (True, False, 2)
+    assert template.body_telegram == "Привет, {{ first_name|default('', true) }}! {{ '{' }}not a placeholder}"
+
+    # The bot's scheduler claims it like any other due broadcast
+    scheduler = BroadcastScheduler(session_factory, poll_interval=1, lease_timeout=60)
+    assert asyncio.run(scheduler.claim_next()) == broadcast.id
+
+class ChangedForm:
+
+    def __init__(self, *changed_data):
+        self.changed_data = list(changed_data)
+
+def test_claimed_broadcast_cannot_be_edited(session_factory, seed, tmp_path):
+    async def set_status(status):
+        async with session_factory() as session:
+            await session.execute(update(Broadcast).values(status=status))
+            await session.commit()
+
+    broadcast_id = asyncio.run(seed(session_factory, recipients=0, users=1))
+    request = RequestFactory().post("/admin/BotDataApp/broadcast/")
+    request.user = AdminUser()
+    request._messages = CookieStorage(request)
+    model_admin = admin.site._registry[BroadcastRow]
+
+    _use_database(tmp_path / "test.db")
+    try:
+        draft = BroadcastRow.objects.get(pk=broadcast_id)
+        assert 'filters' not in model_admin.get_readonly_fields(request, draft)
+        draft.name = "Renamed"
+        model_admin.save_model(request, draft, ChangedForm('name'), change=True)
+        assert BroadcastRow.objects.get(pk=broadcast_id).name == "Renamed"
+
+        # Claimed while the change form was open
+        stale = BroadcastRow.objects.get(pk=broadcast_id)
+        asyncio.run(set_status(BroadcastStatus.in_progress))
+        stale.filters = {'cities': ['Kazan']}
+        model_admin.save_model(request, stale, ChangedForm('filters'), change=True)
+
+        claimed = BroadcastRow.objects.get(pk=broadcast_id)
+        assert (claimed.status, claimed.filters) == ('in_progress', {})
+        assert {'name', 'filters', 'scheduled_at'} <= set(model_admin.get_readonly_fields(request, claimed))
+    finally:
+        connections["default"].close()
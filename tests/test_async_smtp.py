@@ -0,0 +1,99 @@
+import asyncio
+import os
+import ssl
+from email.mime.text import MIMEText
+
+import pytest
+
+from services.broadcast.async_smtp import AsyncSMTPConnection, AsyncSMTPPool, SMTPResponseError
+from services.broadcast.simulation import SMTPSink
+
+# Self-signed certificate and key for 127.0.0.1, valid until 2126
+CERTIFICATE = os.path.join(os.path.dirname(__file__), "data", "smtp_localhost.pem")
+
+def _server_context() -> ssl.SSLContext:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(CERTIFICATE)
+    return context
+
+def _client_context() -> ssl.SSLContext:
+    return ssl.create_default_context(cafile=CERTIFICATE)
+
+def _message(index: int) -> MIMEText:
+    msg = MIMEText(f"Message {index}\n.leading dot", "plain", "utf-8")
+    msg["Subject"] = f"Test {index}"
+    msg["From"] = "bot@example.com"
+    msg["To"] = f"user{index}@example.com"
+    return msg
+
+def test_starttls_upgrades_before_auth_and_send():
+    async def scenario():
+        sink = await SMTPSink(tls_context=_server_context()).start()
+        try:
+            connection = AsyncSMTPConnection(
+                sink.host, sink.port,
+                username="bot", password="secret",
+                use_tls=True, timeout=5,
+                tls_context=_client_context(),
+            )
+            await connection.connect()
+            assert "starttls" not in connection.extensions
+            assert connection._writer.get_extra_info("ssl_object") is not None
+
+            await connection.send_message(_message(1))
+            await connection.quit()
+        finally:
+            await sink.stop()
+
+        assert sink.tls_upgrades == 1
+        assert sink.messages == 1
+
+    asyncio.run(scenario())
+
+def test_pool_reuses_tls_connections():
+    async def scenario():
+        sink = await SMTPSink(tls_context=_server_context()).start()
+        pool = AsyncSMTPPool(
+            sink.host, sink.port,
+            username="bot", password="secret",
+            use_tls=True, size=2, timeout=5,
+            tls_context=_client_context(),
+        )
+        try:
+            await asyncio.gather(*(pool.send(_message(i)) for i in range(10)))
+        finally:
+            await pool.close()
+            await sink.stop()
+
+        assert sink.messages == 10
+        assert pool.connects <= 2
+        assert sink.tls_upgrades == pool.connects
+
+    asyncio.run(scenario())
+
+def test_untrusted_certificate_is_rejected():
+    async def scenario():
+        sink = await SMTPSink(tls_context=_server_context()).start()
+        try:
+            connection = AsyncSMTPConnection(sink.host, sink.port, use_tls=True, timeout=5)
+            with pytest.raises(ssl.SSLError):
+                await connection.connect()
+            await connection.close()
+        finally:
+            await sink.stop()
+
+    asyncio.run(scenario())
+
+def test_tls_required_but_not_offered():
+    async def scenario():
+        sink = await SMTPSink().start()
+        try:
+            connection = AsyncSMTPConnection(sink.host, sink.port, use_tls=True, timeout=5)
+            with pytest.raises(SMTPResponseError) as error:
+                await connection.connect()
+            assert error.value.code == 502
+            await connection.close()
+        finally:
+            await sink.stop()
+
+    asyncio.run(scenario())
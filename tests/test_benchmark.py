@@ -0,0 +1,13 @@
+import asyncio
+
+from services.broadcast.benchmark import benchmark_load
+from settings import settings
+
+def test_load_benchmark_ignores_the_shard_setting(monkeypatch):
+    # Sharding only queues work for other workers, which the benchmark does not run
+    monkeypatch.setattr(settings.broadcast, "shard_count", 3)
+
+    report = asyncio.run(benchmark_load(recipients=20, latency=0, global_rate=1000, per_chat_rate=1000))
+
+    assert (report['recipients_sent'], report['recipients_failed']) == (20, 0)
+    assert report['messages_sent'] == 20
@@ -0,0 +1,57 @@
+import asyncio
+
+from sqlalchemy import update
+
+from models import BroadcastRecipient, DeliveryStatus
+from utils.database import DatabaseManager
+
+def _manager(session_factory) -> DatabaseManager:
+    manager = DatabaseManager()
+    manager.async_session_maker = session_factory
+    return manager
+
+async def _set_statuses(session_factory, statuses):
+    async with session_factory() as session:
+        for user_id, (telegram_status, email_status) in statuses.items():
+            await session.execute(
+                update(BroadcastRecipient)
+                .where(BroadcastRecipient.user_id == user_id)
+                .values(telegram_status=telegram_status, email_status=email_status)
+            )
+        await session.commit()
+
+def test_statistics_add_up_per_recipient(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=6, send_telegram=True, send_email=True)
+        await _set_statuses(session_factory, {
+            1: (DeliveryStatus.sent, DeliveryStatus.sent),
+            2: (DeliveryStatus.sent, DeliveryStatus.failed),
+            3: (DeliveryStatus.blocked, DeliveryStatus.failed),
+            4: (DeliveryStatus.failed, DeliveryStatus.failed),
+            5: (DeliveryStatus.blocked, DeliveryStatus.pending),
+            6: (DeliveryStatus.pending, DeliveryStatus.pending),
+        })
+
+        stats = await _manager(session_factory).get_broadcast_statistics(broadcast_id)
+
+        assert stats['total_recipients'] == 6
+        assert (stats['telegram_sent'], stats['email_sent']) == (2, 1)
+        assert (stats['sent'], stats['failed'], stats['blocked'], stats['pending']) == (2, 2, 1, 2)
+        assert stats['sent'] + stats['failed'] + stats['pending'] == stats['total_recipients']
+
+    asyncio.run(scenario())
+
+def test_statistics_ignore_channels_the_broadcast_does_not_use(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=3, send_telegram=True, send_email=False)
+        await _set_statuses(session_factory, {
+            1: (DeliveryStatus.sent, DeliveryStatus.pending),
+            2: (DeliveryStatus.blocked, DeliveryStatus.pending),
+            3: (DeliveryStatus.failed, DeliveryStatus.pending),
+        })
+
+        stats = await _manager(session_factory).get_broadcast_statistics(broadcast_id)
+
+        assert (stats['sent'], stats['failed'], stats['blocked'], stats['pending']) == (1, 2, 1, 0)
+
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+import asyncio
+
+from services.broadcast.delivery_engine import DeliveryEngine
+
+def test_runs_every_item_within_the_concurrency_limit():
+    async def scenario():
+        running = peak = 0
+        results = {}
+
+        async def worker(item):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return item * 2
+
+        engine = DeliveryEngine(worker, concurrency=4, on_result=lambda item, result: results.update({item: result}))
+        await engine.run(range(50))
+
+        assert results == {i: i * 2 for i in range(50)}
+        assert peak == 4
+
+    asyncio.run(scenario())
+
+def test_accepts_async_iterables():
+    async def scenario():
+        seen = []
+
+        async def items():
+            for i in range(5):
+                yield i
+
+        async def worker(item):
+            seen.append(item)
+
+        await DeliveryEngine(worker, concurrency=2).run(items())
+        assert sorted(seen) == [0, 1, 2, 3, 4]
+
+    asyncio.run(scenario())
+
+def test_worker_exception_does_not_stall_the_run():
+    async def scenario():
+        results = []
+
+        async def worker(item):
+            if item == 3:
+                raise RuntimeError("boom")
+            return item
+
+        engine = DeliveryEngine(worker, concurrency=2, on_result=lambda item, result: results.append(result))
+        await asyncio.wait_for(engine.run(range(6)), timeout=5)
+
+        assert sorted(results) == [0, 1, 2, 4, 5]
+        assert engine._workers == []
+
+    asyncio.run(scenario())
+
+def test_deferred_items_run_after_their_delay_without_blocking_others():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        finished = {}
+        engine = DeliveryEngine(None, concurrency=2)
+
+        async def worker(item):
+            name, attempt = item
+            if name == "retry" and attempt == 1:
+                engine.defer((name, 2), 0.05)
+                return
+            finished[name] = loop.time()
+
+        engine.worker = worker
+        started = loop.time()
+        await engine.run([("retry", 1), ("a", 1), ("b", 1)])
+
+        assert finished["retry"] - started >= 0.05
+        assert finished["a"] - started < 0.05
+        assert engine.deferred == 0
+
+    asyncio.run(scenario())
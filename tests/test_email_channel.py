@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from services.broadcast.async_smtp import SMTPRecipientRefused, SMTPResponseError
+from services.broadcast.email_channel import EmailChannel
+
+class RaisingPool:
+
+    def __init__(self, error):
+        self.error = error
+
+    async def send(self, msg):
+        raise self.error
+
+def _send(error):
+    channel = EmailChannel(pool=RaisingPool(error))
+    channel._configured = True
+    return asyncio.run(channel.send({"email": "user1@example.com"}, "Subject", "Body"))
+
+@pytest.mark.parametrize("error", [
+    asyncio.TimeoutError(),
+    TimeoutError(),
+    ConnectionResetError("connection reset"),
+    SMTPResponseError(451, "try again later"),
+])
+def test_transient_smtp_errors_are_retried(error):
+    result = _send(error)
+    assert (result.success, result.status, result.retryable) == (False, "failed", True)
+
+def test_refused_recipient_is_a_permanent_bounce():
+    result = _send(SMTPRecipientRefused(550, "no such user"))
+    assert (result.status, result.retryable, result.unreachable) == ("blocked", False, True)
+
+def test_missing_address_is_blocked_but_not_unreachable():
+    channel = EmailChannel(pool=RaisingPool(AssertionError("must not send")))
+    result = asyncio.run(channel.send({"email": ""}, "Subject", "Body"))
+    assert (result.status, result.unreachable) == ("blocked", False)
+
+def test_permanent_smtp_error_is_not_retried():
+    result = _send(SMTPResponseError(554, "rejected"))
+    assert (result.status, result.retryable, result.unreachable) == ("failed", False, False)
@@ -0,0 +1,108 @@
+import asyncio
+
+from sqlalchemy import update
+
+from models import Broadcast, BroadcastRecipient, DeliveryStatus
+from services.broadcast.channels import DeliveryResult
+from services.broadcast.orchestrator import BroadcastOrchestrator
+from services.broadcast.recipient_filter import RecipientFilter
+from services.broadcast.simulation import SimulatedChannel
+
+class FailingChannel(SimulatedChannel):
+
+    async def send(self, recipient, subject, body):
+        return DeliveryResult(success=False, status="failed", error="permanent failure")
+
+def _orchestrator(session, telegram, email):
+    orchestrator = BroadcastOrchestrator(session)
+    orchestrator.channels = {'telegram': telegram, 'email': email}
+    orchestrator.status_flush_interval = 0
+    return orchestrator
+
+async def _outcomes(session_factory, broadcast_id):
+    async with session_factory() as session:
+        broadcast = await session.get(Broadcast, broadcast_id)
+        rows = await RecipientFilter(session).count_delivery_outcomes(broadcast_id, ['telegram', 'email'])
+        return (broadcast.sent_count, broadcast.failed_count), (rows['sent'], rows['failed'])
+
+def test_resumed_recipient_already_delivered_counts_as_sent(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=3, send_telegram=True, send_email=True)
+
+        # Interrupted run: user 1 got the Telegram message, the email was never attempted
+        async with session_factory() as session:
+            await session.execute(
+                update(BroadcastRecipient)
+                .where(BroadcastRecipient.user_id == 1)
+                .values(telegram_status=DeliveryStatus.sent)
+            )
+            await session.commit()
+
+        async with session_factory() as session:
+            orchestrator = _orchestrator(session, FailingChannel(latency=0), FailingChannel(latency=0))
+            result = await orchestrator.execute_broadcast(broadcast_id)
+
+        assert (result['sent'], result['failed']) == (1, 2)
+        counters, rows = await _outcomes(session_factory, broadcast_id)
+        assert counters == rows == (1, 2)
+
+    asyncio.run(scenario())
+
+def test_worker_exception_still_counts_the_recipient(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=3, send_telegram=True, send_email=True)
+
+        async with session_factory() as session:
+            orchestrator = _orchestrator(session, SimulatedChannel(latency=0), SimulatedChannel(latency=0))
+            send_to_recipient = orchestrator._send_to_recipient
+
+            async def flaky(broadcast, template, recipient, dry_run=False):
+                if recipient['user_id'] == 2 and 'email' in recipient['pending_channels']:
+                    raise RuntimeError("unexpected failure")
+                return await send_to_recipient(broadcast, template, recipient, dry_run=dry_run)
+
+            orchestrator._send_to_recipient = flaky
+            result = await orchestrator.execute_broadcast(broadcast_id)
+
+        # User 2 got Telegram, so the email lane crashing does not make it a failure
+        assert (result['sent'], result['failed']) == (3, 0)
+
+    asyncio.run(scenario())
+
+def test_worker_exception_without_any_delivery_is_a_failure(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=3, send_telegram=True, send_email=False)
+
+        async with session_factory() as session:
+            orchestrator = _orchestrator(session, SimulatedChannel(latency=0), SimulatedChannel(latency=0))
+            send_to_recipient = orchestrator._send_to_recipient
+
+            async def flaky(broadcast, template, recipient, dry_run=False):
+                if recipient['user_id'] == 2:
+                    raise RuntimeError("unexpected failure")
+                return await send_to_recipient(broadcast, template, recipient, dry_run=dry_run)
+
+            orchestrator._send_to_recipient = flaky
+            result = await orchestrator.execute_broadcast(broadcast_id)
+
+        assert (result['sent'], result['failed']) == (2, 1)
+
+    asyncio.run(scenario())
+
+def test_fast_lane_waits_for_the_slow_one(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=60, send_telegram=True, send_email=True)
+
+        async with session_factory() as session:
+            orchestrator = _orchestrator(session, SimulatedChannel(latency=0), SimulatedChannel(latency=0.002))
+            orchestrator.concurrency = orchestrator.email_concurrency = 2
+            orchestrator.lane_max_ahead = 5
+            result = await orchestrator.execute_broadcast(broadcast_id)
+
+        # Besides the cap, only what is queued or in flight in the lane engine can finish early
+        assert orchestrator.lane_backlog_peak <= 5 + 3 * 2
+        assert (result['sent'], result['failed']) == (60, 0)
+        counters, rows = await _outcomes(session_factory, broadcast_id)
+        assert counters == rows == (60, 0)
+
+    asyncio.run(scenario())
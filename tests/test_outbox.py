@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from models import OutboxMessage, DeliveryStatus
+from services.broadcast.channels import DeliveryResult
+from services.broadcast.outbox import OutboxDispatcher, enqueue_notification
+from services.broadcast.retry_policy import RetryPolicy
+
+class ScriptedChannel:
+
+    def __init__(self, result=None, on_send=None):
+        self.result = result or DeliveryResult(success=True, status="sent", sent_at=datetime.utcnow())
+        self.on_send = on_send
+        self.sent = []
+
+    async def send(self, recipient, subject, body):
+        self.sent.append(recipient["telegram_id"])
+        if self.on_send:
+            await self.on_send()
+        return self.result
+
+def _dispatcher(session_factory, channel, max_attempts=3):
+    dispatcher = OutboxDispatcher(
+        session_factory,
+        bot=None,
+        poll_interval=1,
+        batch_size=10,
+        lease=60,
+        retry_policy=RetryPolicy(max_attempts=max_attempts, base_delay=1, max_delay=1),
+    )
+    dispatcher.channel = channel
+    return dispatcher
+
+async def _enqueue(session_factory, *chat_ids, available_at=None):
+    async with session_factory() as session:
+        messages = [enqueue_notification(session, chat_id, f"Hello {chat_id}", "test") for chat_id in chat_ids]
+        if available_at:
+            for message in messages:
+                message.available_at = available_at
+        await session.commit()
+        return [message.id for message in messages]
+
+async def _messages(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(OutboxMessage).order_by(OutboxMessage.id))
+        return result.scalars().all()
+
+def test_sends_due_messages(session_factory):
+    async def scenario():
+        await _enqueue(session_factory, 1, 2)
+        await _enqueue(session_factory, 3, available_at=datetime.utcnow() + timedelta(hours=1))
+        channel = ScriptedChannel()
+
+        assert await _dispatcher(session_factory, channel).dispatch_batch() == 2
+        assert sorted(channel.sent) == [1, 2]
+
+        messages = await _messages(session_factory)
+        assert [(m.status, m.attempts) for m in messages] == [
+            (DeliveryStatus.sent, 1),
+            (DeliveryStatus.sent, 1),
+            (DeliveryStatus.pending, 0),
+        ]
+        assert all(m.sent_at for m in messages[:2])
+
+    asyncio.run(scenario())
+
+def test_batch_is_claimed_and_committed_before_sending(session_factory):
+    async def scenario():
+        await _enqueue(session_factory, 1)
+        claimed = {}
+
+        async def during_send():
+            # The claim is already committed: visible to other sessions and hidden from other dispatchers
+            message = (await _messages(session_factory))[0]
+            claimed['available_at'] = message.available_at
+            claimed['attempts'] = message.attempts
+            claimed['other_dispatcher'] = await _dispatcher(session_factory, ScriptedChannel()).dispatch_batch()
+
+        started = datetime.utcnow()
+        assert await _dispatcher(session_factory, ScriptedChannel(on_send=during_send)).dispatch_batch() == 1
+
+        assert claimed['available_at'] >= started + timedelta(seconds=59)
+        assert claimed['attempts'] == 1
+        assert claimed['other_dispatcher'] == 0
+        assert (await _messages(session_factory))[0].status == DeliveryStatus.sent
+
+    asyncio.run(scenario())
+
+def test_failures_are_retried_then_dropped(session_factory):
+    async def scenario():
+        await _enqueue(session_factory, 1)
+        flood = DeliveryResult(success=False, status="failed", error="flood", retryable=True, retry_after=30)
+        dispatcher = _dispatcher(session_factory, ScriptedChannel(flood), max_attempts=2)
+
+        started = datetime.utcnow()
+        assert await dispatcher.dispatch_batch() == 1
+        message = (await _messages(session_factory))[0]
+        assert (message.status, message.attempts, message.last_error) == (DeliveryStatus.pending, 1, "flood")
+        assert message.available_at >= started + timedelta(seconds=30)
+        assert await dispatcher.dispatch_batch() == 0
+
+        async with session_factory() as session:
+            await session.execute(update(OutboxMessage).values(available_at=datetime.utcnow()))
+            await session.commit()
+
+        assert await dispatcher.dispatch_batch() == 1
+        message = (await _messages(session_factory))[0]
+        assert (message.status, message.attempts) == (DeliveryStatus.failed, 2)
+
+    asyncio.run(scenario())
+
+def test_blocked_chat_is_not_retried(session_factory):
+    async def scenario():
+        await _enqueue(session_factory, 1)
+        blocked = DeliveryResult(success=False, status="blocked", error="bot was blocked by the user")
+
+        assert await _dispatcher(session_factory, ScriptedChannel(blocked)).dispatch_batch() == 1
+        message = (await _messages(session_factory))[0]
+        assert (message.status, message.attempts) == (DeliveryStatus.blocked, 1)
+
+    asyncio.run(scenario())
+
+def test_outcome_after_expired_lease_does_not_overwrite_the_new_owner(session_factory):
+    async def scenario():
+        await _enqueue(session_factory, 1)
+
+        async def lease_expires():
+            async with session_factory() as session:
+                await session.execute(update(OutboxMessage).values(available_at=datetime.utcnow()))
+                await session.commit()
+            assert await _dispatcher(session_factory, ScriptedChannel()).dispatch_batch() == 1
+
+        failed = DeliveryResult(success=False, status="failed", error="timeout", retryable=True)
+        assert await _dispatcher(session_factory, ScriptedChannel(failed, on_send=lease_expires)).dispatch_batch() == 1
+
+        message = (await _messages(session_factory))[0]
+        assert (message.status, message.attempts, message.last_error) == (DeliveryStatus.sent, 2, None)
+
+    asyncio.run(scenario())
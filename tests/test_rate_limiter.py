@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+
+from services.broadcast import rate_limiter
+from services.broadcast.rate_limiter import AIMDRateController, MessagePriority, RateLimiter, TokenBucket
+
+def test_token_bucket_paces_after_the_burst():
+    async def scenario():
+        bucket = TokenBucket(rate=100, capacity=2)
+        started = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        # Two tokens from the burst, four more at 100/s
+        assert time.monotonic() - started >= 0.035
+
+    asyncio.run(scenario())
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+def test_per_chat_rate_is_enforced_separately():
+    async def scenario():
+        limiter = RateLimiter(global_rate=1000, per_chat_rate=20, per_chat_burst=1)
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(chat_id) for chat_id in range(10)))
+        assert time.monotonic() - started < 0.2
+
+        started = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire(1)
+        assert time.monotonic() - started >= 0.09
+
+    asyncio.run(scenario())
+
+def test_only_idle_chat_buckets_are_evicted():
+    async def scenario():
+        limiter = RateLimiter(global_rate=1000, per_chat_rate=1)
+        limiter.MAX_CHAT_BUCKETS = 3
+        await limiter.acquire(1)
+        limiter._get_chat_bucket(2)
+        limiter._get_chat_bucket(3)
+
+        limiter._get_chat_bucket(4)
+        # Chat 1 still has to wait for its next token, chat 2 was the oldest idle one
+        assert list(limiter._chat_buckets) == [1, 3, 4]
+
+    asyncio.run(scenario())
+
+def test_transactional_messages_overtake_queued_bulk_traffic():
+    async def scenario():
+        limiter = RateLimiter(global_rate=50, global_burst=1)
+        order = []
+
+        async def send(name, priority):
+            await limiter.acquire(priority=priority)
+            order.append(name)
+
+        bulk = [asyncio.create_task(send(f"bulk-{i}", MessagePriority.bulk)) for i in range(4)]
+        await asyncio.sleep(0)
+        transactional = asyncio.create_task(send("transactional", MessagePriority.transactional))
+        await asyncio.gather(*bulk, transactional)
+
+        # The first bulk message already had the token, the rest queue behind the notification
+        assert order == ["bulk-0", "transactional", "bulk-1", "bulk-2", "bulk-3"]
+
+    asyncio.run(scenario())
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_aimd_halves_once_per_congestion_event(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    controller = AIMDRateController(rate=30, min_rate=5, max_rate=40, cooldown=1.0)
+
+    assert controller.on_throttle(retry_after=3) == 15
+    # 429s from the same burst, and successes during the flood wait, leave the rate alone
+    clock.now += 2
+    assert controller.on_throttle() == 15
+    assert controller.on_success() == 15
+
+    clock.now += 1.5
+    assert controller.on_throttle() == 7.5
+    clock.now += 1.5
+    assert controller.on_throttle() == 5
+    assert controller.decreases == 3
+
+def test_aimd_recovers_additively_up_to_the_ceiling(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    controller = AIMDRateController(rate=10, max_rate=12, increase=1.0)
+
+    # About +1 msg/s for every `rate` successes
+    for _ in range(10):
+        controller.on_success()
+    assert 10.9 < controller.rate < 11.0
+
+    for _ in range(100):
+        controller.on_success()
+    assert controller.rate == 12
+
+def test_limiter_applies_the_controller_rate(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    limiter = RateLimiter(global_rate=30, controller=AIMDRateController(rate=30, max_rate=60))
+
+    limiter.record_throttle(retry_after=1)
+    assert limiter.current_rate == 15
+    clock.now += 2
+    limiter.record_success()
+    assert 15 < limiter.current_rate < 15.1
+
+    assert RateLimiter(global_rate=30).current_rate == 30
+
+def test_lowering_the_rate_shrinks_the_burst(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    bucket = TokenBucket(rate=30)
+
+    bucket.set_rate(15)
+    assert (bucket.capacity, bucket._tokens) == (15, 15)
+
+    # The burst grows back with the rate, but tokens still have to be earned
+    bucket.set_rate(30)
+    assert (bucket.capacity, bucket._tokens) == (30, 15)
+    clock.now += 1
+    assert bucket.is_full()
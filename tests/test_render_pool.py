@@ -0,0 +1,66 @@
+import asyncio
+from email import message_from_bytes
+
+from services.broadcast import render_pool
+from services.broadcast.render_pool import RenderPool, render_payloads
+
+TEMPLATES = ("Hi {{ first_name }}", "Hello {{ first_name }}", "<p>Dear {{ first_name }}</p>")
+
+def test_render_payloads_builds_one_message_per_address():
+    rendered, messages = render_payloads(
+        TEMPLATES,
+        [{'first_name': "Ann"}, {'first_name': "Bob"}],
+        [(0, "ann@example.com"), (1, None), (0, "ann2@example.com")],
+        from_header="Bot <bot@example.com>",
+    )
+
+    assert rendered[0] == {'subject': "Hi Ann", 'body_telegram': "Hello Ann", 'body_email': "<p>Dear Ann</p>"}
+    assert rendered[1]['body_telegram'] == "Hello Bob"
+    assert messages[1] is None
+    assert [(m.sender, m.recipients) for m in (messages[0], messages[2])] == [
+        ("bot@example.com", ["ann@example.com"]),
+        ("bot@example.com", ["ann2@example.com"]),
+    ]
+    body = message_from_bytes(messages[0].data).get_payload()[-1].get_payload(decode=True)
+    assert body == b"<p>Dear Ann</p>"
+
+def test_render_errors_are_reported_per_group():
+    rendered, messages = render_payloads(
+        ("{{ broken", "Hello", "Hello"),
+        [{'first_name': "Ann"}],
+        [(0, "ann@example.com")],
+        from_header="bot@example.com",
+    )
+
+    assert 'error' in rendered[0]
+    assert messages == [None]
+
+def test_rendered_groups_are_memoized_and_bounded(monkeypatch):
+    monkeypatch.setattr(render_pool, "RENDER_MEMO_SIZE", 2)
+    monkeypatch.setattr(render_pool, "_worker_rendered", type(render_pool._worker_rendered)())
+
+    first = render_payloads(TEMPLATES, [{'first_name': "Ann"}], [])[0][0]
+    assert render_payloads(TEMPLATES, [{'first_name': "Ann"}], [])[0][0] is first
+
+    render_payloads(TEMPLATES, [{'first_name': "Bob"}, {'first_name': "Cid"}], [])
+    assert len(render_pool._worker_rendered) == 2
+    assert render_payloads(TEMPLATES, [{'first_name': "Ann"}], [])[0][0] is not first
+
+def test_pool_renders_in_worker_processes():
+    async def scenario():
+        pool = RenderPool(workers=1)
+        try:
+            rendered, messages = await pool.render(
+                TEMPLATES,
+                [{'first_name': "Ann"}],
+                [(0, "ann@example.com")],
+                from_header="bot@example.com",
+            )
+        finally:
+            await pool.close()
+
+        assert rendered[0]['subject'] == "Hi Ann"
+        assert messages[0].recipients == ["ann@example.com"]
+        assert pool.batches == 1
+
+    asyncio.run(scenario())
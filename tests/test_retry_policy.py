@@ -0,0 +1,23 @@
+from services.broadcast.channels import DeliveryResult
+from services.broadcast.retry_policy import RetryPolicy
+
+def _failure(retryable=True):
+    return DeliveryResult(success=False, status="failed", error="timeout", retryable=retryable)
+
+def test_retries_only_retryable_failures_below_max_attempts():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(_failure(), 1)
+    assert policy.should_retry(_failure(), 2)
+    assert not policy.should_retry(_failure(), 3)
+    assert not policy.should_retry(_failure(retryable=False), 1)
+
+def test_backoff_grows_and_is_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    for attempt, cap in ((1, 1.0), (2, 2.0), (3, 4.0), (10, 4.0)):
+        for _ in range(20):
+            assert cap / 2 <= policy.delay(attempt) <= cap
+
+def test_retry_after_wins_over_backoff():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    for _ in range(20):
+        assert 30.0 <= policy.delay(1, retry_after=30) <= 31.0
@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import OperationalError
+
+from models import Broadcast, BroadcastStatus
+from services.broadcast.recipient_filter import RecipientFilter
+from services.broadcast.scheduler import BroadcastScheduler
+
+def _scheduler(session_factory, max_runs=3):
+    scheduler = BroadcastScheduler(session_factory, poll_interval=1, lease_timeout=60)
+    scheduler.max_runs = max_runs
+    return scheduler
+
+async def _broadcast(session_factory, broadcast_id):
+    async with session_factory() as session:
+        return await session.get(Broadcast, broadcast_id)
+
+def test_claims_only_due_broadcasts(session_factory, seed):
+    async def scenario():
+        now = datetime.utcnow()
+        later = await seed(session_factory, recipients=0, status=BroadcastStatus.scheduled, scheduled_at=now + timedelta(hours=1))
+        scheduler = _scheduler(session_factory)
+        assert await scheduler.claim_next() is None
+
+        async with session_factory() as session:
+            broadcast = await session.get(Broadcast, later)
+            broadcast.scheduled_at = now - timedelta(seconds=1)
+            await session.commit()
+
+        assert await scheduler.claim_next() == later
+        assert await scheduler.claim_next() is None
+
+        broadcast = await _broadcast(session_factory, later)
+        assert broadcast.status == BroadcastStatus.in_progress
+        assert broadcast.attempts == 1
+        assert broadcast.heartbeat_at is not None
+
+    asyncio.run(scenario())
+
+def test_reclaims_only_expired_leases(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(
+            session_factory,
+            recipients=0,
+            status=BroadcastStatus.in_progress,
+            heartbeat_at=datetime.utcnow(),
+            attempts=1,
+        )
+        scheduler = _scheduler(session_factory)
+        assert await scheduler.claim_next() is None
+
+        async with session_factory() as session:
+            broadcast = await session.get(Broadcast, broadcast_id)
+            broadcast.heartbeat_at = datetime.utcnow() - timedelta(minutes=5)
+            await session.commit()
+
+        assert await scheduler.claim_next() == broadcast_id
+        broadcast = await _broadcast(session_factory, broadcast_id)
+        assert broadcast.status == BroadcastStatus.in_progress
+        assert broadcast.attempts == 2
+
+    asyncio.run(scenario())
+
+def test_gives_up_after_max_runs(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(
+            session_factory,
+            recipients=0,
+            status=BroadcastStatus.in_progress,
+            heartbeat_at=datetime.utcnow() - timedelta(minutes=5),
+            attempts=3,
+            last_error="connection reset",
+        )
+        scheduler = _scheduler(session_factory, max_runs=3)
+        assert await scheduler.claim_next() is None
+
+        broadcast = await _broadcast(session_factory, broadcast_id)
+        assert broadcast.status == BroadcastStatus.failed
+        assert broadcast.last_error == "connection reset"
+        assert broadcast.completed_at is not None
+
+    asyncio.run(scenario())
+
+def test_failing_broadcast_is_marked_failed_not_reclaimed(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(
+            session_factory,
+            recipients=0,
+            status=BroadcastStatus.scheduled,
+            scheduled_at=datetime.utcnow() - timedelta(seconds=1),
+            filters={'no_such_filter': [1]},
+        )
+        scheduler = _scheduler(session_factory)
+        assert await scheduler.run_next() is True
+
+        broadcast = await _broadcast(session_factory, broadcast_id)
+        assert broadcast.status == BroadcastStatus.failed
+        assert "no_such_filter" in broadcast.last_error
+
+        async with session_factory() as session:
+            broadcast = await session.get(Broadcast, broadcast_id)
+            broadcast.heartbeat_at = datetime.utcnow() - timedelta(minutes=5)
+            await session.commit()
+        assert await scheduler.claim_next() is None
+
+    asyncio.run(scenario())
+
+def test_transient_failure_is_left_for_the_lease_to_expire(session_factory, seed, monkeypatch):
+    async def lost_connection(self, broadcast_id, id_range=None):
+        raise OperationalError("SELECT 1", {}, ConnectionResetError("connection reset"))
+
+    monkeypatch.setattr(RecipientFilter, "count_materialized", lost_connection)
+
+    async def scenario():
+        broadcast_id = await seed(
+            session_factory,
+            recipients=0,
+            status=BroadcastStatus.scheduled,
+            scheduled_at=datetime.utcnow() - timedelta(seconds=1),
+        )
+        scheduler = _scheduler(session_factory)
+        assert await scheduler.run_next() is True
+
+        broadcast = await _broadcast(session_factory, broadcast_id)
+        assert broadcast.status == BroadcastStatus.in_progress
+        assert "connection reset" in broadcast.last_error
+        assert broadcast.attempts == 1
+
+    asyncio.run(scenario())
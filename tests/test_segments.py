@@ -0,0 +1,122 @@
+import asyncio
+
+from sqlalchemy import select, update
+
+from models import AudienceSegment, AudienceSegmentMember, Broadcast, UserModel
+from services.broadcast.orchestrator import BroadcastOrchestrator
+from services.broadcast.recipient_filter import RecipientFilter
+from services.broadcast.segments import SegmentManager
+from services.broadcast.simulation import SimulatedChannel
+from utils.database import DatabaseManager
+
+async def _set_city(session_factory, city, *user_ids):
+    async with session_factory() as session:
+        await session.execute(update(UserModel).where(UserModel.id.in_(user_ids)).values(city=city))
+        await session.commit()
+
+async def _members(session_factory, segment_id):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(AudienceSegmentMember.user_id)
+            .where(AudienceSegmentMember.segment_id == segment_id)
+            .order_by(AudienceSegmentMember.user_id)
+        )
+        segment = await session.get(AudienceSegment, segment_id)
+        return result.scalars().all(), segment.member_count
+
+def test_segment_snapshots_the_audience_until_refreshed(session_factory, seed):
+    async def scenario():
+        await seed(session_factory, recipients=0, users=4)
+        await _set_city(session_factory, "Kazan", 1, 3)
+
+        async with session_factory() as session:
+            segment = await SegmentManager(session).create_segment(
+                "Kazan", {'cities': ['Kazan'], 'segment_id': 99}, created_by=1
+            )
+            segment_id = segment.id
+            # A segment is always built from the base tables, never from another segment
+            assert segment.filters == {'cities': ['Kazan']}
+
+        assert await _members(session_factory, segment_id) == ([1, 3], 2)
+
+        await _set_city(session_factory, "Kazan", 2)
+        async with session_factory() as session:
+            assert await RecipientFilter(session).count_recipients(segment_id=segment_id) == 2
+
+        async with session_factory() as session:
+            assert await SegmentManager(session).refresh_segment(segment_id) == 3
+        assert await _members(session_factory, segment_id) == ([1, 2, 3], 3)
+
+    asyncio.run(scenario())
+
+def test_user_changes_mark_segments_stale_until_the_next_broadcast(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=0, users=4, send_telegram=True, send_email=False)
+        await _set_city(session_factory, "Kazan", 1, 2)
+
+        async with session_factory() as session:
+            segment_id = (await SegmentManager(session).create_segment("Kazan", {'cities': ['Kazan']})).id
+            await session.execute(update(Broadcast).values(filters={'segment_id': segment_id}))
+            await session.commit()
+
+        manager = DatabaseManager()
+        manager.async_session_maker = session_factory
+        await manager.update_user(1000, city="Moscow")
+
+        # The handler only flags the snapshot; its members are untouched
+        assert await _members(session_factory, segment_id) == ([1, 2], 2)
+        async with session_factory() as session:
+            assert (await session.get(AudienceSegment, segment_id)).stale
+
+        async with session_factory() as session:
+            orchestrator = BroadcastOrchestrator(session)
+            orchestrator.channels = {'telegram': SimulatedChannel(latency=0), 'email': SimulatedChannel(latency=0)}
+            orchestrator.status_flush_interval = 0
+            result = await orchestrator.execute_broadcast(broadcast_id)
+        assert result['sent'] == 1
+
+        assert await _members(session_factory, segment_id) == ([2], 1)
+        async with session_factory() as session:
+            assert not (await session.get(AudienceSegment, segment_id)).stale
+
+    asyncio.run(scenario())
+
+def test_broadcast_recipients_come_from_the_segment(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=0, users=4)
+        await _set_city(session_factory, "Kazan", 2, 4)
+
+        async with session_factory() as session:
+            segment_id = (await SegmentManager(session).create_segment("Kazan", {'cities': ['Kazan']})).id
+
+        async with session_factory() as session:
+            recipient_filter = RecipientFilter(session)
+            created = await recipient_filter.materialize_recipients(broadcast_id, segment_id=segment_id)
+            await session.commit()
+            assert created == 2
+            assert await recipient_filter.count_materialized(broadcast_id) == 2
+
+    asyncio.run(scenario())
+
+def test_ad_hoc_filters_narrow_the_segment(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=0, users=4)
+        await _set_city(session_factory, "Kazan", 2, 3, 4)
+
+        async with session_factory() as session:
+            segment_id = (await SegmentManager(session).create_segment("Kazan", {'cities': ['Kazan']})).id
+
+        async with session_factory() as session:
+            recipient_filter = RecipientFilter(session)
+            assert await recipient_filter.count_recipients(cities=['Moscow'], segment_id=segment_id) == 0
+            assert await recipient_filter.estimate_recipients(user_ids=[1, 2, 4], segment_id=segment_id) == 2
+
+            created = await recipient_filter.materialize_recipients(
+                broadcast_id, user_ids=[1, 2, 4], segment_id=segment_id
+            )
+            await session.commit()
+            assert created == 2
+            batches = [batch async for batch in recipient_filter.iter_pending_recipients(broadcast_id, ['telegram'])]
+            assert [r['user_id'] for batch in batches for r in batch] == [2, 4]
+
+    asyncio.run(scenario())
@@ -0,0 +1,168 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+
+from models import Broadcast, BroadcastShard, BroadcastStatus
+from services.broadcast.orchestrator import BroadcastOrchestrator
+from services.broadcast.scheduler import BroadcastScheduler
+from services.broadcast.simulation import SimulatedChannel
+
+def _orchestrator(session, shard_count=1):
+    orchestrator = BroadcastOrchestrator(session)
+    orchestrator.channels = {'telegram': SimulatedChannel(latency=0), 'email': SimulatedChannel(latency=0)}
+    orchestrator.status_flush_interval = 0
+    orchestrator.shard_count = shard_count
+    return orchestrator
+
+def _scheduler(session_factory, max_runs=3):
+    scheduler = BroadcastScheduler(session_factory, poll_interval=1, lease_timeout=60)
+    scheduler.max_runs = max_runs
+    return scheduler
+
+async def _shards(session_factory, broadcast_id):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(BroadcastShard)
+            .where(BroadcastShard.broadcast_id == broadcast_id)
+            .order_by(BroadcastShard.shard_no)
+        )
+        return result.scalars().all()
+
+async def _broadcast(session_factory, broadcast_id):
+    async with session_factory() as session:
+        return await session.get(Broadcast, broadcast_id)
+
+def test_broadcast_completes_with_its_last_shard(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=7, send_telegram=True, send_email=False)
+
+        async with session_factory() as session:
+            result = await _orchestrator(session, shard_count=3).execute_broadcast(broadcast_id)
+        assert result['shards'] == 3
+
+        shards = await _shards(session_factory, broadcast_id)
+        assert [(s.recipient_id_from, s.recipient_id_to) for s in shards] == [(1, 3), (4, 6), (7, 7)]
+
+        for shard in reversed(shards):
+            assert (await _broadcast(session_factory, broadcast_id)).status == BroadcastStatus.in_progress
+            async with session_factory() as session:
+                result = await _orchestrator(session).execute_shard(shard.id)
+            assert 'error' not in result
+
+        shards = await _shards(session_factory, broadcast_id)
+        assert [(s.status, s.sent_count) for s in shards] == [
+            (BroadcastStatus.completed, 3),
+            (BroadcastStatus.completed, 3),
+            (BroadcastStatus.completed, 1),
+        ]
+
+        broadcast = await _broadcast(session_factory, broadcast_id)
+        assert broadcast.status == BroadcastStatus.completed
+        assert (broadcast.sent_count, broadcast.failed_count) == (7, 0)
+        assert broadcast.completed_at is not None
+
+    asyncio.run(scenario())
+
+def test_transient_shard_failure_keeps_the_broadcast_running(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=4, send_telegram=True, send_email=False)
+
+        async with session_factory() as session:
+            await _orchestrator(session, shard_count=2).execute_broadcast(broadcast_id)
+        first, second = await _shards(session_factory, broadcast_id)
+
+        async with session_factory() as session:
+            assert 'error' not in await _orchestrator(session).execute_shard(first.id)
+
+        async with session_factory() as session:
+            orchestrator = _orchestrator(session)
+
+            async def lost_connection(*args, **kwargs):
+                raise OperationalError("SELECT 1", {}, ConnectionResetError("connection reset"))
+
+            orchestrator._deliver = lost_connection
+            assert 'error' in await orchestrator.execute_shard(second.id)
+
+        shard = (await _shards(session_factory, broadcast_id))[1]
+        assert shard.status == BroadcastStatus.in_progress
+        assert "connection reset" in shard.last_error
+        assert (await _broadcast(session_factory, broadcast_id)).status == BroadcastStatus.in_progress
+
+        # Reclaimed and re-run, the shard finishes the broadcast
+        async with session_factory() as session:
+            assert 'error' not in await _orchestrator(session).execute_shard(second.id)
+
+        broadcast = await _broadcast(session_factory, broadcast_id)
+        assert broadcast.status == BroadcastStatus.completed
+        assert broadcast.sent_count == 4
+
+    asyncio.run(scenario())
+
+def test_failing_shard_fails_its_broadcast(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=4, send_telegram=True, send_email=False)
+
+        async with session_factory() as session:
+            await _orchestrator(session, shard_count=2).execute_broadcast(broadcast_id)
+        first, second = await _shards(session_factory, broadcast_id)
+
+        async with session_factory() as session:
+            orchestrator = _orchestrator(session)
+
+            async def crash(*args, **kwargs):
+                raise RuntimeError("worker died")
+
+            orchestrator._deliver = crash
+            assert await orchestrator.execute_shard(first.id) == {'error': 'worker died', 'shard_id': first.id}
+
+        shard = (await _shards(session_factory, broadcast_id))[0]
+        assert (shard.status, shard.last_error) == (BroadcastStatus.failed, "worker died")
+
+        broadcast = await _broadcast(session_factory, broadcast_id)
+        assert broadcast.status == BroadcastStatus.failed
+        assert broadcast.last_error == "Shard 0: worker died"
+
+        # The remaining shard of the failed broadcast is not started
+        assert await _scheduler(session_factory).claim_shard() is None
+
+    asyncio.run(scenario())
+
+def test_shard_gives_up_after_max_runs(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=4, send_telegram=True, send_email=False)
+
+        async with session_factory() as session:
+            await _orchestrator(session, shard_count=2).execute_broadcast(broadcast_id)
+        scheduler = _scheduler(session_factory, max_runs=2)
+
+        async def expire_leases():
+            async with session_factory() as session:
+                await session.execute(
+                    update(BroadcastShard).values(heartbeat_at=datetime.utcnow() - timedelta(minutes=5))
+                )
+                await session.commit()
+
+        # Both shards are claimed and their workers die without a trace
+        first = await scheduler.claim_shard()
+        second = await scheduler.claim_shard()
+        assert await scheduler.claim_shard() is None
+
+        await expire_leases()
+        assert await scheduler.claim_shard() == first
+        assert await scheduler.claim_shard() == second
+        assert [s.attempts for s in await _shards(session_factory, broadcast_id)] == [2, 2]
+
+        await expire_leases()
+        assert await scheduler.claim_shard() is None
+
+        shards = await _shards(session_factory, broadcast_id)
+        assert shards[0].status == BroadcastStatus.failed
+        assert shards[0].last_error == "Lease expired"
+
+        broadcast = await _broadcast(session_factory, broadcast_id)
+        assert broadcast.status == BroadcastStatus.failed
+        assert broadcast.last_error == "Shard 0: Lease expired"
+
+    asyncio.run(scenario())
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from models import Broadcast, BroadcastRecipient, DeliveryStatus
+from services.broadcast.channels import DeliveryResult
+from services.broadcast.status_writer import StatusWriter
+
+def _statuses(rows):
+    return {row.user_id: (row.telegram_status, row.telegram_attempts, row.telegram_error) for row in rows}
+
+async def _recipients(session_factory, broadcast_id):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(BroadcastRecipient).where(BroadcastRecipient.broadcast_id == broadcast_id)
+        )
+        return result.scalars().all()
+
+def test_flush_writes_statuses_and_progress(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=3)
+
+        async with session_factory() as session:
+            writer = StatusWriter(session, broadcast_id, batch_size=100, flush_interval=0)
+            await writer.add(1, "telegram", DeliveryResult(success=True, status="sent", message_id="42"))
+            await writer.add(2, "telegram", DeliveryResult(success=False, status="blocked", error="blocked"), attempts=2)
+            await writer.add(3, "telegram", DeliveryResult(success=False, status="failed", error="timeout"), final=False)
+            writer.record_outcome(True)
+            writer.record_outcome(False)
+
+            assert await writer.flush() == 3
+            assert await writer.flush() == 0
+
+        rows = await _recipients(session_factory, broadcast_id)
+        assert _statuses(rows) == {
+            1: (DeliveryStatus.sent, 1, None),
+            2: (DeliveryStatus.blocked, 2, "blocked"),
+            3: (DeliveryStatus.pending, 1, "timeout"),
+        }
+        assert next(row for row in rows if row.user_id == 1).telegram_message_id == 42
+
+        async with session_factory() as session:
+            broadcast = await session.get(Broadcast, broadcast_id)
+            assert (broadcast.sent_count, broadcast.failed_count) == (1, 1)
+            assert broadcast.progress_updated_at is not None
+
+    asyncio.run(scenario())
+
+def test_failed_flush_keeps_rows_and_counters_buffered(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=2)
+
+        async with session_factory() as session:
+            writer = StatusWriter(session, broadcast_id, batch_size=100, flush_interval=0)
+            await writer.add(1, "telegram", DeliveryResult(success=True, status="sent"))
+            writer.record_outcome(True)
+
+            write_progress = writer._write_progress
+
+            async def broken_progress(sent_delta, failed_delta):
+                raise RuntimeError("database went away")
+
+            writer._write_progress = broken_progress
+            with pytest.raises(RuntimeError):
+                await writer.flush()
+
+            # A newer result for the same recipient must win over the re-buffered one
+            await writer.add(2, "telegram", DeliveryResult(success=True, status="sent"))
+            writer.record_outcome(True)
+            assert len(writer._buffer) == 2
+
+            writer._write_progress = write_progress
+            assert await writer.flush() == 2
+
+        rows = await _recipients(session_factory, broadcast_id)
+        assert {row.user_id: row.telegram_status for row in rows} == {
+            1: DeliveryStatus.sent,
+            2: DeliveryStatus.sent,
+        }
+
+        async with session_factory() as session:
+            broadcast = await session.get(Broadcast, broadcast_id)
+            assert (broadcast.sent_count, broadcast.failed_count) == (2, 0)
+
+    asyncio.run(scenario())
+
+def test_full_buffer_flushes_without_waiting_for_the_ticker(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=4)
+
+        async with session_factory() as session:
+            writer = StatusWriter(session, broadcast_id, batch_size=2, flush_interval=0)
+            for user_id in (1, 2, 3):
+                await writer.add(user_id, "email", DeliveryResult(success=True, status="sent"))
+
+            assert writer.flushes == 1
+            assert len(writer._buffer) == 1
+            await writer.close()
+            assert writer.flushed == 3
+
+        rows = await _recipients(session_factory, broadcast_id)
+        assert [row.email_status for row in sorted(rows, key=lambda row: row.user_id)] == [
+            DeliveryStatus.sent, DeliveryStatus.sent, DeliveryStatus.sent, DeliveryStatus.pending,
+        ]
+
+    asyncio.run(scenario())
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+
+from models import BroadcastRecipient, DeliveryStatus, DeliverySuppression
+from services.broadcast.channels import DeliveryResult
+from services.broadcast.orchestrator import BroadcastOrchestrator
+from services.broadcast.simulation import SimulatedChannel
+from services.broadcast.suppression import SuppressionList
+
+async def _rows(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(DeliverySuppression.channel, DeliverySuppression.address, DeliverySuppression.reason)
+        )
+        return sorted(result.all())
+
+def test_flush_skips_addresses_suppressed_elsewhere(session_factory):
+    async def scenario():
+        # Another process already suppressed one of the addresses
+        async with session_factory() as session:
+            session.add(DeliverySuppression(channel='email', address='user1@example.com', reason='bounced'))
+            await session.commit()
+
+        suppression = SuppressionList()
+        assert suppression.add('email', 'User1@Example.com', reason='hard bounce')
+        assert suppression.add('email', 'user2@example.com', reason='hard bounce')
+        assert suppression.add('telegram', 1001, reason='blocked')
+
+        async with session_factory() as session:
+            assert await suppression.flush(session) == 2
+            assert await suppression.flush(session) == 0
+
+        assert await _rows(session_factory) == [
+            ('email', 'user1@example.com', 'bounced'),
+            ('email', 'user2@example.com', 'hard bounce'),
+            ('telegram', '1001', 'blocked'),
+        ]
+
+    asyncio.run(scenario())
+
+def test_flush_writes_large_batches_in_chunks(session_factory):
+    async def scenario():
+        suppression = SuppressionList()
+        suppression.FLUSH_CHUNK = 2
+        for i in range(5):
+            suppression.add('telegram', 1000 + i)
+
+        async with session_factory() as session:
+            assert await suppression.flush(session) == 5
+
+        assert len(await _rows(session_factory)) == 5
+
+    asyncio.run(scenario())
+
+def test_failed_flush_keeps_the_batch(session_factory, monkeypatch):
+    async def scenario():
+        suppression = SuppressionList()
+        suppression.add('email', 'user1@example.com', reason='hard bounce')
+        suppression.add('telegram', 1001, reason='blocked')
+
+        async with session_factory() as session:
+            execute = session.execute
+
+            async def lost_connection(*args, **kwargs):
+                raise OperationalError("INSERT", {}, ConnectionResetError("connection reset"))
+
+            monkeypatch.setattr(session, "execute", lost_connection)
+            with pytest.raises(OperationalError):
+                await suppression.flush(session)
+            assert len(suppression._pending) == 2
+
+            # Added while the failed flush was in flight
+            suppression.add('telegram', 1002, reason='blocked')
+
+            monkeypatch.setattr(session, "execute", execute)
+            assert await suppression.flush(session) == 3
+
+        assert suppression._pending == {}
+        assert len(await _rows(session_factory)) == 3
+
+    asyncio.run(scenario())
+
+class ScriptedChannel(SimulatedChannel):
+
+    def __init__(self, results):
+        super().__init__(latency=0)
+        self.results = results
+        self.calls = []
+
+    async def send(self, recipient, subject, body):
+        self.calls.append(recipient["user_id"])
+        return self.results.get(recipient["user_id"]) or await super().send(recipient, subject, body)
+
+def test_only_unreachable_recipients_are_suppressed(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=3, send_telegram=True, send_email=False)
+        telegram = ScriptedChannel({
+            1: DeliveryResult(success=False, status="blocked", error="Bot blocked by user", unreachable=True),
+            2: DeliveryResult(success=False, status="blocked", error="Invalid recipient: missing telegram_id"),
+        })
+
+        async with session_factory() as session:
+            orchestrator = BroadcastOrchestrator(session)
+            orchestrator.channels = {'telegram': telegram, 'email': SimulatedChannel(latency=0)}
+            orchestrator.status_flush_interval = 0
+            orchestrator.suppression = SuppressionList()
+            result = await orchestrator.execute_broadcast(broadcast_id)
+
+        assert (result['sent'], result['failed']) == (1, 2)
+        assert await _rows(session_factory) == [('telegram', '1000', 'Bot blocked by user')]
+
+    asyncio.run(scenario())
+
+def test_suppressed_recipients_are_never_queued(session_factory, seed):
+    async def scenario():
+        broadcast_id = await seed(session_factory, recipients=4, send_telegram=True, send_email=True)
+        async with session_factory() as session:
+            await session.execute(
+                update(BroadcastRecipient)
+                .where(BroadcastRecipient.user_id == 2)
+                .values(email_address=" User2@Example.com ")
+            )
+            session.add_all([
+                DeliverySuppression(channel='telegram', address='1000', reason='blocked'),
+                DeliverySuppression(channel='email', address='user2@example.com', reason='bounced'),
+                DeliverySuppression(channel='telegram', address='1002', reason='blocked'),
+                DeliverySuppression(channel='email', address='user3@example.com', reason='bounced'),
+            ])
+            await session.commit()
+
+        telegram, email = ScriptedChannel({}), ScriptedChannel({})
+        async with session_factory() as session:
+            orchestrator = BroadcastOrchestrator(session)
+            orchestrator.channels = {'telegram': telegram, 'email': email}
+            orchestrator.status_flush_interval = 0
+            # Nothing in memory: the exclusion has to come from the query
+            orchestrator.suppression = SuppressionList()
+            orchestrator.suppression.load = lambda session: asyncio.sleep(0)
+            result = await orchestrator.execute_broadcast(broadcast_id)
+
+        assert sorted(telegram.calls) == [2, 4]
+        assert sorted(email.calls) == [1, 4]
+        # User 3 is suppressed on both channels
+        assert (result['sent'], result['failed']) == (3, 1)
+
+        async with session_factory() as session:
+            rows = await session.execute(
+                select(BroadcastRecipient.user_id, BroadcastRecipient.telegram_status, BroadcastRecipient.email_error)
+                .order_by(BroadcastRecipient.user_id)
+            )
+            rows = rows.all()
+        assert [row.telegram_status for row in rows] == [
+            DeliveryStatus.blocked, DeliveryStatus.sent, DeliveryStatus.blocked, DeliveryStatus.sent,
+        ]
+        assert rows[1].email_error == "Suppressed: email recipient is unreachable"
+
+    asyncio.run(scenario())
@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import select, text, func
@@ -77,7 +77,8 @@ class DatabaseManager:
                 if hasattr(user, key):
                     setattr(user, key, value)
             await session.commit()
-            return user
+        await self.mark_segments_stale(user.id)
+        return user
 
     async def get_active_competitions(self) -> List[Dict[str, Any]]:
         async with self.get_session() as session:
@@ -97,7 +98,7 @@ class DatabaseManager:
 
     async def create_registration(
         self, user_id: int, telegram_id: int, competition_id: int, role: str,
-        status: str = RegistrationStatus.PENDING.value
+        status: str = RegistrationStatus.PENDING.value, notify_admins: bool = False
     ) -> RegistrationModel:
         async with self.get_session() as session:
             registration = RegistrationModel(
@@ -109,8 +110,13 @@ class DatabaseManager:
                 is_confirmed=(status == RegistrationStatus.APPROVED.value),
             )
             session.add(registration)
+            if notify_admins:
+                await self._enqueue_admin_notices(session, registration)
             await session.commit()
-            return registration
+        if notify_admins:
+            self._wake_outbox()
+        await self.mark_segments_stale(user_id)
+        return registration
 
     async def phone_exists(self, phone: str) -> bool:
         async with self.get_session() as session:
@@ -147,7 +153,10 @@ class DatabaseManager:
             )
             return result.scalars().all()
 
-    async def approve_registration(self, registration_id: int, admin_telegram_id: int) -> RegistrationModel:
+    async def approve_registration(
+        self, registration_id: int, admin_telegram_id: int, notify: bool = False
+    ) -> RegistrationModel:
+        from utils.notifications import user_approved_text
         async with self.get_session() as session:
             registration = await session.get(RegistrationModel, registration_id)
             if registration:
@@ -157,20 +166,34 @@ class DatabaseManager:
                 registration.confirmed_at = datetime.now(timezone.utc)
                 registration.confirmed_by = admin_telegram_id
                 session.add(registration)
+                if notify:
+                    await self._enqueue_user_notice(session, registration, "registration_approved", user_approved_text)
                 await session.commit()
-            return registration
-
-    async def reject_registration(self, registration_id: int) -> RegistrationModel:
+        if registration:
+            if notify:
+                self._wake_outbox()
+            await self.mark_segments_stale(registration.user_id)
+        return registration
+
+    async def reject_registration(self, registration_id: int, notify: bool = False) -> RegistrationModel:
+        from utils.notifications import user_rejected_text
         async with self.get_session() as session:
             registration = await session.get(RegistrationModel, registration_id)
             if registration:
                 registration.status = RegistrationStatus.REJECTED.value
                 registration.is_confirmed = False
                 session.add(registration)
+                if notify:
+                    await self._enqueue_user_notice(session, registration, "registration_rejected", user_rejected_text)
                 await session.commit()
-            return registration
-
-    async def revoke_registration(self, registration_id: int) -> RegistrationModel:
+        if registration:
+            if notify:
+                self._wake_outbox()
+            await self.mark_segments_stale(registration.user_id)
+        return registration
+
+    async def revoke_registration(self, registration_id: int, notify: bool = False) -> RegistrationModel:
+        from utils.notifications import user_revoked_text
         async with self.get_session() as session:
             registration = await session.get(RegistrationModel, registration_id)
             if registration:
@@ -179,8 +202,45 @@ class DatabaseManager:
                 registration.confirmed_at = None
                 registration.confirmed_by = None
                 session.add(registration)
+                if notify:
+                    await self._enqueue_user_notice(session, registration, "registration_revoked", user_revoked_text)
                 await session.commit()
-            return registration
+        if registration:
+            if notify:
+                self._wake_outbox()
+            await self.mark_segments_stale(registration.user_id)
+        return registration
+
+    # Notifications go to the outbox in the same transaction as the status change they report
+    async def _enqueue_user_notice(
+        self, session: AsyncSession, registration: RegistrationModel, kind: str,
+        make_text: Callable[[str], str]
+    ) -> None:
+        from services.broadcast.outbox import enqueue_notification
+        competition = await session.get(CompetitionModel, registration.competition_id)
+        if competition:
+            enqueue_notification(session, registration.telegram_id, make_text(competition.name), kind)
+
+    async def _enqueue_admin_notices(self, session: AsyncSession, registration: RegistrationModel) -> None:
+        from config import ADMIN_IDS
+        from services.broadcast.outbox import enqueue_notification
+        from utils.notifications import new_registration_text
+        if not ADMIN_IDS:
+            return
+
+        user = await session.get(UserModel, registration.user_id)
+        competition = await session.get(CompetitionModel, registration.competition_id)
+        if not user or not competition:
+            return
+
+        message = new_registration_text(user.get_display_name(), competition.name, registration.role)
+        for admin_id in ADMIN_IDS:
+            enqueue_notification(session, admin_id, message, "admin_new_registration")
+
+    @staticmethod
+    def _wake_outbox() -> None:
+        from services.broadcast.outbox import wake_outbox
+        wake_outbox()
 
     async def get_registration_with_user(self, registration_id: int) -> Optional[Dict[str, Any]]:
         async with self.get_session() as session:
@@ -389,6 +449,43 @@ class DatabaseManager:
             await session.commit()
             return broadcast
 
+    async def create_audience_segment(
+        self,
+        name: str,
+        filters: Dict[str, Any],
+        created_by: Optional[int] = None,
+        description: Optional[str] = None
+    ) -> "AudienceSegment":
+        from services.broadcast.segments import SegmentManager
+        async with self.get_session() as session:
+            return await SegmentManager(session).create_segment(
+                name, filters, created_by=created_by, description=description
+            )
+
+    async def refresh_audience_segment(self, segment_id: int) -> int:
+        from services.broadcast.segments import SegmentManager
+        async with self.get_session() as session:
+            return await SegmentManager(session).refresh_segment(segment_id)
+
+    async def mark_segments_stale(self, user_id: int) -> None:
+        from services.broadcast.segments import SegmentManager
+        # Segment snapshots are a cache: a failed update must not fail the registration itself
+        try:
+            async with self.get_session() as session:
+                await SegmentManager(session).mark_stale()
+        except Exception as e:
+            logger.warning(f"⚠️  Could not mark segments stale for user {user_id}: {e}")
+
+    async def load_suppression_list(self) -> int:
+        from services.broadcast.suppression import get_suppression_list
+        async with self.get_session() as session:
+            return await get_suppression_list().load(session)
+
+    async def unsuppress_recipient(self, channel: str, address: Any) -> bool:
+        from services.broadcast.suppression import get_suppression_list
+        async with self.get_session() as session:
+            return await get_suppression_list().remove(session, channel, address)
+
     async def get_broadcasts(self, status: Optional[str] = None) -> List["Broadcast"]:
         from models import Broadcast
         async with self.get_session() as session:
@@ -404,23 +501,51 @@ class DatabaseManager:
             return await session.get(Broadcast, broadcast_id)
 
     async def get_broadcast_statistics(self, broadcast_id: int) -> Dict[str, Any]:
-        from models import Broadcast, BroadcastRecipient
+        from models import Broadcast, BroadcastRecipient, DeliveryStatus
         async with self.get_session() as session:
             broadcast = await session.get(Broadcast, broadcast_id)
             if not broadcast:
                 return {}
 
+            # At most one row per status pair, whatever the audience size
             result = await session.execute(
-                select(BroadcastRecipient).where(
+                select(
+                    BroadcastRecipient.telegram_status,
+                    BroadcastRecipient.email_status,
+                    func.count()
+                ).where(
                     BroadcastRecipient.broadcast_id == broadcast_id
+                ).group_by(
+                    BroadcastRecipient.telegram_status,
+                    BroadcastRecipient.email_status
                 )
             )
-            recipients = result.scalars().all()
 
-            total = len(recipients)
-            telegram_sent = sum(1 for r in recipients if r.telegram_status == 'sent')
-            email_sent = sum(1 for r in recipients if r.email_status == 'sent')
-            failed = sum(1 for r in recipients if r.telegram_status == 'failed' or r.email_status == 'failed')
+            delivered = (DeliveryStatus.sent, DeliveryStatus.delivered)
+            total = telegram_sent = email_sent = sent = failed = blocked = pending = 0
+            for telegram_status, email_status, count in result.all():
+                total += count
+                if telegram_status in delivered:
+                    telegram_sent += count
+                if email_status in delivered:
+                    email_sent += count
+
+                # Per recipient, like the broadcast counters: delivered anywhere is sent,
+                # otherwise failed once every channel of the broadcast has finished
+                statuses = []
+                if broadcast.send_telegram:
+                    statuses.append(telegram_status)
+                if broadcast.send_email:
+                    statuses.append(email_status)
+
+                if any(status in delivered for status in statuses):
+                    sent += count
+                elif statuses and DeliveryStatus.pending not in statuses:
+                    failed += count
+                    if DeliveryStatus.blocked in statuses:
+                        blocked += count
+                else:
+                    pending += count
 
             return {
                 'broadcast_id': broadcast.id,
@@ -429,9 +554,16 @@ class DatabaseManager:
                 'total_recipients': total,
                 'telegram_sent': telegram_sent,
                 'email_sent': email_sent,
+                'sent': sent,
                 'failed': failed,
+                'blocked': blocked,
+                'pending': pending,
                 'sent_count': broadcast.sent_count,
                 'failed_count': broadcast.failed_count,
+                'progress_percent': broadcast.get_progress_percent(),
+                'send_rate': broadcast.send_rate,
+                'eta_seconds': broadcast.get_eta_seconds(),
+                'progress_updated_at': broadcast.progress_updated_at,
                 'created_at': broadcast.created_at,
                 'started_at': broadcast.started_at,
                 'completed_at': broadcast.completed_at
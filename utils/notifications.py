@@ -1,82 +1,69 @@
 from typing import Optional
+import asyncio
 import logging
 from aiogram import Bot
-from config import ADMIN_IDS
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import Message
 from messages.texts import BotMessages
+from services.broadcast.rate_limiter import MessagePriority, get_telegram_rate_limiter
 
 logger = logging.getLogger(__name__)
 
-async def notify_user(
-    bot: Bot,
-    telegram_id: int,
-    message: str
-) -> None:
+async def send_transactional_message(bot: Bot, chat_id: int, text: str, **kwargs) -> Message:
+    # Shares the bot-wide rate limit with broadcasts, but is always served before bulk traffic
+    limiter = get_telegram_rate_limiter()
+    await limiter.acquire(chat_id, priority=MessagePriority.transactional)
     try:
-        logger.info(f"📤 Отправляю сообщение пользователю {telegram_id}...")
-        result = await bot.send_message(telegram_id, message)
-        logger.info(f"✅ Сообщение отправлено пользователю {telegram_id}, message_id={result.message_id}")
-    except Exception as e:
-        logger.error(f"❌ Ошибка отправки сообщения пользователю {telegram_id}: {e}")
-        raise
-
-async def notify_admins_new_registration(
-    bot: Bot,
-    user_name: str,
-    competition_name: str,
-    role: str
-) -> None:
-    if not ADMIN_IDS:
-        return
-
-    message = (
+        return await bot.send_message(chat_id, text, **kwargs)
+    except TelegramRetryAfter as e:
+        logger.warning(f"⚠️  Flood control for {chat_id}, retrying in {e.retry_after}s")
+        limiter.record_throttle(float(e.retry_after))
+        await asyncio.sleep(e.retry_after)
+        await limiter.acquire(chat_id, priority=MessagePriority.transactional)
+        return await bot.send_message(chat_id, text, **kwargs)
+
+def new_registration_text(user_name: str, competition_name: str, role: str) -> str:
+    return (
         f"📬 Новая заявка на регистрацию!\n\n"
         f"👤 {user_name}\n"
         f"🏆 {competition_name}\n"
         f"🎭 Роль: {role}"
     )
 
-    for admin_id in ADMIN_IDS:
-        try:
-            await bot.send_message(admin_id, message)
-        except Exception as e:
-            logger.error(f"Error sending notification to admin {admin_id}: {e}")
-
-async def notify_user_approved(bot: Bot, telegram_id: int, competition_name: str) -> None:
-    message = f"✅ Ваша заявка на участие в «{competition_name}» одобрена!"
+def user_approved_text(competition_name: str) -> str:
+    return f"✅ Ваша заявка на участие в «{competition_name}» одобрена!"
 
-    try:
-        await bot.send_message(telegram_id, message)
-    except Exception as e:
-        logger.error(f"Error notifying user {telegram_id}: {e}")
-
-async def notify_user_rejected(bot: Bot, telegram_id: int, competition_name: str, reason: Optional[str] = None) -> None:
+def user_rejected_text(competition_name: str, reason: Optional[str] = None) -> str:
     message = f"❌ Ваша заявка на участие в «{competition_name}» отклонена."
 
     if reason:
         message += f"\n\nПричина: {reason}"
+    return message
 
-    try:
-        await bot.send_message(telegram_id, message)
-    except Exception as e:
-        logger.error(f"Error notifying user {telegram_id}: {e}")
-
-async def notify_user_revoked(bot: Bot, telegram_id: int, competition_name: str) -> None:
-    message = f"⚠️ Ваша регистрация на «{competition_name}» была отозвана."
+def user_revoked_text(competition_name: str) -> str:
+    return f"⚠️ Ваша регистрация на «{competition_name}» была отозвана."
 
+async def notify_user(
+    bot: Bot,
+    telegram_id: int,
+    message: str
+) -> None:
     try:
-        await bot.send_message(telegram_id, message)
+        logger.info(f"📤 Отправляю сообщение пользователю {telegram_id}...")
+        result = await send_transactional_message(bot, telegram_id, message)
+        logger.info(f"✅ Сообщение отправлено пользователю {telegram_id}, message_id={result.message_id}")
     except Exception as e:
-        logger.error(f"Error notifying user {telegram_id}: {e}")
+        logger.error(f"❌ Ошибка отправки сообщения пользователю {telegram_id}: {e}")
+        raise
 
 async def send_email(
     email_address: str,
     subject: str,
     body: str
 ) -> None:
-    import asyncio
-    import smtplib
     from email.mime.text import MIMEText
     from config.email_settings import SMTPConfig
+    from services.broadcast.smtp_pool import get_smtp_transport
 
     smtp_config = SMTPConfig()
 
@@ -93,22 +80,7 @@ async def send_email(
         msg['From'] = smtp_config.get_from_address()
         msg['To'] = email_address
 
-        host = smtp_config.SMTP_HOST
-        port = smtp_config.SMTP_PORT
-        username = smtp_config.SMTP_USERNAME
-        password = smtp_config.SMTP_PASSWORD
-        use_tls = smtp_config.SMTP_USE_TLS
-
-        def send_smtp() -> None:
-            server = smtplib.SMTP(host, port, timeout=15)
-            if use_tls:
-                server.starttls()
-            server.login(username, password)
-            server.send_message(msg)
-            server.quit()
-
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, send_smtp)
+        await get_smtp_transport().send(msg)
 
         logger.info(f"Email отправлен на {email_address}")
 